@@ -1,7 +1,6 @@
 import os
 
 import numpy as np
-import pandas as pd
 from matplotlib import pyplot as plt
 import oopnet as on
 
@@ -11,19 +10,19 @@ net = on.Network.read(filename)
 net.reportprecision.flow = 3
 net.reportprecision.pressure = 3
 mcruns = 1000
-p = []
+collection = on.ReportCollection(n_scenarios=mcruns)
 
 for _ in range(mcruns):
     cnet = on.Copy(net)
     for j in on.get_junctions(cnet):
         j.demand += np.random.normal(0.0, 1.0)
-    rpt = net.run()
-    p.append(rpt.pressure)
+    rpt = cnet.run()
+    collection.append(rpt)
 
-p = pd.DataFrame(p, index=list(range(len(p))))
+p = collection.get('Pressure').to_pandas()
 print(p)
 
-pmean = p.mean()
+pmean = collection.mean('Pressure')
 print(pmean)
 
 psub = p.sub(pmean, axis=1)
@@ -3,7 +3,7 @@ This module contains all the base classes of OOPNET
 """
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING, ClassVar
 from abc import ABC, abstractmethod
 
 if TYPE_CHECKING:
@@ -28,6 +28,32 @@ class NetworkComponent(ABC):
     _network_: Optional[Network] = field(
         default=None, init=False, compare=False, hash=False, repr=False
     )
+    _registry_keys: ClassVar[tuple[str, ...]] = ()
+    _geometry_attributes: ClassVar[tuple[str, ...]] = ()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if self._network_ is not None and name != "_network_":
+            self._mark_modified(name, geometry=name in self._geometry_attributes)
+
+    def _mark_modified(self, attribute: str, geometry: bool = False) -> None:
+        """Increments the versions of the ComponentRegistry the component is stored in.
+
+        The versions are used by the EPANET input file writer to decide which sections have to be rendered again. The
+        geometry version is only incremented if an attribute affecting the Network's plot geometry was changed.
+
+        Args:
+          attribute: name of the reassigned attribute
+          geometry: if True, the geometry version is incremented as well
+
+        """
+        if not self._registry_keys:
+            return
+        name, *keys = self._registry_keys
+        registry = getattr(self._network_, name)
+        for key in keys:
+            registry = registry[key]
+        registry.mark_modified(attribute, geometry)
 
     @property
     def id(self) -> str:
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from collections import Counter
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -11,11 +12,44 @@ class ComponentRegistry(dict):
     Based on built-in dict but prevents overwriting an existing key and raises a ComponentNotExistingError error,
     when trying to look up a not exiting Component (instead of default KeyErrors).
 
+    Attributes:
+        version: counter that is incremented whenever a component is added, removed or modified
+        id_version: counter that is incremented whenever a component is added, removed or renamed
+        geometry_version: counter that is incremented whenever a component is added or removed or its coordinates change
+        attribute_versions: number of times each attribute of the stored components was reassigned
+
     """
 
+    version: int = 0
+    id_version: int = 0
+    geometry_version: int = 0
+
     def __init__(self, super_registry: Optional[SuperComponentRegistry] = None):
         super().__init__()
         self.super_registry = super_registry
+        self.attribute_versions = Counter()
+
+    def _mark_members_changed(self):
+        self.version += 1
+        self.id_version += 1
+        self.geometry_version += 1
+
+    def mark_modified(self, attribute: str, geometry: bool = False):
+        """Increments the versions after an attribute of a stored component was reassigned.
+
+        Args:
+            attribute: name of the reassigned attribute
+            geometry: if True, the geometry version is incremented as well
+
+        """
+        self.version += 1
+        self.attribute_versions[attribute] += 1
+        if geometry:
+            self.geometry_version += 1
+
+    def attribute_version(self, attribute: str) -> int:
+        """Number of times an attribute of the stored components was reassigned."""
+        return self.attribute_versions[attribute]
 
     def __setitem__(self, key: str, value: NetworkComponent):
         if (
@@ -27,6 +61,16 @@ class ComponentRegistry(dict):
             raise IdenticalIDError(key)
         else:
             super().__setitem__(key, value)
+            self._mark_members_changed()
+
+    def __delitem__(self, key: str):
+        super().__delitem__(key)
+        self._mark_members_changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._mark_members_changed()
+        return value
 
     def __getitem__(self, item) -> NetworkComponent:
         if item not in self:
@@ -53,6 +97,25 @@ class SuperComponentRegistry(dict):
         for cls in classes:
             self[cls] = ComponentRegistry(super_registry=self)
 
+    @property
+    def version(self) -> int:
+        """Sum of the versions of all ComponentRegistries."""
+        return sum(registry.version for registry in self.values())
+
+    @property
+    def id_version(self) -> int:
+        """Sum of the ID versions of all ComponentRegistries."""
+        return sum(registry.id_version for registry in self.values())
+
+    @property
+    def geometry_version(self) -> int:
+        """Sum of the geometry versions of all ComponentRegistries."""
+        return sum(registry.geometry_version for registry in self.values())
+
+    def attribute_version(self, attribute: str) -> int:
+        """Sum of the attribute versions of all ComponentRegistries."""
+        return sum(registry.attribute_version(attribute) for registry in self.values())
+
     def check_id_exists(self, id) -> bool:
         """Checks if a component with the specified ID already exists in one of the ComponentRegistries.
 
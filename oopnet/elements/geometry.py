@@ -0,0 +1,379 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+import logging
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from oopnet.elements.network import Network
+
+logger = logging.getLogger(__name__)
+
+NODE_TYPES = ("junctions", "tanks", "reservoirs")
+LINK_TYPES = ("pipes", "pumps", "valves")
+
+
+@dataclass
+class NetworkGeometry:
+    """Packed plot geometry of a Network.
+
+    Nodes are ordered like get_nodes (Junctions, Tanks, Reservoirs), Links like get_links (Pipes, Pumps, Valves). The
+    polylines of all Links (start node, vertices, end node) are stored in a single vertex buffer. The points of the
+    i-th Link are vertices[offsets[i]:offsets[i + 1]].
+
+    Attributes:
+      node_ids: Node IDs
+      node_xy: Node coordinates with the shape (nodes, 2)
+      node_slices: dictionary mapping the Node types (e.g., "junctions") to their positions in node_ids
+      link_ids: Link IDs
+      link_nodes: positions of the start and end Nodes in node_ids with the shape (links, 2)
+      vertices: points of all Link polylines with the shape (points, 2)
+      offsets: position of the first point of every Link polyline in vertices and the total number of points
+      link_slices: dictionary mapping the Link types (e.g., "pipes") to their positions in link_ids
+      lengths: lengths of the Link polylines in map units
+      midpoints: Link centers measured along the polylines with the shape (links, 2)
+
+    """
+
+    node_ids: np.ndarray
+    node_xy: np.ndarray
+    node_slices: dict[str, slice]
+    link_ids: np.ndarray
+    link_nodes: np.ndarray
+    vertices: np.ndarray
+    offsets: np.ndarray
+    link_slices: dict[str, slice]
+    lengths: np.ndarray
+    midpoints: np.ndarray
+
+    @classmethod
+    def from_network(cls, network: Network) -> NetworkGeometry:
+        """Collects the coordinates of all Nodes and Links of a Network.
+
+        Args:
+          network: OOPNET network object
+
+        Returns:
+          NetworkGeometry object
+
+        """
+        node_ids, node_xy, node_slices = [], [], {}
+        for kind in NODE_TYPES:
+            nodes = network._nodes[kind].values()
+            start = len(node_ids)
+            for node in nodes:
+                node_ids.append(node.id)
+                node_xy.append((node.xcoordinate, node.ycoordinate))
+            node_slices[kind] = slice(start, len(node_ids))
+        positions = {id: index for index, id in enumerate(node_ids)}
+
+        link_ids, link_nodes, points, counts, link_slices = [], [], [], [], {}
+        for kind in LINK_TYPES:
+            links = network._links[kind].values()
+            start = len(link_ids)
+            for link in links:
+                link_ids.append(link.id)
+                link_nodes.append(
+                    (positions[link.startnode.id], positions[link.endnode.id])
+                )
+                points.extend(
+                    (vertex.xcoordinate, vertex.ycoordinate) for vertex in link.vertices
+                )
+                counts.append(len(link.vertices))
+            link_slices[kind] = slice(start, len(link_ids))
+
+        node_xy = np.array(node_xy, dtype=float).reshape(-1, 2)
+        link_nodes = np.array(link_nodes, dtype=int).reshape(-1, 2)
+        vertices, offsets = _pack_polylines(
+            node_xy[link_nodes[:, 0]],
+            np.array(points, dtype=float).reshape(-1, 2),
+            np.array(counts, dtype=int),
+            node_xy[link_nodes[:, 1]],
+        )
+        logger.debug(
+            f"Collected geometry of {len(node_ids)} nodes and {len(link_ids)} links"
+        )
+        return cls(
+            node_ids=np.array(node_ids, dtype=object),
+            node_xy=node_xy,
+            node_slices=node_slices,
+            link_ids=np.array(link_ids, dtype=object),
+            link_nodes=link_nodes,
+            vertices=vertices,
+            offsets=offsets,
+            link_slices=link_slices,
+            lengths=polyline_lengths(vertices, offsets),
+            midpoints=interpolate_polylines(vertices, offsets, 0.5),
+        )
+
+    def nodes(self, kind: str) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the IDs and coordinates of a Node type (e.g., "junctions")."""
+        part = self.node_slices[kind]
+        return self.node_ids[part], self.node_xy[part]
+
+    def links(self, kind: str) -> tuple[np.ndarray, list[np.ndarray], np.ndarray]:
+        """Returns the IDs, polylines and midpoints of a Link type (e.g., "pipes").
+
+        The polylines are views of the vertex buffer.
+
+        """
+        part = self.link_slices[kind]
+        return self.link_ids[part], self.polylines(part), self.midpoints[part]
+
+    def interpolate(self, fraction: float = 0.5) -> np.ndarray:
+        """Computes the points at a fraction of every Link polyline's length.
+
+        Args:
+          fraction: position along the polylines between 0 (start Node) and 1 (end Node)
+
+        Returns:
+            array with the shape (links, 2)
+
+        """
+        if fraction == 0.5:
+            return self.midpoints
+        return interpolate_polylines(self.vertices, self.offsets, fraction)
+
+    def polylines(self, part: slice = slice(None)) -> list[np.ndarray]:
+        """Splits the vertex buffer into the polylines of the Links selected by part."""
+        offsets = self.offsets[:-1][part]
+        ends = self.offsets[1:][part]
+        return [self.vertices[start:end] for start, end in zip(offsets, ends)]
+
+    def segments(self, part: slice = slice(None)) -> tuple[np.ndarray, np.ndarray]:
+        """Returns all straight segments of the Links selected by part.
+
+        Returns:
+            positions of the segments' Links in link_ids and the segment coordinates with the shape (segments, 2, 2)
+
+        """
+        starts, _, segment_offsets = _segment_lengths(self.vertices, self.offsets)
+        links = np.repeat(np.arange(len(self.link_ids)), np.diff(segment_offsets))
+        selected = np.zeros(len(self.link_ids), dtype=bool)
+        selected[part] = True
+        mask = selected[links]
+        starts = starts[mask]
+        return links[mask], np.stack(
+            [self.vertices[starts], self.vertices[starts + 1]], axis=1
+        )
+
+
+def _pack_polylines(
+    start: np.ndarray, points: np.ndarray, counts: np.ndarray, end: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Packs the start points, vertices and end points of all Links into a single vertex buffer.
+
+    Args:
+      start: start Node coordinates with the shape (links, 2)
+      points: vertices of all Links with the shape (vertices, 2)
+      counts: number of vertices per Link
+      end: end Node coordinates with the shape (links, 2)
+
+    Returns:
+        vertex buffer and the offsets of the polylines
+
+    """
+    offsets = np.zeros(len(counts) + 1, dtype=int)
+    np.cumsum(counts + 2, out=offsets[1:])
+    vertices = np.empty((offsets[-1], 2))
+    vertices[offsets[:-1]] = start
+    vertices[offsets[1:] - 1] = end
+    inner = np.ones(offsets[-1], dtype=bool)
+    inner[offsets[:-1]] = False
+    inner[offsets[1:] - 1] = False
+    vertices[inner] = points
+    return vertices, offsets
+
+
+def _segment_lengths(
+    vertices: np.ndarray, offsets: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Computes the lengths of all polyline segments.
+
+    Returns:
+        position of every segment's first point in vertices, segment lengths and the offsets of the Links' segments
+
+    """
+    starts = np.delete(np.arange(max(len(vertices) - 1, 0)), offsets[1:-1] - 1)
+    lengths = np.hypot(*(vertices[starts + 1] - vertices[starts]).T)
+    return starts, lengths, offsets - np.arange(len(offsets))
+
+
+def polyline_lengths(vertices: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Computes the lengths of packed polylines.
+
+    Args:
+      vertices: vertex buffer with the shape (points, 2)
+      offsets: position of the first point of every polyline in vertices and the total number of points
+
+    Returns:
+        array with one length per polyline
+
+    """
+    _, lengths, segment_offsets = _segment_lengths(vertices, offsets)
+    cumulative = np.concatenate([[0.0], np.cumsum(lengths)])
+    return np.diff(cumulative[segment_offsets])
+
+
+def interpolate_polylines(
+    vertices: np.ndarray, offsets: np.ndarray, fraction: float = 0.5
+) -> np.ndarray:
+    """Computes the points at a fraction of the length of packed polylines.
+
+    The cumulative segment lengths of all polylines are computed at once and the segments containing the points are
+    looked up with a single binary search.
+
+    Args:
+      vertices: vertex buffer with the shape (points, 2)
+      offsets: position of the first point of every polyline in vertices and the total number of points
+      fraction: position along the polylines between 0 (start) and 1 (end)
+
+    Returns:
+        array with the shape (polylines, 2)
+
+    """
+    if not 0 <= fraction <= 1:
+        raise ValueError(f"fraction has to be between 0 and 1, got {fraction}.")
+    n_links = len(offsets) - 1
+    if n_links == 0:
+        return np.empty((0, 2))
+    starts, lengths, segment_offsets = _segment_lengths(vertices, offsets)
+    cumulative = np.concatenate([[0.0], np.cumsum(lengths)])
+    first, last = segment_offsets[:-1], segment_offsets[1:] - 1
+    target = cumulative[first] + fraction * (cumulative[last + 1] - cumulative[first])
+    segment = np.searchsorted(cumulative, target, side="left") - 1
+    segment = np.clip(segment, first, last)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = (target - cumulative[segment]) / lengths[segment]
+    ratio = np.nan_to_num(ratio, nan=0.0, posinf=0.0, neginf=0.0)[:, np.newaxis]
+    a = vertices[starts[segment]]
+    b = vertices[starts[segment] + 1]
+    return a + ratio * (b - a)
+
+
+def project_on_segments(
+    points: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Projects points onto straight segments.
+
+    Args:
+      points: points with the shape (n, 2)
+      starts: segment start points with the shape (n, 2)
+      ends: segment end points with the shape (n, 2)
+
+    Returns:
+        closest points on the segments with the shape (n, 2) and their positions along the segments between 0 and 1
+
+    """
+    direction = ends - starts
+    squared = np.einsum("ij,ij->i", direction, direction)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = np.einsum("ij,ij->i", points - starts, direction) / squared
+    ratio = np.clip(np.nan_to_num(ratio, nan=0.0), 0.0, 1.0)
+    return starts + ratio[:, np.newaxis] * direction, ratio
+
+
+def point_segment_distance(
+    points: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    """Computes the distances between points and straight segments.
+
+    Args:
+      points: points with the shape (n, 2)
+      starts: segment start points with the shape (n, 2)
+      ends: segment end points with the shape (n, 2)
+
+    Returns:
+        array with n distances
+
+    """
+    projected, _ = project_on_segments(points, starts, ends)
+    return np.hypot(*(points - projected).T)
+
+
+def clip_segments(
+    segments: np.ndarray, extent: tuple[float, float, float, float]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Clips segments to a rectangle (Liang-Barsky).
+
+    Args:
+      segments: segment coordinates with the shape (segments, 2, 2)
+      extent: rectangle as (xmin, xmax, ymin, ymax)
+
+    Returns:
+        mask of the segments intersecting the rectangle and the clipped segments
+
+    """
+    start, delta = segments[:, 0], segments[:, 1] - segments[:, 0]
+    low = np.zeros(len(segments))
+    high = np.ones(len(segments))
+    inside = np.ones(len(segments), dtype=bool)
+    for axis, (lower, upper) in enumerate((extent[:2], extent[2:])):
+        d = delta[:, axis]
+        p = start[:, axis]
+        flat = d == 0
+        inside &= ~flat | ((p >= lower) & (p <= upper))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t1 = (lower - p) / d
+            t2 = (upper - p) / d
+        low = np.where(flat, low, np.maximum(low, np.minimum(t1, t2)))
+        high = np.where(flat, high, np.minimum(high, np.maximum(t1, t2)))
+    inside &= low <= high
+    clipped = np.stack(
+        [
+            start[inside] + low[inside, np.newaxis] * delta[inside],
+            start[inside] + high[inside, np.newaxis] * delta[inside],
+        ],
+        axis=1,
+    )
+    return inside, clipped
+
+
+def douglas_peucker(
+    vertices: np.ndarray, offsets: np.ndarray, tolerance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Simplifies packed polylines with the Douglas-Peucker algorithm.
+
+    The first and last point of every polyline are kept. All polylines are simplified at once: in every iteration,
+    the point farthest from the current segment is searched for in all unfinished segments and kept if its distance
+    exceeds the tolerance, which splits the segment in two.
+
+    Args:
+      vertices: vertex buffer with the shape (points, 2)
+      offsets: position of the first point of every polyline in vertices and the total number of points
+      tolerance: maximum distance between a removed point and the simplified polyline
+
+    Returns:
+        simplified vertex buffer and its offsets
+
+    """
+    keep = np.zeros(len(vertices), dtype=bool)
+    keep[offsets[:-1]] = True
+    keep[offsets[1:] - 1] = True
+    starts, ends = offsets[:-1], offsets[1:] - 1
+    while True:
+        open_ = ends - starts > 1
+        starts, ends = starts[open_], ends[open_]
+        if not len(starts):
+            break
+        counts = ends - starts - 1
+        first = np.cumsum(counts) - counts
+        segment = np.repeat(np.arange(len(starts)), counts)
+        points = np.arange(counts.sum()) - first[segment] + starts[segment] + 1
+        distances = point_segment_distance(
+            vertices[points], vertices[starts[segment]], vertices[ends[segment]]
+        )
+        # the first point of every segment after sorting by segment and descending distance
+        farthest = points[np.lexsort((-distances, segment))[first]]
+        split = np.maximum.reduceat(distances, first) > tolerance
+        keep[farthest[split]] = True
+        starts, ends = (
+            np.concatenate([starts[split], farthest[split]]),
+            np.concatenate([farthest[split], ends[split]]),
+        )
+
+    new_offsets = np.zeros(len(offsets), dtype=int)
+    if len(offsets) > 1:
+        np.cumsum(np.add.reduceat(keep.astype(int), offsets[:-1]), out=new_offsets[1:])
+    return vertices[keep], new_offsets
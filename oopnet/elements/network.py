@@ -1,7 +1,7 @@
 from __future__ import annotations
-from typing import Optional, TYPE_CHECKING, Union
+from typing import Iterator, Optional, TYPE_CHECKING, Union, TextIO
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 
 if TYPE_CHECKING:
     from bokeh.plotting import Figure as BokehFigure
@@ -14,7 +14,10 @@ from oopnet.writer.write import write
 from oopnet.reader.read import read
 from oopnet.plotter.pyplot import NetworkPlotter
 from oopnet.plotter.bokehplot import Plotsimulation as BokehPlot
+from oopnet.plotter.live import LivePlot
 from oopnet.simulator.epanet2 import ModelSimulator
+from oopnet.elements.geometry import NetworkGeometry
+from oopnet.elements.spatial_index import SpatialIndex
 from oopnet.elements.water_quality import Reaction
 from oopnet.elements.options_and_reporting import (
     Options,
@@ -34,6 +37,7 @@ if TYPE_CHECKING:
     from oopnet.elements.system_operation import Energy, Control, Rule, Curve, Pattern
     from oopnet.elements.network_map_tags import Vertex, Label, Backdrop
     from oopnet.report.report import SimulationReport
+    from oopnet.simulator.reportfile_reader import ReportStep
 
 
 @dataclass
@@ -61,6 +65,9 @@ class Network:
       _links: SuperComponentRegistry for all Link objects in the network
       _curves: ComponentRegistry of for Curve objects belonging to the network
       _patterns: ComponentRegistry of for Pattern objects belonging to the network
+      _section_cache: rendered EPANET input file sections used by the writer
+      _geometry_cache: NetworkGeometry used for plotting and the change token it was created with and the
+        SpatialIndex kept up to date with it
 
     """
 
@@ -82,9 +89,11 @@ class Network:
     _curves: ComponentRegistry = field(default_factory=ComponentRegistry)
     _patterns: ComponentRegistry = field(default_factory=ComponentRegistry)
     _rules: ComponentRegistry = field(default_factory=ComponentRegistry)
+    _section_cache: dict = field(default_factory=dict, compare=False, repr=False)
+    _geometry_cache: dict = field(default_factory=dict, compare=False, repr=False)
 
     @classmethod
-    def read(cls, filename=Optional[str], content=Optional[str]):
+    def read(cls, filename: Optional[str] = None, content: Optional[str] = None):
         """Reads an EPANET input file.
 
         Args:
@@ -94,17 +103,62 @@ class Network:
         """
         return read(network=cls(), filename=filename, content=content)
 
-    def write(self, filename):
+    @property
+    def geometry(self) -> NetworkGeometry:
+        """Packed Node coordinates, Link polylines and Link midpoints used for plotting.
+
+        The geometry is cached and only collected again after Nodes or Links were added, removed or renamed or their
+        coordinates, start or end Nodes or vertices were replaced. Vertices modified in place are not detected.
+
+        """
+        token = (
+            id(self._nodes),
+            self._nodes.geometry_version,
+            id(self._links),
+            self._links.geometry_version,
+        )
+        cached = self._geometry_cache.get("geometry")
+        if cached is None or cached[0] != token:
+            cached = (token, NetworkGeometry.from_network(self))
+            self._geometry_cache["geometry"] = cached
+        return cached[1]
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """Spatial index of the Nodes and Links for nearest neighbour, radius, bounding box and polygon queries.
+
+        The index is created on first use and updated incrementally with the changes of the geometry (see
+        Network.geometry) afterwards.
+
+        """
+        geometry = self.geometry
+        index = self._geometry_cache.get("spatial_index")
+        if index is None:
+            index = SpatialIndex(geometry)
+            self._geometry_cache["spatial_index"] = index
+        else:
+            index.update(geometry)
+        return index
+
+    def write(
+        self,
+        filename: Union[str, TextIO],
+        units: Optional[str] = None,
+        cache: bool = False,
+    ):
         """Converts the Network to an EPANET input file and saves it with the desired filename.
 
         Args:
-          filename: desired filename/path were the user wants to store the file
+          filename: desired filename/path were the user wants to store the file or a writable text stream (e.g., io.StringIO)
+          units: EPANET flow units the file should be written in (e.g., "GPM"), defaults to the Network's units
+          cache: if True, sections of unchanged components are reused from earlier writes, in-place modifications of
+            list attributes (e.g., pattern.multipliers.append(1.0)) are not detected (see oopnet.writer.write.write)
 
         Returns:
           0 if successful
 
         """
-        return write(self, filename)
+        return write(self, filename, units, cache)
 
     def run(
         self,
@@ -113,14 +167,35 @@ class Network:
         path: Optional[str] = None,
         startdatetime: Optional[datetime] = None,
         output: bool = False,
+        variables: Optional[list[str]] = None,
+        nodes: Optional[list[str]] = None,
+        links: Optional[list[str]] = None,
+        start: Optional[timedelta] = None,
+        end: Optional[timedelta] = None,
+        directory: Optional[str] = None,
+        relative_time: bool = False,
     ) -> SimulationReport:
         """Runs an EPANET simulation by calling command line EPANET
 
         Attributes:
           filename: if thing is an OOPNET network, filename is an option to perform command line EPANET simulations with a specific filename. If filename is a Python None object then a file with a random UUID (universally unique identifier) is generated
           delete: if delete is True the EPANET Input and SimulationReport file is deleted, if False then the simulation results won't be deleted and are stored in a folder named path
-          path: Path were to perform the simulations. If path is a Python None object then a tmp-folder is generated
+          path: Path were to perform the simulations. If path is a Python None object and delete is True, the files are placed in a RAM-backed directory (e.g., /dev/shm) if available and in the system's temporary directory otherwise. If path is None and delete is False, a tmp-folder is generated
           output: If True, stdout and strerr will be printed to console and logged.
+          variables: report variables to be simulated and read (e.g., ["Pressure"]), defaults to the Network's report parameters
+          nodes: IDs of the Nodes results are needed for, defaults to all Nodes
+          links: IDs of the Links results are needed for, defaults to all Links
+          start: first reported time step relative to the start of the simulation
+          end: last reported time step relative to the start of the simulation
+          directory: if passed, the results of extended period simulations are streamed to memory-mapped files in this directory instead of being kept in memory
+          relative_time: if True, the results are indexed by the time since the start of the simulation (timedelta64) instead of timestamps starting at startdatetime
+
+        If any of variables, nodes, links, start or end is passed, EPANET only reports (and OOPNET only parses) the
+        selected results. For instance, `network.run(variables=["Pressure"], nodes=["J-1", "J-2"])` only returns the
+        pressures of two Junctions and no Link results. The Network's report settings are not changed.
+
+        For long extended period simulations, `network.run(directory="results")` keeps the results on disk. They can be
+        aggregated chunk by chunk with SimulationReport.resample (e.g., daily minimum pressures).
 
         Returns:
           OOPNET report object
@@ -133,9 +208,66 @@ class Network:
             path=path,
             startdatetime=startdatetime,
             output=output,
+            variables=variables,
+            nodes=nodes,
+            links=links,
+            start=start,
+            end=end,
+            directory=directory,
+            relative_time=relative_time,
         )
         return sim.run()
 
+    def run_stepwise(
+        self,
+        filename: Optional[str] = None,
+        delete: bool = True,
+        path: Optional[str] = None,
+        startdatetime: Optional[datetime] = None,
+        output: bool = False,
+        variables: Optional[list[str]] = None,
+        nodes: Optional[list[str]] = None,
+        links: Optional[list[str]] = None,
+        start: Optional[timedelta] = None,
+        end: Optional[timedelta] = None,
+        relative_time: bool = False,
+        poll_interval: float = 0.1,
+    ) -> Iterator[ReportStep]:
+        """Runs an EPANET simulation and yields the results of one reported time step after another.
+
+        The arguments are the same as for run. EPANET writes the result tables to the report file only after the
+        simulation of the whole period is finished, so the first time step is yielded after the simulation and the
+        results do not show its progress. Only the results of the current time step are kept in memory, so the results
+        of long extended period simulations can be processed or played back (e.g., with live_plot) without holding the
+        whole result set.
+
+        Example:
+          >>> for step in network.run_stepwise(variables=["Pressure"]):
+          ...     print(step.time, step.nodes["Pressure"].min())
+
+        Args:
+          poll_interval: time (in seconds) to wait for new results
+
+        Returns:
+          iterator of ReportStep objects
+
+        """
+        sim = ModelSimulator(
+            thing=self,
+            filename=filename,
+            delete=delete,
+            path=path,
+            startdatetime=startdatetime,
+            output=output,
+            variables=variables,
+            nodes=nodes,
+            links=links,
+            start=start,
+            end=end,
+            relative_time=relative_time,
+        )
+        return sim.stream(poll_interval=poll_interval)
+
     def plot(
         self,
         fignum: Optional[int] = None,
@@ -150,6 +282,9 @@ class Network:
         nodes_vlim=None,
         links_vlim=None,
         truncate_nodes=None,
+        raster: bool = False,
+        detail_threshold: int = 5000,
+        hit_testing: bool = False,
     ) -> PyPlotFigure:
         """Plots the Network with simulation results as a network plot with Matplotlib.
 
@@ -170,6 +305,9 @@ class Network:
           links_vlim:
           robust: If True, 2nd and 98th percentiles are used as limits for the colorbar, else the minima and maxima are used.
           truncate_nodes: If True, only junctions for which a value was submitted using the nodes parameter are plotted. If the nodes parameters isn't being used, all junctions are plotted. If not set True, junctions for which no value was submitted using the nodes parameters are plotted in black. This only applies to junctions and not to tanks and reservoirs, which are always plotted.
+          raster: If True, large networks are drawn as an image aggregating the values per pixel as long as more than detail_threshold Links are visible and with simplified vertices when zoomed in. The linkwidth and truncate_nodes settings are ignored.
+          detail_threshold: maximum number of visible Links drawn as vector graphics in raster mode
+          hit_testing: If True, clicking an element shows its properties and values in an annotation. The HitTester with the properties of all elements and a spatial index is attached to the figure and can be retrieved with oopnet.plotter.hittest.get_hit_tester.
 
         Returns:
           Matplotlib's figure handle
@@ -191,6 +329,9 @@ class Network:
             ax=ax,
             nodes_vlim=nodes_vlim,
             links_vlim=links_vlim,
+            raster=raster,
+            detail_threshold=detail_threshold,
+            hit_testing=hit_testing,
         )
 
     def animate(
@@ -211,6 +352,7 @@ class Network:
         truncate_nodes=None,
         interval: int = 500,
         repeat: bool = False,
+        blit: bool = True,
     ) -> FuncAnimation:
         """Animates the Network with simulation results as a network plot with Matplotlib.
 
@@ -231,6 +373,9 @@ class Network:
           links_vlim:
           robust: If True, 2nd and 98th percentiles are used as limits for the colorbar, else the minima and maxima are used.
           truncate_nodes: If True, only junctions for which a value was submitted using the nodes parameter are plotted. If the nodes parameters isn't being used, all junctions are plotted. If not set True, junctions for which no value was submitted using the nodes parameters are plotted in black. This only applies to junctions and not to tanks and reservoirs, which are always plotted.
+          interval: interval between the individual frames in milliseconds
+          repeat: if True, the animation will be created as a recurring loop
+          blit: if True, only the updated artists are redrawn in every frame
 
         Returns:
           Matplotlib's figure handle
@@ -255,7 +400,112 @@ class Network:
             node_label=node_label,
             link_label=link_label,
             interval=interval,
-            repeat=repeat
+            repeat=repeat,
+            blit=blit,
+        )
+
+    def render_animation(
+        self,
+        path: str,
+        nodes: Optional[pd.DataFrame] = None,
+        node_label: Optional[str] = None,
+        links: Optional[pd.DataFrame] = None,
+        link_label: Optional[str] = None,
+        linkwidth: Optional[pd.DataFrame] = None,
+        colorbar: Union[bool, dict] = True,
+        colormap: Union[str, dict] = "viridis",
+        markersize: float = 8.0,
+        robust: bool = False,
+        nodes_vlim: Optional[tuple[float, float]] = None,
+        links_vlim: Optional[tuple[float, float]] = None,
+        truncate_nodes=None,
+        fps: float = 10,
+        dpi: float = 100,
+        figsize: Optional[tuple[float, float]] = None,
+        workers: Optional[int] = None,
+    ) -> str:
+        """Renders an animation of the Network with simulation results to a GIF or video file using multiple processes.
+
+        The arguments are the same as for animate. Instead of a FuncAnimation that renders the frames one after
+        another, the frames are rendered by a pool of processes and stitched to a GIF (path ending with ".gif") or a
+        video (e.g., ".mp4", requires ffmpeg).
+
+        Example:
+          >>> network.render_animation("pressure.mp4", nodes=rpt.pressure, node_label="Pressure (m)", workers=8)
+
+        Args:
+          path: path of the output file
+          fps: frames per second
+          dpi: resolution of the frames
+          figsize: figure size in inches
+          workers: number of processes, defaults to the number of CPUs
+
+        Returns:
+          path of the output file
+
+        """
+        plotter = NetworkPlotter(
+            colorbar=colorbar,
+            colormap=colormap,
+            markersize=markersize,
+            robust=robust,
+            truncate_nodes=truncate_nodes,
+        )
+        return plotter.render_animation(
+            network=self,
+            path=path,
+            nodes=nodes,
+            node_label=node_label,
+            links=links,
+            link_label=link_label,
+            link_width=linkwidth,
+            nodes_vlim=nodes_vlim,
+            links_vlim=links_vlim,
+            fps=fps,
+            dpi=dpi,
+            figsize=figsize,
+            workers=workers,
+        )
+
+    def live_plot(
+        self,
+        fignum: Optional[int] = None,
+        colorbar: Union[bool, dict] = True,
+        colormap: Union[str, dict] = "viridis",
+        ax: Optional[Axes] = None,
+        markersize: float = 8.0,
+        nodes_vlim: Optional[tuple[float, float]] = None,
+        links_vlim: Optional[tuple[float, float]] = None,
+    ) -> LivePlot:
+        """Creates a Matplotlib network plot whose colors can be updated with the results of single time steps.
+
+        Example:
+          >>> live = network.live_plot(nodes_vlim=(0, 100))
+          >>> live.follow(network.run_stepwise(), nodes="Pressure", links="Flow")
+
+        Args:
+          fignum: figure number, where to plot the network
+          colorbar: If True a colorbar is created, if False there is no colorbar in the plot. If one wants to set this setting for nodes and links seperatly, make use of a dictionary with key 'node' for nodes respectively key 'link' for links
+          colormap: Colormap defining which colors are used for the simulation results (default is matplotlib's colormap viridis). If one wants to use different colormaps for nodes and links, then make use of a dictionary with key 'node' for nodes respectively key 'link' for links
+          ax: Matplotlib Axes object
+          markersize: size of markers
+          nodes_vlim: fixed limits for the Node values colorbar as tuple (min, max), by default the limits grow with the plotted values
+          links_vlim: fixed limits for the Link values colorbar as tuple (min, max), by default the limits grow with the plotted values
+
+        Returns:
+          LivePlot object
+
+        """
+        plotter = NetworkPlotter(
+            colorbar=colorbar, colormap=colormap, markersize=markersize
+        )
+        return LivePlot(
+            plotter,
+            self,
+            fignum=fignum,
+            ax=ax,
+            nodes_vlim=nodes_vlim,
+            links_vlim=links_vlim,
         )
 
     def bokehplot(
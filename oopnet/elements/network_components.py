@@ -1,13 +1,13 @@
 from __future__ import annotations
-from typing import Union, Optional, TYPE_CHECKING
+from typing import Union, Optional, TYPE_CHECKING, ClassVar
 from dataclasses import dataclass, field
 from copy import deepcopy
 import logging
-import math
 
 import numpy as np
 
 from oopnet.elements.base import NetworkComponent
+from oopnet.elements.geometry import interpolate_polylines
 from oopnet.utils.oopnet_logging import logging_decorator
 
 if TYPE_CHECKING:
@@ -42,6 +42,12 @@ class Node(NetworkComponent):
     strength: float = 0.0
     sourcepattern: Optional[list[Pattern]] = None
 
+    _geometry_attributes: ClassVar[tuple[str, ...]] = (
+        "_id",
+        "xcoordinate",
+        "ycoordinate",
+    )
+
     @property
     def coordinates(self) -> np.ndarray:
         """Property returning node coordinates.
@@ -61,6 +67,7 @@ class Link(NetworkComponent):
       startnode: Node-object at the start of the Link
       endnode: Node-object at the end of the Link
       status: Current status of the Link (OPEN, CLOSED, CV or ACTIVE)
+      vertices: Vertex objects between the start and end Node. Assign a new list instead of modifying the list in place to update the Network's cached plot geometry.
 
     """
 
@@ -69,6 +76,13 @@ class Link(NetworkComponent):
     status: str = "OPEN"
     vertices: list[Vertex] = field(default_factory=list)
 
+    _geometry_attributes: ClassVar[tuple[str, ...]] = (
+        "_id",
+        "startnode",
+        "endnode",
+        "vertices",
+    )
+
     @property
     def coordinates(self) -> np.ndarray:
         """Property returning start and end node coordinates"""
@@ -84,26 +98,14 @@ class Link(NetworkComponent):
         )
 
     @property
-    def center(self):
-        """Returns the Link's center based on its start and end nodes as well as its vertices."""
-        if not self.vertices:
-            return np.add(self.coordinates[0], self.coordinates[1])[0:2] * 0.5
-
-        length = 0
-        for index, coords in enumerate(self.coordinates_2d):
-            if index == len(self.coordinates_2d) - 1:
-                break
-            next_coords = self.coordinates_2d[index + 1]
-            length += math.dist(coords, next_coords)
-
-        passed_length = 0
-        for index, coords in enumerate(self.coordinates_2d):
-            next_coords = self.coordinates_2d[index + 1]
-            segment_length = math.dist(coords, next_coords)
-            if passed_length + segment_length >= length / 2:
-                length_factor = (length / 2 - passed_length) / segment_length
-                return np.add(coords, next_coords) * length_factor
-            passed_length += segment_length
+    def center(self) -> np.ndarray:
+        """Returns the Link's center based on its start and end nodes as well as its vertices.
+
+        The center is the point halfway along the polyline through the start node, the vertices and the end node.
+
+        """
+        points = self.coordinates_2d
+        return interpolate_polylines(points, np.array([0, len(points)]), 0.5)[0]
 
     def revert(self):
         """Switches the link's start and end nodes and it's vertices."""
@@ -126,6 +128,8 @@ class Junction(Node):
     demandpattern: Union[Pattern, list[Pattern], None] = None
     demand: Union[float, list[float]] = 0.0
 
+    _registry_keys: ClassVar[tuple[str, ...]] = ("_nodes", "junctions")
+
     @NetworkComponent.id.setter
     def id(self, id: str):
         """Sets ID of NetworkComponent and replaces key in network hash"""
@@ -150,6 +154,8 @@ class Reservoir(Node):
         None, Pattern, list[Pattern]
     ] = None  # = Either(None, Instance(Pattern), List(Instance(Pattern)))
 
+    _registry_keys: ClassVar[tuple[str, ...]] = ("_nodes", "reservoirs")
+
     @NetworkComponent.id.setter
     def id(self, id: str):
         """Sets ID of NetworkComponent and replaces key in network hash"""
@@ -185,6 +191,8 @@ class Tank(Node):
     reactiontank: Optional[float] = None
     mixingmodel: str = "MIXED"  # = Enum('MIXED', '2COMP', 'FIFO', 'LIFO')
 
+    _registry_keys: ClassVar[tuple[str, ...]] = ("_nodes", "tanks")
+
     @NetworkComponent.id.setter
     def id(self, id: str):
         """Sets ID of NetworkComponent and replaces key in network hash"""
@@ -214,6 +222,8 @@ class Pipe(Link):
     reactionbulk: Optional[float] = None
     reactionwall: Optional[float] = None
 
+    _registry_keys: ClassVar[tuple[str, ...]] = ("_links", "pipes")
+
     @NetworkComponent.id.setter
     def id(self, id: str):
         """Sets ID of NetworkComponent and replaces key in network hash"""
@@ -298,6 +308,8 @@ class Pump(Link):
     pattern: Optional[Pattern] = None
     setting: Optional[float] = None
 
+    _registry_keys: ClassVar[tuple[str, ...]] = ("_links", "pumps")
+
     @NetworkComponent.id.setter
     def id(self, id: str):
         """Sets ID of NetworkComponent and replaces key in network hash"""
@@ -319,6 +331,8 @@ class Valve(Link):
     diameter: float = 12.0
     minorloss: float = 0.0
 
+    _registry_keys: ClassVar[tuple[str, ...]] = ("_links", "valves")
+
     @NetworkComponent.id.setter
     def id(self, id: str):
         """Sets ID of NetworkComponent and replaces key in network hash"""
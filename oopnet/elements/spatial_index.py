@@ -0,0 +1,641 @@
+from __future__ import annotations
+from typing import Callable, Optional, Sequence
+import logging
+
+from matplotlib.path import Path
+import numpy as np
+import pandas as pd
+
+from oopnet.elements.geometry import (
+    LINK_TYPES,
+    NODE_TYPES,
+    NetworkGeometry,
+    clip_segments,
+    point_segment_distance,
+    project_on_segments,
+)
+
+logger = logging.getLogger(__name__)
+
+# the grid is rebuilt once more than this fraction of the indexed elements was added, changed or removed since the
+# last build
+REBUILD_FRACTION = 0.1
+# minimum number of changes before the grid is rebuilt
+REBUILD_MINIMUM = 256
+
+
+def _kind_codes(slices: dict[str, slice], kinds: Sequence[str], n: int) -> np.ndarray:
+    """Returns the position of every element's type (e.g., "pipes") in kinds."""
+    codes = np.zeros(n, dtype=np.int8)
+    for code, kind in enumerate(kinds):
+        codes[slices[kind]] = code
+    return codes
+
+
+def _kind_code(kind: Optional[str], kinds: Sequence[str]) -> Optional[int]:
+    """Converts a type filter (e.g., "junctions") to its code, None selects all types."""
+    if kind is None:
+        return None
+    if kind not in kinds:
+        raise ValueError(f"kind has to be one of {kinds}, got {kind!r}.")
+    return kinds.index(kind)
+
+
+def _ranges(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Concatenates the ranges starts[i] to stops[i] - 1."""
+    counts = stops - starts
+    return np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(
+        counts.sum()
+    )
+
+
+class _Grid:
+    """Uniform grid of axis-aligned boxes.
+
+    Every box is registered in all cells it overlaps. The (cell, box) pairs are sorted by their cell key (row * columns
+    + column), so the boxes of a row of cells are a contiguous range found with two binary searches.
+
+    Args:
+      boxes: boxes as (xmin, ymin, xmax, ymax) with the shape (boxes, 4)
+      minimum_size: lower bound of the cell size, the cell size is chosen for about one box per cell otherwise
+
+    """
+
+    def __init__(self, boxes: np.ndarray, minimum_size: float = 0.0):
+        if len(boxes):
+            self.origin = boxes[:, :2].min(axis=0)
+            extent = boxes[:, 2:].max(axis=0) - self.origin
+        else:
+            self.origin, extent = np.zeros(2), np.zeros(2)
+        area = np.prod(extent)
+        if area > 0:
+            size = np.sqrt(area / len(boxes))
+        else:
+            size = extent.max() / max(len(boxes), 1)
+        self.cell_size = max(size, minimum_size) or 1.0
+        self.shape = np.floor(extent / self.cell_size).astype(int) + 1
+
+        low, high = self._cells(boxes[:, :2]), self._cells(boxes[:, 2:])
+        width = high[:, 0] - low[:, 0] + 1
+        counts = width * (high[:, 1] - low[:, 1] + 1)
+        items = np.repeat(np.arange(len(boxes)), counts)
+        local = _ranges(np.zeros(len(boxes), dtype=int), counts)
+        columns = low[items, 0] + local % width[items]
+        rows = low[items, 1] + local // width[items]
+        keys = rows * self.shape[0] + columns
+        order = np.argsort(keys, kind="stable")
+        self.keys, self.items = keys[order], items[order]
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        cells = np.floor((points - self.origin) / self.cell_size).astype(int)
+        return np.clip(cells, 0, self.shape - 1)
+
+    def covers(self, box: tuple[float, float, float, float]) -> bool:
+        """Checks if a box contains all cells of the grid."""
+        upper = self.origin + self.shape * self.cell_size
+        return bool(
+            np.all(np.asarray(box[:2]) <= self.origin)
+            and np.all(np.asarray(box[2:]) >= upper)
+        )
+
+    def query(self, box: tuple[float, float, float, float]) -> np.ndarray:
+        """Returns the positions of all boxes registered in the cells overlapping a box."""
+        upper = self.origin + self.shape * self.cell_size
+        if (
+            box[2] < self.origin[0]
+            or box[3] < self.origin[1]
+            or box[0] > upper[0]
+            or box[1] > upper[1]
+        ):
+            return np.empty(0, dtype=int)
+        (column0, row0), (column1, row1) = self._cells(np.reshape(box, (2, 2)))
+        rows = np.arange(row0, row1 + 1) * self.shape[0]
+        starts = np.searchsorted(self.keys, rows + column0, side="left")
+        stops = np.searchsorted(self.keys, rows + column1, side="right")
+        return np.unique(self.items[_ranges(starts, stops)])
+
+
+class SpatialIndex:
+    """Grid index of Node coordinates and Link polylines for nearest neighbour, radius, bounding box and polygon queries.
+
+    Nodes are indexed as points and Links as their straight segments in uniform grids, so a query only checks the
+    elements in the grid cells around the query location instead of the whole network. Use Network.spatial_index to
+    get an index that is kept up to date with the Network.
+
+    Changes are applied incrementally with update: elements that were removed or moved are masked and added or moved
+    elements are kept in a small unindexed buffer that every query checks directly. The grids are rebuilt once the
+    number of changes exceeds REBUILD_FRACTION of the indexed elements.
+
+    Example:
+      >>> index = network.spatial_index
+      >>> index.nearest_node(1500.0, 3200.0, kind="junctions")
+      ('J-31', 12.5)
+      >>> meters = index.nearest_links(meter_xy, kind="pipes")
+
+    Args:
+      geometry: geometry of the indexed Network
+
+    """
+
+    def __init__(self, geometry: NetworkGeometry):
+        self._build(geometry)
+
+    def _build(self, geometry: NetworkGeometry):
+        """Indexes all elements of a geometry."""
+        self._geometry = geometry
+        self._node_ids = geometry.node_ids.copy()
+        self._node_xy = geometry.node_xy.copy()
+        self._node_kinds = _kind_codes(
+            geometry.node_slices, NODE_TYPES, len(geometry.node_ids)
+        )
+        self._node_alive = np.ones(len(self._node_ids), dtype=bool)
+        self._node_grid = _Grid(np.hstack([self._node_xy, self._node_xy]))
+        self._node_built = len(self._node_ids)
+
+        self._link_ids = geometry.link_ids.copy()
+        self._link_kinds = _kind_codes(
+            geometry.link_slices, LINK_TYPES, len(geometry.link_ids)
+        )
+        self._link_alive = np.ones(len(self._link_ids), dtype=bool)
+        segment_links, self._segments = geometry.segments()
+        self._segment_links = segment_links
+        self._segment_offsets = np.searchsorted(
+            segment_links, np.arange(len(self._link_ids) + 1)
+        )
+        self._segment_positions = self._chainage(self._segments, self._segment_offsets)
+        boxes = np.hstack([self._segments.min(axis=1), self._segments.max(axis=1)])
+        lengths = np.hypot(*(self._segments[:, 1] - self._segments[:, 0]).T)
+        self._link_grid = _Grid(
+            boxes, minimum_size=float(np.median(lengths)) if len(lengths) else 0.0
+        )
+        self._link_built = len(self._segments)
+        self._changes = 0
+        logger.debug(
+            f"Indexed {len(self._node_ids)} nodes and {len(self._segments)} link segments"
+        )
+
+    @staticmethod
+    def _chainage(segments: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Computes the distance of every segment's start along its Link."""
+        lengths = np.hypot(*(segments[:, 1] - segments[:, 0]).T)
+        cumulative = np.concatenate([[0.0], np.cumsum(lengths)])
+        counts = np.diff(offsets)
+        return cumulative[:-1] - np.repeat(cumulative[offsets[:-1]], counts)
+
+    def update(self, geometry: NetworkGeometry):
+        """Applies the differences between the indexed elements and a new geometry of the Network.
+
+        Nodes and Links are matched by their IDs. Only elements that were added, removed or whose coordinates changed
+        are touched.
+
+        Args:
+          geometry: current geometry of the indexed Network
+
+        """
+        if geometry is self._geometry:
+            return
+        self._update_nodes(geometry)
+        self._update_links(geometry)
+        self._geometry = geometry
+        indexed = self._node_built + self._link_built
+        if self._changes > max(REBUILD_MINIMUM, REBUILD_FRACTION * indexed):
+            logger.debug(f"Rebuilding spatial index after {self._changes} changes")
+            self._build(geometry)
+
+    def _update_nodes(self, geometry: NetworkGeometry):
+        alive = np.flatnonzero(self._node_alive)
+        lookup = pd.Index(self._node_ids[alive]).get_indexer(geometry.node_ids)
+        kinds = _kind_codes(geometry.node_slices, NODE_TYPES, len(geometry.node_ids))
+        matched = np.flatnonzero(lookup >= 0)
+        old = alive[lookup[matched]]
+        same = np.all(self._node_xy[old] == geometry.node_xy[matched], axis=1) & (
+            self._node_kinds[old] == kinds[matched]
+        )
+        keep = np.zeros(len(self._node_ids), dtype=bool)
+        keep[old[same]] = True
+        added = np.setdiff1d(np.arange(len(geometry.node_ids)), matched[same])
+        self._changes += int(np.count_nonzero(self._node_alive & ~keep)) + len(added)
+        self._node_alive &= keep
+
+        self._node_ids = np.concatenate([self._node_ids, geometry.node_ids[added]])
+        self._node_xy = np.concatenate([self._node_xy, geometry.node_xy[added]])
+        self._node_kinds = np.concatenate([self._node_kinds, kinds[added]])
+        self._node_alive = np.concatenate(
+            [self._node_alive, np.ones(len(added), dtype=bool)]
+        )
+
+    def _update_links(self, geometry: NetworkGeometry):
+        alive = np.flatnonzero(self._link_alive)
+        lookup = pd.Index(self._link_ids[alive]).get_indexer(geometry.link_ids)
+        kinds = _kind_codes(geometry.link_slices, LINK_TYPES, len(geometry.link_ids))
+        segment_links, segments = geometry.segments()
+        offsets = np.searchsorted(segment_links, np.arange(len(geometry.link_ids) + 1))
+
+        # compare the segments of Links with the same ID, type and number of segments
+        matched = np.flatnonzero(lookup >= 0)
+        old = alive[lookup[matched]]
+        counts = np.diff(offsets)[matched]
+        candidates = (counts == np.diff(self._segment_offsets)[old]) & (
+            kinds[matched] == self._link_kinds[old]
+        )
+        matched, old, counts = matched[candidates], old[candidates], counts[candidates]
+        new_segments = _ranges(offsets[matched], offsets[matched + 1])
+        old_segments = _ranges(
+            self._segment_offsets[old], self._segment_offsets[old] + counts
+        )
+        equal = np.all(
+            segments[new_segments] == self._segments[old_segments], axis=(1, 2)
+        )
+        same = np.zeros(len(matched), dtype=bool)
+        if len(matched):
+            same = np.logical_and.reduceat(equal, np.cumsum(counts) - counts)
+
+        keep = np.zeros(len(self._link_ids), dtype=bool)
+        keep[old[same]] = True
+        added = np.setdiff1d(np.arange(len(geometry.link_ids)), matched[same])
+        added_segments = _ranges(offsets[added], offsets[added + 1])
+        added_counts = np.diff(offsets)[added]
+        self._changes += int(np.count_nonzero(self._link_alive & ~keep)) + len(added)
+        self._link_alive &= keep
+
+        first = len(self._link_ids)
+        self._link_ids = np.concatenate([self._link_ids, geometry.link_ids[added]])
+        self._link_kinds = np.concatenate([self._link_kinds, kinds[added]])
+        self._link_alive = np.concatenate(
+            [self._link_alive, np.ones(len(added), dtype=bool)]
+        )
+        new_offsets = np.zeros(len(added) + 1, dtype=int)
+        np.cumsum(added_counts, out=new_offsets[1:])
+        self._segments = np.concatenate([self._segments, segments[added_segments]])
+        self._segment_links = np.concatenate(
+            [
+                self._segment_links,
+                np.repeat(np.arange(first, len(self._link_ids)), added_counts),
+            ]
+        )
+        self._segment_positions = np.concatenate(
+            [
+                self._segment_positions,
+                self._chainage(segments[added_segments], new_offsets),
+            ]
+        )
+        self._segment_offsets = np.concatenate(
+            [self._segment_offsets, self._segment_offsets[-1] + new_offsets[1:]]
+        )
+
+    def _node_candidates(
+        self, box: tuple[float, float, float, float], code: Optional[int]
+    ) -> np.ndarray:
+        """Returns the live Nodes in the grid cells overlapping box and all Nodes added since the last build."""
+        entries = np.concatenate(
+            [
+                self._node_grid.query(box),
+                np.arange(self._node_built, len(self._node_ids)),
+            ]
+        )
+        mask = self._node_alive[entries]
+        if code is not None:
+            mask &= self._node_kinds[entries] == code
+        return entries[mask]
+
+    def _segment_candidates(
+        self, box: tuple[float, float, float, float], code: Optional[int]
+    ) -> np.ndarray:
+        """Returns the segments of live Links in the grid cells overlapping box and all segments added since the last
+        build."""
+        entries = np.concatenate(
+            [
+                self._link_grid.query(box),
+                np.arange(self._link_built, len(self._segments)),
+            ]
+        )
+        links = self._segment_links[entries]
+        mask = self._link_alive[links]
+        if code is not None:
+            mask &= self._link_kinds[links] == code
+        return entries[mask]
+
+    def _segment_distances(self, point: np.ndarray, segments: np.ndarray) -> np.ndarray:
+        return point_segment_distance(
+            np.broadcast_to(point, (len(segments), 2)),
+            self._segments[segments, 0],
+            self._segments[segments, 1],
+        )
+
+    def _node_distances(self, point: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        return np.hypot(*(self._node_xy[nodes] - point).T)
+
+    @staticmethod
+    def _nearest(
+        grid: _Grid,
+        point: np.ndarray,
+        candidates: Callable[[tuple[float, float, float, float]], np.ndarray],
+        distances: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    ) -> Optional[tuple[int, float]]:
+        """Searches the nearest element in growing squares around point.
+
+        An element closer than half the square's width has to overlap the square, so the search stops as soon as the
+        nearest candidate is closer than that or the square covers the whole grid.
+
+        """
+        radius = grid.cell_size
+        while True:
+            box = (
+                point[0] - radius,
+                point[1] - radius,
+                point[0] + radius,
+                point[1] + radius,
+            )
+            entries = candidates(box)
+            if len(entries):
+                distance = distances(point, entries)
+                best = np.argmin(distance)
+                if distance[best] <= radius or grid.covers(box):
+                    return int(entries[best]), float(distance[best])
+            elif grid.covers(box):
+                return None
+            radius *= 2
+
+    def nearest_node(
+        self, x: float, y: float, kind: Optional[str] = None
+    ) -> Optional[tuple[str, float]]:
+        """Finds the Node closest to a point.
+
+        Args:
+          x: x-coordinate of the point
+          y: y-coordinate of the point
+          kind: Node type to search (e.g., "junctions"), None searches all Nodes
+
+        Returns:
+          ID of the nearest Node and its distance or None if there are no Nodes
+
+        """
+        code = _kind_code(kind, NODE_TYPES)
+        result = self._nearest(
+            self._node_grid,
+            np.array([x, y], dtype=float),
+            lambda box: self._node_candidates(box, code),
+            self._node_distances,
+        )
+        if result is None:
+            return None
+        return self._node_ids[result[0]], result[1]
+
+    def nearest_nodes(
+        self, points: np.ndarray, kind: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Finds the closest Node of every point (e.g., to snap customer meters to Junctions).
+
+        Args:
+          points: point coordinates with the shape (points, 2)
+          kind: Node type to search (e.g., "junctions"), None searches all Nodes
+
+        Returns:
+          DataFrame with the columns "id" and "distance" and one row per point
+
+        """
+        results = [
+            self.nearest_node(x, y, kind) or (None, np.nan)
+            for x, y in np.asarray(points, dtype=float).reshape(-1, 2)
+        ]
+        return pd.DataFrame(results, columns=["id", "distance"])
+
+    def nodes_within(
+        self, x: float, y: float, radius: float, kind: Optional[str] = None
+    ) -> pd.Series:
+        """Finds all Nodes within a distance of a point.
+
+        Args:
+          x: x-coordinate of the point
+          y: y-coordinate of the point
+          radius: maximum distance
+          kind: Node type to search (e.g., "junctions"), None searches all Nodes
+
+        Returns:
+          distances of the Nodes indexed by their IDs, sorted ascending
+
+        """
+        point = np.array([x, y], dtype=float)
+        entries = self._node_candidates(
+            (x - radius, y - radius, x + radius, y + radius),
+            _kind_code(kind, NODE_TYPES),
+        )
+        distances = self._node_distances(point, entries)
+        within = distances <= radius
+        return self._distance_series(self._node_ids[entries[within]], distances[within])
+
+    def nodes_in_bbox(
+        self,
+        xmin: float,
+        ymin: float,
+        xmax: float,
+        ymax: float,
+        kind: Optional[str] = None,
+    ) -> list[str]:
+        """Finds all Nodes inside a bounding box.
+
+        Args:
+          xmin: lower x-coordinate of the box
+          ymin: lower y-coordinate of the box
+          xmax: upper x-coordinate of the box
+          ymax: upper y-coordinate of the box
+          kind: Node type to search (e.g., "junctions"), None searches all Nodes
+
+        Returns:
+          list of Node IDs
+
+        """
+        entries = self._node_candidates(
+            (xmin, ymin, xmax, ymax), _kind_code(kind, NODE_TYPES)
+        )
+        xy = self._node_xy[entries]
+        inside = np.all((xy >= (xmin, ymin)) & (xy <= (xmax, ymax)), axis=1)
+        return list(self._node_ids[entries[inside]])
+
+    def nodes_in_polygon(
+        self, polygon: np.ndarray, kind: Optional[str] = None
+    ) -> list[str]:
+        """Finds all Nodes inside a polygon.
+
+        Args:
+          polygon: polygon vertices with the shape (vertices, 2)
+          kind: Node type to search (e.g., "junctions"), None searches all Nodes
+
+        Returns:
+          list of Node IDs
+
+        """
+        polygon = np.asarray(polygon, dtype=float)
+        box = (*polygon.min(axis=0), *polygon.max(axis=0))
+        entries = self._node_candidates(box, _kind_code(kind, NODE_TYPES))
+        inside = Path(polygon).contains_points(self._node_xy[entries])
+        return list(self._node_ids[entries[inside]])
+
+    def nearest_link(
+        self, x: float, y: float, kind: Optional[str] = None
+    ) -> Optional[tuple[str, float]]:
+        """Finds the Link whose polyline is closest to a point.
+
+        Args:
+          x: x-coordinate of the point
+          y: y-coordinate of the point
+          kind: Link type to search (e.g., "pipes"), None searches all Links
+
+        Returns:
+          ID of the nearest Link and the distance to its polyline or None if there are no Links
+
+        """
+        result = self._nearest_segment(np.array([x, y], dtype=float), kind)
+        if result is None:
+            return None
+        return self._link_ids[self._segment_links[result[0]]], result[1]
+
+    def _nearest_segment(
+        self, point: np.ndarray, kind: Optional[str]
+    ) -> Optional[tuple[int, float]]:
+        code = _kind_code(kind, LINK_TYPES)
+        return self._nearest(
+            self._link_grid,
+            point,
+            lambda box: self._segment_candidates(box, code),
+            self._segment_distances,
+        )
+
+    def nearest_links(
+        self, points: np.ndarray, kind: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Snaps points to the closest Link polylines (e.g., hydrants to Pipes).
+
+        Args:
+          points: point coordinates with the shape (points, 2)
+          kind: Link type to search (e.g., "pipes"), None searches all Links
+
+        Returns:
+          DataFrame with one row per point and the columns "id" (nearest Link), "distance" (distance to the Link),
+          "x" and "y" (closest point on the Link) and "position" (distance of the closest point from the start Node
+          along the Link)
+
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        segments = np.full(len(points), -1)
+        ids = np.full(len(points), None, dtype=object)
+        distances = np.full(len(points), np.nan)
+        for i, point in enumerate(points):
+            result = self._nearest_segment(point, kind)
+            if result is not None:
+                segments[i], distances[i] = result
+        found = segments >= 0
+        projected = np.full((len(points), 2), np.nan)
+        positions = np.full(len(points), np.nan)
+        selected = segments[found]
+        projected[found], ratio = project_on_segments(
+            points[found], self._segments[selected, 0], self._segments[selected, 1]
+        )
+        lengths = np.hypot(
+            *(self._segments[selected, 1] - self._segments[selected, 0]).T
+        )
+        positions[found] = self._segment_positions[selected] + ratio * lengths
+        ids[found] = self._link_ids[self._segment_links[selected]]
+        return pd.DataFrame(
+            {
+                "id": ids,
+                "distance": distances,
+                "x": projected[:, 0],
+                "y": projected[:, 1],
+                "position": positions,
+            }
+        )
+
+    def links_within(
+        self, x: float, y: float, radius: float, kind: Optional[str] = None
+    ) -> pd.Series:
+        """Finds all Links whose polylines pass within a distance of a point.
+
+        Args:
+          x: x-coordinate of the point
+          y: y-coordinate of the point
+          radius: maximum distance
+          kind: Link type to search (e.g., "pipes"), None searches all Links
+
+        Returns:
+          distances between the point and the Link polylines indexed by the Link IDs, sorted ascending
+
+        """
+        point = np.array([x, y], dtype=float)
+        entries = self._segment_candidates(
+            (x - radius, y - radius, x + radius, y + radius),
+            _kind_code(kind, LINK_TYPES),
+        )
+        distances = self._segment_distances(point, entries)
+        within = distances <= radius
+        links = (
+            pd.Series(distances[within])
+            .groupby(self._segment_links[entries[within]])
+            .min()
+        )
+        return self._distance_series(
+            self._link_ids[links.index.to_numpy(dtype=int)], links.to_numpy()
+        )
+
+    def links_in_bbox(
+        self,
+        xmin: float,
+        ymin: float,
+        xmax: float,
+        ymax: float,
+        kind: Optional[str] = None,
+    ) -> list[str]:
+        """Finds all Links whose polylines intersect a bounding box.
+
+        Args:
+          xmin: lower x-coordinate of the box
+          ymin: lower y-coordinate of the box
+          xmax: upper x-coordinate of the box
+          ymax: upper y-coordinate of the box
+          kind: Link type to search (e.g., "pipes"), None searches all Links
+
+        Returns:
+          list of Link IDs
+
+        """
+        entries = self._segment_candidates(
+            (xmin, ymin, xmax, ymax), _kind_code(kind, LINK_TYPES)
+        )
+        inside, _ = clip_segments(self._segments[entries], (xmin, xmax, ymin, ymax))
+        return list(self._link_ids[np.unique(self._segment_links[entries[inside]])])
+
+    def links_in_polygon(
+        self, polygon: np.ndarray, kind: Optional[str] = None
+    ) -> list[str]:
+        """Finds all Links whose polylines lie inside a polygon.
+
+        A Link is inside if all points of its polyline (start Node, vertices and end Node) are inside the polygon.
+
+        Args:
+          polygon: polygon vertices with the shape (vertices, 2)
+          kind: Link type to search (e.g., "pipes"), None searches all Links
+
+        Returns:
+          list of Link IDs
+
+        """
+        polygon = np.asarray(polygon, dtype=float)
+        box = (*polygon.min(axis=0), *polygon.max(axis=0))
+        entries = self._segment_candidates(box, _kind_code(kind, LINK_TYPES))
+        links = np.unique(self._segment_links[entries])
+        if not len(links):
+            return []
+        starts = self._segment_offsets[links]
+        counts = self._segment_offsets[links + 1] - starts
+        segments = self._segments[_ranges(starts, starts + counts)]
+        path = Path(polygon)
+        inside = path.contains_points(segments[:, 0]) & path.contains_points(
+            segments[:, 1]
+        )
+        inside = np.logical_and.reduceat(inside, np.cumsum(counts) - counts)
+        return list(self._link_ids[links[inside]])
+
+    @staticmethod
+    def _distance_series(ids: np.ndarray, distances: np.ndarray) -> pd.Series:
+        series = pd.Series(distances, index=pd.Index(ids, name="id"), name="distance")
+        return series.sort_values(kind="stable")
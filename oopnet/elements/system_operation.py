@@ -1,7 +1,7 @@
 from __future__ import annotations
 import datetime
 from dataclasses import dataclass, field
-from typing import Union, Optional, TYPE_CHECKING
+from typing import Union, Optional, TYPE_CHECKING, ClassVar
 
 from oopnet.elements.base import NetworkComponent
 
@@ -19,6 +19,8 @@ class Curve(NetworkComponent):
     xvalues: list[float] = field(default_factory=list)
     yvalues: list[float] = field(default_factory=list)
 
+    _registry_keys: ClassVar[tuple[str, ...]] = ("_curves",)
+
     @NetworkComponent.id.setter
     def id(self, id: str):
         """Sets ID of NetworkComponent and replaces key in network hash"""
@@ -33,6 +35,8 @@ class Pattern(NetworkComponent):
 
     multipliers: list[float] = field(default_factory=list)
 
+    _registry_keys: ClassVar[tuple[str, ...]] = ("_patterns",)
+
     @NetworkComponent.id.setter
     def id(self, id: str):
         """Sets ID of NetworkComponent and replaces key in network hash"""
@@ -1,155 +1,152 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import Any, Callable, Optional, Union, TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
 from bokeh.plotting import figure
-from bokeh.models import HoverTool, ColumnDataSource
-import matplotlib.cm as cmx
+from bokeh.events import Tap
+from bokeh.models import (
+    CDSView,
+    ColumnDataSource,
+    HoverTool,
+    IndexFilter,
+    LinearColorMapper,
+)
+from bokeh.core.properties import field
+from bokeh.transform import transform
 from matplotlib import pyplot as plt
 import matplotlib.colors as colors
 
-from oopnet.utils.getters import (
-    get_link_ids,
-    get_node_ids,
-    get_junctions,
-    get_tanks,
-    get_reservoirs,
-    get_pipes,
-    get_pumps,
-    get_valves,
-)
+from oopnet.plotter.hittest import Hit, HitTester, attach_hit_tester, get_hit_tester
 
 if TYPE_CHECKING:
-    from oopnet.elements.network_components import Pipe
-
-# todo: refactor
-def convert_to_hex(rgba_color):
-    """
-
-    Args:
-      rgba_color:
-
-    Returns:
-
-    """
-    red = int(rgba_color[0] * 255)
-    green = int(rgba_color[1] * 255)
-    blue = int(rgba_color[2] * 255)
-    return "#{r:02x}{g:02x}{b:02x}".format(r=red, g=green, b=blue)
+    from bokeh.plotting import figure as Figure
+    from oopnet.elements.network import Network
 
+NODE_MARKERS = {"junctions": "circle", "tanks": "square", "reservoirs": "diamond"}
+LINK_MARKERS = {"pipes": None, "pumps": "inverted_triangle", "valves": "triangle"}
+SOURCE_NAMES = {"nodes": "oopnet_nodes", "links": "oopnet_links"}
+MAPPER_NAMES = {"nodes": "oopnet_node_colors", "links": "oopnet_link_colors"}
 
-def colorfun(series, colormap="jet"):
-    """
 
-    Args:
-      series:
-      colormap:  (Default value = 'jet')
-
-    Returns:
-
-    """
-    values = series.values
-    cm = plt.get_cmap(colormap)
-    cNorm = colors.Normalize(vmin=np.nanmin(values), vmax=np.nanmax(values))
-    scalar_map = cmx.ScalarMappable(norm=cNorm, cmap=cm)
-    scalar_map._A = []
-    rgba = list(map(scalar_map.to_rgba, values))
-    return list(map(convert_to_hex, rgba))
-
-
-def outsidelist(element, colorhash):
-    """
+def convert_to_hex(rgba_color):
+    """Converts a matplotlib color (e.g., an RGBA tuple or "k") to a hex color string.
 
     Args:
-      element:
-      colorhash:
+      rgba_color: matplotlib color
 
     Returns:
+      hex color string (e.g., "#000000")
 
     """
-    if element in colorhash:
-        return colorhash[element]
-    else:
-        return "k"
+    return colors.to_hex(rgba_color, keep_alpha=False)
 
 
-def plotnode(f, elements, colors, marker="o"):
-    """
+def get_palette(colormap: Union[str, colors.Colormap], n: int = 256) -> list[str]:
+    """Samples a matplotlib colormap to a Bokeh palette.
 
     Args:
-      f:
-      elements:
-      colors:
-      marker:  (Default value = 'o')
+      colormap: matplotlib colormap or its name
+      n: number of colors
 
     Returns:
+      list of hex color strings
 
     """
-    x = [x.xcoordinate for x in elements]
-    y = [x.ycoordinate for x in elements]
-    c = [outsidelist(x.id, colors) for x in elements]
-    c = [convert_to_hex(x) for x in c]
-    if marker == "o":
-        f.circle(x, y, color=c, size=8.0)
-    if marker == "s":
-        f.square(x, y, color=c, size=8.0)
-    if marker == "D":
-        f.square(x, y, color=c, size=8.0, angle=np.pi / 4)
-
-
-def plotlink(f, elements, colors, marker="o"):
-    """
+    if isinstance(colormap, str):
+        colormap = plt.get_cmap(colormap)
+    return [convert_to_hex(color) for color in colormap(np.linspace(0, 1, n))]
+
+
+def _get_colormaps(colormap) -> tuple[colors.Colormap, colors.Colormap]:
+    """Returns the Node and Link colormaps from a colormap, a colormap name or a dictionary with "node" and "link"."""
+    if isinstance(colormap, (str, colors.Colormap)):
+        return colormap, colormap
+    if isinstance(colormap, dict):
+        return colormap.get("node", "jet"), colormap.get("link", "jet")
+    raise ValueError(f"Cannot derive color maps from {colormap} object.")
+
+
+def _aligned_values(values: Optional[pd.Series], ids: np.ndarray) -> np.ndarray:
+    """Aligns values with element IDs, elements without values are NaN."""
+    if values is None:
+        return np.full(len(ids), np.nan)
+    return values.reindex(ids).to_numpy(dtype=float)
+
+
+def _color_mapper(name: str, colormap, values: np.ndarray) -> LinearColorMapper:
+    """Creates a LinearColorMapper spanning the finite values, NaN values are drawn black."""
+    finite = values[np.isfinite(values)]
+    low, high = (finite.min(), finite.max()) if len(finite) else (0.0, 1.0)
+    return LinearColorMapper(
+        palette=get_palette(colormap),
+        low=low,
+        high=high,
+        nan_color="black",
+        name=name,
+    )
 
-    Args:
-      f:
-      elements:
-      colors:
-      marker:  (Default value = 'o')
 
-    Returns:
+def _attribute_columns(table: pd.DataFrame) -> dict[str, list]:
+    """Returns the attribute columns of a HitTester table (without the type) as ColumnDataSource columns."""
+    return {
+        str(column): table[column].tolist() for column in table.columns.drop("type")
+    }
+
+
+def _tooltips(table: pd.DataFrame) -> list[tuple[str, str]]:
+    return [("ID", "@id"), ("Type", "@type"), ("Value", "@value")] + [
+        (str(column).capitalize(), f"@{{{column}}}")
+        for column in table.columns.drop("type")
+    ]
+
+
+def _node_source(
+    network: Network, values: np.ndarray, table: pd.DataFrame
+) -> ColumnDataSource:
+    geometry = network.geometry
+    kinds = np.empty(len(geometry.node_ids), dtype=object)
+    markers = np.empty(len(geometry.node_ids), dtype=object)
+    for kind, part in geometry.node_slices.items():
+        kinds[part] = kind[:-1]
+        markers[part] = NODE_MARKERS[kind]
+    return ColumnDataSource(
+        data={
+            "id": list(geometry.node_ids),
+            "type": list(kinds),
+            "marker": list(markers),
+            "x": geometry.node_xy[:, 0],
+            "y": geometry.node_xy[:, 1],
+            "value": values,
+            **_attribute_columns(table),
+        },
+        name=SOURCE_NAMES["nodes"],
+    )
 
-    """
 
-    xs = [x.startnode.xcoordinate for x in elements]
-    xe = [x.endnode.xcoordinate for x in elements]
-    ys = [x.startnode.ycoordinate for x in elements]
-    ye = [x.endnode.ycoordinate for x in elements]
-
-    x = 0.5 * (np.asarray(xs) + np.asarray(xe))
-    y = 0.5 * (np.asarray(ys) + np.asarray(ye))
-
-    c = [outsidelist(x.id, colors) for x in elements]
-    c = [convert_to_hex(x) for x in c]
-
-    f.segment(x0=xs, x1=xe, y0=ys, y1=ye, color=c, line_width=2.0)
-
-    if marker == "v":
-        f.triangle(x, y, color=c, size=8.0)
-    if marker == "p":
-        f.inverted_triangle(x, y, color=c, size=8.0)
-
-
-def plotpipe(f, elements: list[Pipe], colors):
-    xs_list = []
-    ys_list = []
-    xe_list = []
-    ye_list = []
-    color_list = []
-
-    for pipe in elements:
-        coords = pipe.coordinates_2d.tolist()
-        for i in range(len(coords) - 1):
-            xs, ys = coords[i]
-            xe, ye = coords[i + 1]
-            xs_list.append(xs)
-            ys_list.append(ys)
-            xe_list.append(xe)
-            ye_list.append(ye)
-            c = convert_to_hex(outsidelist(pipe.id, colors))
-            color_list.append(c)
-    f.segment(
-        x0=xs_list, x1=xe_list, y0=ys_list, y1=ye_list, color=color_list, line_width=2.0
+def _link_source(
+    network: Network, values: np.ndarray, table: pd.DataFrame
+) -> ColumnDataSource:
+    geometry = network.geometry
+    kinds = np.empty(len(geometry.link_ids), dtype=object)
+    markers = np.empty(len(geometry.link_ids), dtype=object)
+    for kind, part in geometry.link_slices.items():
+        kinds[part] = kind[:-1]
+        markers[part] = LINK_MARKERS[kind]
+    polylines = geometry.polylines()
+    return ColumnDataSource(
+        data={
+            "id": list(geometry.link_ids),
+            "type": list(kinds),
+            "marker": list(markers),
+            "xs": [polyline[:, 0] for polyline in polylines],
+            "ys": [polyline[:, 1] for polyline in polylines],
+            "x": geometry.midpoints[:, 0],
+            "y": geometry.midpoints[:, 1],
+            "value": values,
+            **_attribute_columns(table),
+        },
+        name=SOURCE_NAMES["links"],
     )
 
 
@@ -160,6 +157,14 @@ class Plotsimulation:
 
     Symbols for Links: Pipes are plotted as lines with no markers, Valves are plotted as lines with triangulars standing on their top in the middle, Pumps are plotted as lines with triangulars standing on an edge
 
+    All Nodes and all Links are stored in one ColumnDataSource each (named "oopnet_nodes" and "oopnet_links") with the
+    columns "id", "type", "value" and the element attributes (e.g., "elevation" or "diameter"). The values are colored
+    in the browser with LinearColorMappers, so the values can be replaced in place with update_plot (e.g., from a time
+    slider in a Bokeh server application). Hovering over an element shows its ID, type, value and attributes.
+
+    A HitTester with the attribute tables and a spatial index of the elements is attached to the figure (see
+    get_hit_tester and on_pick) for lookups in Python callbacks.
+
     Args:
       network: OOPNET network object one wants to plot
       tools: tools used for the Bokeh plot (panning, zooming, ...)
@@ -173,35 +178,9 @@ class Plotsimulation:
     """
 
     def __new__(self, network, tools=None, links=None, nodes=None, colormap="jet"):
-
-        if isinstance(colormap, str):
-            n_cmap = plt.get_cmap(colormap)
-            l_cmap = plt.get_cmap(colormap)
-        elif isinstance(colormap, colors.LinearSegmentedColormap) or isinstance(
-            colormap, colors.ListedColormap
-        ):
-            n_cmap = colormap
-            l_cmap = colormap
-        elif isinstance(colormap, dict):
-            if "node" in colormap:
-                if isinstance(colormap["node"], str):
-                    n_cmap = plt.get_cmap(colormap["node"])
-                elif isinstance(
-                    colormap["node"], colors.LinearSegmentedColormap
-                ) or isinstance(colormap["node"], colors.ListedColormap):
-                    n_cmap = colormap["node"]
-            else:
-                n_cmap = plt.get_cmap("jet")
-
-            if "link" in colormap:
-                if isinstance(colormap["link"], str):
-                    l_cmap = plt.get_cmap(colormap["link"])
-                elif isinstance(
-                    colormap["link"], colors.LinearSegmentedColormap
-                ) or isinstance(colormap["link"], colors.ListedColormap):
-                    l_cmap = colormap["link"]
-            else:
-                l_cmap = plt.get_cmap("jet")
+        n_cmap, l_cmap = _get_colormaps(colormap)
+        geometry = network.geometry
+        hit_tester = HitTester(network, nodes=nodes, links=links)
 
         if tools:
             f = figure(tools=tools)
@@ -209,41 +188,126 @@ class Plotsimulation:
             f = figure()
 
         # Links
-        if links is None:
-            linklist = get_link_ids(network)
-            linkcolors = pd.Series(["k"] * len(linklist), index=linklist)
+        link_values = _aligned_values(links, geometry.link_ids)
+        link_source = _link_source(network, link_values, hit_tester.links)
+        link_mapper = _color_mapper(MAPPER_NAMES["links"], l_cmap, link_values)
+        link_color = transform("value", link_mapper)
+        link_renderer = f.multi_line(
+            xs="xs", ys="ys", source=link_source, color=link_color, line_width=2.0
+        )
+        with_marker = [
+            index
+            for kind, part in geometry.link_slices.items()
+            if LINK_MARKERS[kind]
+            for index in range(part.start, part.stop)
+        ]
+        f.scatter(
+            x="x",
+            y="y",
+            marker=field("marker"),
+            source=link_source,
+            view=CDSView(filter=IndexFilter(with_marker)),
+            color=link_color,
+            size=8.0,
+        )
 
-        else:
-            cnorm = colors.Normalize(
-                vmin=np.nanmin(links.values), vmax=np.nanmax(links.values)
-            )
-            scalar_map = cmx.ScalarMappable(norm=cnorm, cmap=l_cmap)
-            scalar_map._A = []
-            linkcolors = links.apply(scalar_map.to_rgba)
+        # Nodes
+        node_values = _aligned_values(nodes, geometry.node_ids)
+        node_source = _node_source(network, node_values, hit_tester.nodes)
+        node_mapper = _color_mapper(MAPPER_NAMES["nodes"], n_cmap, node_values)
+        node_renderer = f.scatter(
+            x="x",
+            y="y",
+            marker=field("marker"),
+            source=node_source,
+            color=transform("value", node_mapper),
+            size=8.0,
+        )
+
+        f.add_tools(
+            HoverTool(renderers=[node_renderer], tooltips=_tooltips(hit_tester.nodes)),
+            HoverTool(renderers=[link_renderer], tooltips=_tooltips(hit_tester.links)),
+        )
+        f.axis.visible = False
+        attach_hit_tester(f, hit_tester)
+        return f
 
-        plotpipe(f, get_pipes(network), linkcolors)
 
-        plotlink(f, get_valves(network), linkcolors, marker="v")
+def update_plot(
+    plot: Figure,
+    nodes: Optional[pd.Series] = None,
+    links: Optional[pd.Series] = None,
+    rescale: bool = False,
+):
+    """Replaces the Node and Link values of a plot created with Network.bokehplot in place.
 
-        plotlink(f, get_pumps(network), linkcolors, marker="p")
+    Only the "value" columns of the plot's ColumnDataSources are replaced, the figure and the element geometry stay
+    the same. In a Bokeh server application, only the new values are sent to the browser.
 
-        # Nodes
-        if nodes is None:
-            nodelist = get_node_ids(network)
-            nodecolors = pd.Series(["k"] * len(nodelist), index=nodelist)
-        else:
-            cnorm = colors.Normalize(
-                vmin=np.nanmin(nodes.values), vmax=np.nanmax(nodes.values)
-            )
-            scalar_map = cmx.ScalarMappable(norm=cnorm, cmap=n_cmap)
-            scalar_map._A = []
-            nodecolors = nodes.apply(scalar_map.to_rgba)
+    Example:
+      >>> plot = network.bokehplot(nodes=rpt.pressure.iloc[0])
+      >>> slider.on_change("value", lambda attr, old, new: update_plot(plot, nodes=rpt.pressure.iloc[new]))
 
-        plotnode(f, get_junctions(network), nodecolors, marker="o")
+    Args:
+      plot: Bokeh figure created with Network.bokehplot
+      nodes: new Node values, Nodes without values are drawn black
+      links: new Link values, Links without values are drawn black
+      rescale: if True, the color ranges are adapted to the new values
 
-        plotnode(f, get_tanks(network), nodecolors, marker="s")
+    The values are also passed to the plot's HitTester unless it holds time series results.
 
-        plotnode(f, get_reservoirs(network), nodecolors, marker="D")
+    """
+    hit_tester = get_hit_tester(plot)
+    for kind, values in (("nodes", nodes), ("links", links)):
+        if values is None:
+            continue
+        attribute = f"{kind[:-1]}_results"
+        # time series results set for on_pick are kept
+        if hit_tester is not None and not isinstance(
+            getattr(hit_tester, attribute), pd.DataFrame
+        ):
+            setattr(hit_tester, attribute, values)
+        source = plot.select_one({"name": SOURCE_NAMES[kind]})
+        aligned = _aligned_values(values, np.asarray(source.data["id"]))
+        source.data["value"] = aligned
+        if rescale:
+            finite = aligned[np.isfinite(aligned)]
+            if len(finite):
+                mapper = plot.select_one({"name": MAPPER_NAMES[kind]})
+                mapper.update(low=finite.min(), high=finite.max())
+
+
+def on_pick(
+    plot: Figure, callback: Callable[[Hit], Any], tolerance: Optional[float] = None
+):
+    """Calls a function with the element clicked in a plot created with Network.bokehplot.
+
+    The element is looked up in the HitTester attached to the plot, so the callback receives the element's
+    properties and results without accessing the Network. Python callbacks require a Bokeh server application.
+
+    Example:
+      >>> plot = network.bokehplot(nodes=rpt.pressure.iloc[0])
+      >>> get_hit_tester(plot).node_results = rpt.pressure
+      >>> on_pick(plot, lambda hit: history.data.update(x=hit.results.index, y=hit.results.to_numpy()))
 
-        f.axis.visible = False
-        return f
+    Args:
+      plot: Bokeh figure created with Network.bokehplot
+      callback: function called with the Hit of every click on an element
+      tolerance: maximum distance between the click and an element in map units, defaults to 1 % of the extent of
+        the Network
+
+    """
+    hit_tester = get_hit_tester(plot)
+    if hit_tester is None:
+        raise ValueError(
+            "The plot has no HitTester attached, create it with Network.bokehplot."
+        )
+    if tolerance is None:
+        tolerance = 0.01 * hit_tester.extent
+
+    def handle(event: Tap):
+        hit = hit_tester.pick(event.x, event.y, tolerance)
+        if hit is not None:
+            callback(hit)
+
+    plot.on_event(Tap, handle)
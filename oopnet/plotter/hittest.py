@@ -0,0 +1,254 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, TYPE_CHECKING, Union
+import logging
+import weakref
+
+import matplotlib.axes
+import numpy as np
+import pandas as pd
+
+from oopnet.elements.spatial_index import SpatialIndex
+from oopnet.utils.getters.property_getters import get_property_table
+
+if TYPE_CHECKING:
+    from oopnet.elements.network import Network
+
+logger = logging.getLogger(__name__)
+
+# component attributes stored in the attribute tables by default
+NODE_ATTRIBUTES = ("elevation",)
+LINK_ATTRIBUTES = ("length", "diameter", "roughness", "status")
+
+# HitTesters attached to matplotlib or Bokeh figures
+_hit_testers = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class Hit:
+    """Network element found by a hit test.
+
+    Attributes:
+      kind: "node" or "link"
+      id: ID of the element
+      distance: distance between the query point and the element in map units
+      properties: type (class name) and attributes of the element
+      results: simulation results of the element, a time series if the HitTester was created with DataFrames (e.g.,
+        rpt.pressure) or a single value if it was created with Series, None if there are no results
+
+    """
+
+    kind: str
+    id: str
+    distance: float
+    properties: pd.Series
+    results: Union[pd.Series, float, None] = None
+
+    def describe(self) -> str:
+        """Formats the element's type, ID, attributes and results as multi-line text (e.g., for a tooltip)."""
+        lines = [f"{self.properties['type']} {self.id}"]
+        for name, value in self.properties.drop("type").items():
+            if value is not None and not (isinstance(value, float) and np.isnan(value)):
+                lines.append(f"{name}: {value}")
+        if isinstance(self.results, pd.Series):
+            values = self.results.dropna()
+            if len(values):
+                lines.append(
+                    f"{self.results.name}: {values.min():.4g} to {values.max():.4g} "
+                    f"({len(values)} time steps)"
+                )
+        elif self.results is not None:
+            lines.append(f"value: {self.results:.4g}")
+        return "\n".join(lines)
+
+
+class HitTester:
+    """Attribute tables and spatial index of a plotted Network for click and hover lookups.
+
+    The properties of all Nodes and Links are collected once into tables indexed by ID and their positions are stored
+    in a SpatialIndex, so picking an element only searches the grid cells around the cursor and its properties and
+    results are looked up by ID without accessing the Network again. The spatial index is created on the first
+    lookup.
+
+    Example:
+      >>> tester = HitTester(network, nodes=rpt.pressure, links=rpt.flow)
+      >>> hit = tester.pick(1500.0, 3200.0, tolerance=10.0)
+      >>> hit.results.plot()
+
+    Args:
+      network: plotted OOPNET network object
+      nodes: Node results as Series (one value per Node) or DataFrame (time steps x Nodes, e.g., rpt.pressure)
+      links: Link results as Series (one value per Link) or DataFrame (time steps x Links, e.g., rpt.flow)
+      node_attributes: Node attributes stored in the Node table
+      link_attributes: Link attributes stored in the Link table
+
+    Attributes:
+      nodes: Node types and attributes indexed by the Node IDs in the order of the Network's geometry
+      links: Link types and attributes indexed by the Link IDs in the order of the Network's geometry
+      node_results: Node results
+      link_results: Link results
+
+    """
+
+    def __init__(
+        self,
+        network: Network,
+        nodes: Union[pd.Series, pd.DataFrame, None] = None,
+        links: Union[pd.Series, pd.DataFrame, None] = None,
+        node_attributes: Iterable[str] = NODE_ATTRIBUTES,
+        link_attributes: Iterable[str] = LINK_ATTRIBUTES,
+    ):
+        self._geometry = network.geometry
+        self._index = None
+        self.nodes = self._table(network, "nodes", node_attributes)
+        self.links = self._table(network, "links", link_attributes)
+        self.node_results = nodes
+        self.link_results = links
+
+    @staticmethod
+    def _table(network: Network, kind: str, attributes: Iterable[str]) -> pd.DataFrame:
+        table = get_property_table(network, kind, attributes).set_index("id")
+        table["type"] = table["type"].astype("category")
+        return table
+
+    @property
+    def index(self) -> SpatialIndex:
+        """Spatial index of the plotted Nodes and Links."""
+        if self._index is None:
+            logger.debug("Creating spatial index for hit testing")
+            self._index = SpatialIndex(self._geometry)
+        return self._index
+
+    @property
+    def extent(self) -> float:
+        """Diagonal of the bounding box of all Nodes in map units."""
+        xy = self._geometry.node_xy
+        if not len(xy):
+            return 0.0
+        return float(np.hypot(*(xy.max(axis=0) - xy.min(axis=0))))
+
+    @staticmethod
+    def _results(
+        values: Union[pd.Series, pd.DataFrame, None], id: str
+    ) -> Union[pd.Series, float, None]:
+        if isinstance(values, pd.DataFrame):
+            return values[id] if id in values.columns else None
+        if isinstance(values, pd.Series):
+            return values.get(id)
+        return None
+
+    def node(self, id: str, distance: float = 0.0) -> Hit:
+        """Looks up the properties and results of a Node by its ID."""
+        return Hit(
+            kind="node",
+            id=id,
+            distance=distance,
+            properties=self.nodes.loc[id],
+            results=self._results(self.node_results, id),
+        )
+
+    def link(self, id: str, distance: float = 0.0) -> Hit:
+        """Looks up the properties and results of a Link by its ID."""
+        return Hit(
+            kind="link",
+            id=id,
+            distance=distance,
+            properties=self.links.loc[id],
+            results=self._results(self.link_results, id),
+        )
+
+    def pick(self, x: float, y: float, tolerance: float) -> Optional[Hit]:
+        """Finds the element at a point.
+
+        Nodes are drawn on top of Links and are preferred if both are within the tolerance.
+
+        Args:
+          x: x-coordinate of the point in map units
+          y: y-coordinate of the point in map units
+          tolerance: maximum distance between the point and the element in map units
+
+        Returns:
+          the closest Node or, if there is none within the tolerance, the closest Link or None if there is no element
+          within the tolerance
+
+        """
+        nodes = self.index.nodes_within(x, y, tolerance)
+        if len(nodes):
+            return self.node(nodes.index[0], float(nodes.iloc[0]))
+        links = self.index.links_within(x, y, tolerance)
+        if len(links):
+            return self.link(links.index[0], float(links.iloc[0]))
+        return None
+
+    def connect(
+        self,
+        ax: matplotlib.axes.Axes,
+        tolerance: float = 5.0,
+        hover: bool = False,
+        callback: Optional[Callable[[Hit], Any]] = None,
+    ) -> list[int]:
+        """Shows the properties and results of clicked elements of a matplotlib plot in an annotation.
+
+        Args:
+          ax: Axes the Network is plotted in
+          tolerance: maximum distance between the cursor and an element in pixels
+          hover: if True, elements are picked when the cursor moves over them instead of only when they are clicked
+          callback: function called with every picked Hit (e.g., to plot the results of the element)
+
+        Returns:
+          connection IDs of the canvas callbacks (see matplotlib's FigureCanvasBase.mpl_disconnect)
+
+        """
+        annotation = ax.annotate(
+            "",
+            xy=(0, 0),
+            xytext=(10, 10),
+            textcoords="offset points",
+            bbox={"boxstyle": "round", "fc": "w", "alpha": 0.9},
+            fontsize="small",
+            zorder=10,
+            visible=False,
+        )
+        current = {"hit": None}
+
+        def handle(event):
+            if event.inaxes is not ax or event.xdata is None:
+                return
+            # convert the pixel tolerance to map units at the cursor
+            corner = ax.transData.inverted().transform(
+                (event.x + tolerance, event.y + tolerance)
+            )
+            radius = float(np.max(np.abs(corner - (event.xdata, event.ydata))))
+            hit = self.pick(event.xdata, event.ydata, radius)
+            previous, current["hit"] = current["hit"], hit
+            if hit is None:
+                if annotation.get_visible():
+                    annotation.set_visible(False)
+                    ax.figure.canvas.draw_idle()
+                return
+            if previous is None or (previous.kind, previous.id) != (hit.kind, hit.id):
+                annotation.xy = (event.xdata, event.ydata)
+                annotation.set_text(hit.describe())
+                annotation.set_visible(True)
+                ax.figure.canvas.draw_idle()
+            if callback is not None:
+                callback(hit)
+
+        events = ["button_press_event"]
+        if hover:
+            events.append("motion_notify_event")
+        return [ax.figure.canvas.mpl_connect(name, handle) for name in events]
+
+
+def attach_hit_tester(figure: Any, hit_tester: HitTester):
+    """Attaches a HitTester to a matplotlib or Bokeh figure, it is released together with the figure."""
+    _hit_testers[figure] = hit_tester
+
+
+def get_hit_tester(figure: Any) -> Optional[HitTester]:
+    """Returns the HitTester attached to a matplotlib or Bokeh figure or None if there is none.
+
+    Figures created with Network.bokehplot and with Network.plot(hit_testing=True) have a HitTester attached.
+
+    """
+    return _hit_testers.get(figure)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+from typing import Iterable, Optional, TYPE_CHECKING
+import logging
+
+import matplotlib.axes
+from matplotlib.collections import LineCollection
+import numpy as np
+import pandas as pd
+
+from oopnet.plotter.pyplot import NetworkPlotter
+
+if TYPE_CHECKING:
+    from oopnet.elements.network import Network
+    from oopnet.simulator.reportfile_reader import ReportStep
+
+logger = logging.getLogger(__name__)
+
+NODE_MARKERS = {"junctions": ("o", 3), "tanks": ("D", 4), "reservoirs": ("s", 5)}
+LINK_MARKERS = {"pipes": None, "pumps": "p", "valves": "v"}
+
+
+class LivePlot:
+    """Matplotlib network plot whose Node and Link colors are updated with the results of single time steps.
+
+    The artists are created once from the Network's geometry and every update only replaces their colors, so the time
+    steps yielded by Network.run_stepwise can be plotted one after another without keeping earlier time steps. EPANET
+    writes the results only after the simulation is finished, so the plot plays the results back and does not show
+    the progress of the simulation.
+    Nodes and Links without values are drawn black. If no limits are passed, the color limits grow with the range of
+    all values plotted so far.
+
+    Example:
+      >>> live = network.live_plot()
+      >>> live.follow(network.run_stepwise(), nodes="Pressure", links="Flow")
+
+    Args:
+      plotter: NetworkPlotter providing the colormaps, colorbar settings and marker size
+      network: OOPNET network object one wants to plot
+      fignum: figure number, where to plot the network
+      ax: Matplotlib Axes object
+      nodes_vlim: fixed limits for the Node values colorbar as tuple (min, max)
+      links_vlim: fixed limits for the Link values colorbar as tuple (min, max)
+
+    Attributes:
+      figure: Matplotlib figure
+      ax: Matplotlib Axes object
+      steps: number of updates drawn so far
+
+    """
+
+    def __init__(
+        self,
+        plotter: NetworkPlotter,
+        network: Network,
+        fignum: Optional[int] = None,
+        ax: Optional[matplotlib.axes.Axes] = None,
+        nodes_vlim: Optional[tuple[float, float]] = None,
+        links_vlim: Optional[tuple[float, float]] = None,
+    ):
+        self.plotter = plotter
+        plotter._set_colormaps(plotter.colormap)
+        self.figure, self.ax = plotter._prepare_plot(ax=ax, fignum=fignum)
+        self.steps = 0
+
+        geometry = network.geometry
+        self._ids = {"node": geometry.node_ids, "link": geometry.link_ids}
+        self._vlim = {"node": nodes_vlim, "link": links_vlim}
+        self._scalar_maps = {
+            "node": plotter._get_scalar_colormap(
+                vlim=nodes_vlim or (None, None), colormap=plotter._node_colormap
+            ),
+            "link": plotter._get_scalar_colormap(
+                vlim=links_vlim or (None, None), colormap=plotter._link_colormap
+            ),
+        }
+        self._colorbars = set()
+        self._artists = {"node": [], "link": []}
+
+        for kind, (marker, zorder) in NODE_MARKERS.items():
+            part = geometry.node_slices[kind]
+            coordinates = geometry.node_xy[part]
+            if not len(coordinates):
+                continue
+            artist = self.ax.scatter(
+                x=coordinates[:, 0],
+                y=coordinates[:, 1],
+                marker=marker,
+                c="k",
+                s=plotter.markersize,
+                zorder=zorder,
+                label="_nolegend_",
+            )
+            self._artists["node"].append((artist, part))
+
+        for kind, marker in LINK_MARKERS.items():
+            part = geometry.link_slices[kind]
+            _, polylines, centers = geometry.links(kind)
+            if not polylines:
+                continue
+            collection = LineCollection(polylines, colors="k", linewidths=1.5)
+            self.ax.add_collection(collection)
+            self._artists["link"].append((collection, part))
+            if marker:
+                artist = self.ax.scatter(
+                    x=centers[:, 0],
+                    y=centers[:, 1],
+                    marker=marker,
+                    c="k",
+                    s=plotter.markersize,
+                    zorder=3,
+                    label="_nolegend_",
+                )
+                self._artists["link"].append((artist, part))
+        self.ax.autoscale_view()
+        self.title = self.ax.set_title("")
+
+    def _has_colorbar(self, kind: str) -> bool:
+        colorbar = self.plotter.colorbar
+        if isinstance(colorbar, dict):
+            return colorbar.get(kind) is True
+        return bool(colorbar)
+
+    def _rescale(self, kind: str, values: pd.Series):
+        """Extends the color limits to the range of the new values unless fixed limits were passed."""
+        if self._vlim[kind] is not None:
+            return
+        finite = values.to_numpy(dtype=float)
+        finite = finite[np.isfinite(finite)]
+        if not len(finite):
+            return
+        norm = self._scalar_maps[kind].norm
+        vmin, vmax = finite.min(), finite.max()
+        if norm.vmin is not None:
+            vmin = min(vmin, norm.vmin)
+        if norm.vmax is not None:
+            vmax = max(vmax, norm.vmax)
+        self._scalar_maps[kind].set_clim(vmin, vmax)
+
+    def update(
+        self,
+        nodes: Optional[pd.Series] = None,
+        links: Optional[pd.Series] = None,
+        title: Optional[str] = None,
+    ):
+        """Colors the Nodes and Links according to new values.
+
+        Args:
+          nodes: Node values of one time step (e.g., step.nodes["Pressure"]), the Node colors are kept if None
+          links: Link values of one time step (e.g., step.links["Flow"]), the Link colors are kept if None
+          title: new plot title (e.g., the time of the step)
+
+        """
+        for kind, values in (("node", nodes), ("link", links)):
+            if values is None:
+                continue
+            scalar_map = self._scalar_maps[kind]
+            self._rescale(kind, values)
+            colors = NetworkPlotter._animation_colors(
+                values, self._ids[kind], None, scalar_map
+            )[0]
+            for artist, part in self._artists[kind]:
+                artist.set_color(colors[part])
+            if kind not in self._colorbars and self._has_colorbar(kind):
+                self.plotter._add_colorbar(
+                    str(values.name), scalar_map, "neither", ax=self.ax, fig=self.figure
+                )
+                self._colorbars.add(kind)
+        if title is not None:
+            self.title.set_text(title)
+        self.steps += 1
+        self.figure.canvas.draw_idle()
+
+    def follow(
+        self,
+        steps: Iterable[ReportStep],
+        nodes: Optional[str] = "Pressure",
+        links: Optional[str] = "Flow",
+        pause: float = 0.0,
+    ) -> Optional[ReportStep]:
+        """Updates the plot with every time step of a stepwise simulation or report file.
+
+        Only the current time step is kept, so the whole result set is never held in memory.
+
+        Args:
+          steps: iterable of ReportStep objects (e.g., from Network.run_stepwise or iter_report_steps)
+          nodes: Node report variable used for the Node colors (e.g., "Pressure"), None keeps the Nodes black
+          links: Link report variable used for the Link colors (e.g., "Flow"), None keeps the Links black
+          pause: time (in seconds) every step is shown for
+
+        Returns:
+          last time step or None if steps was empty
+
+        """
+        step = None
+        for step in steps:
+            self.update(
+                nodes=(
+                    None if nodes is None or step.nodes is None else step.nodes[nodes]
+                ),
+                links=(
+                    None if links is None or step.links is None else step.links[links]
+                ),
+                title=None if step.time is None else str(step.time),
+            )
+            self.figure.canvas.flush_events()
+            if pause:
+                self.figure.canvas.start_event_loop(pause)
+        logger.debug(f"Plotted {self.steps} time steps")
+        return step
@@ -11,20 +11,14 @@ from matplotlib.animation import FuncAnimation
 import numpy as np
 import pandas as pd
 
-from oopnet.utils.getters.element_lists import (
-    get_link_ids,
-    get_node_ids,
-    get_valves,
-    get_pumps,
-    get_junctions,
-    get_reservoirs,
-    get_tanks,
-    get_pipes,
-)
+from oopnet.plotter.hittest import HitTester, attach_hit_tester
+from oopnet.plotter.raster import DEFAULT_DETAIL_THRESHOLD, LevelOfDetailRenderer
+from oopnet.plotter.render import render_frames
+from oopnet.utils.getters.element_lists import get_link_ids, get_node_ids
 
 if TYPE_CHECKING:
     from oopnet.elements.network import Network
-    from oopnet.elements.network_components import Link, Node
+    from oopnet.elements.geometry import NetworkGeometry
 
 
 class NetworkPlotter:
@@ -41,6 +35,7 @@ class NetworkPlotter:
 
     _node_colormap = None
     _link_colormap = None
+    renderer: Optional[LevelOfDetailRenderer] = None
 
     def __init__(
         self,
@@ -148,7 +143,7 @@ class NetworkPlotter:
         plot_loc = ax.get_position().bounds
         #ax.set_position([plot_loc[0], 0.08, plot_loc[2], 0.84])
         y_pos = 0.1 if len(fig.axes) == 1 else 0.5
-        cb = plt.colorbar(scalar_map, extend=extend, cax=fig.add_axes([0.80, y_pos, 0.03, 0.35]))
+        cb = fig.colorbar(scalar_map, extend=extend, cax=fig.add_axes([0.80, y_pos, 0.03, 0.35]))
         cb.set_label(name)
         cb.ax.tick_params()
 
@@ -162,23 +157,15 @@ class NetworkPlotter:
     @staticmethod
     def _plot_single_node_type(
         ax: matplotlib.axes.Axes,
-        nodes: list[Node],
+        node_ids: np.ndarray,
+        coordinates: np.ndarray,
         marker: str,
         colors: pd.Series,
         ms: Union[float, pd.Series],
         zorder: int,
         truncate_nodes: bool = False,
     ):
-        node_ids = []
-        x_coords = []
-        y_coords = []
-
-        for node in nodes:
-            node_ids.append(node.id)
-            x_coords.append(node.xcoordinate)
-            y_coords.append(node.ycoordinate)
-
-        coord_df = pd.DataFrame({"x": x_coords, "y": y_coords}, index=node_ids)
+        coord_df = pd.DataFrame(coordinates, columns=["x", "y"], index=node_ids)
         select_colors = colors[colors.index.isin(node_ids)]
         select_colors.name = "color"
         node_plot_data = pd.concat([coord_df, select_colors], axis=1, sort=True).fillna(
@@ -207,42 +194,36 @@ class NetworkPlotter:
     def _plot_single_link_type(
         self,
         ax: matplotlib.axes.Axes,
-        links: list[Link],
+        link_ids: np.ndarray,
+        polylines: list[np.ndarray],
+        centers: np.ndarray,
         colors: pd.Series,
         ms: Union[float, pd.Series],
         zorder: int,
         line_width: Union[float, pd.Series, None],
         marker: Optional[str] = None,
     ):
-        link_ids = []
-        line_coords = []
-
-        for link in links:
-            link_ids.append(link.id)
-            line_coords.append(link.coordinates_2d.tolist())
-
-        select_colors = colors[colors.index.isin(link_ids)].fillna("k")
+        select_colors = colors.reindex(link_ids).fillna("k")
         select_colors.name = "color"
 
         if isinstance(line_width, pd.Series):
-            select_line_width = line_width[line_width.index.isin(link_ids)].values
+            select_line_width = line_width.reindex(link_ids).values
         elif isinstance(line_width, float):
             select_line_width = [line_width] * len(link_ids)
         else:
             select_line_width = [1.5] * len(link_ids)
 
         col = LineCollection(
-            line_coords, color=select_colors, linewidths=select_line_width
+            polylines, color=list(select_colors), linewidths=select_line_width
         )
         ax.add_collection(col)
 
         if marker:
-            centers = [x.center for x in links]
             return ax.scatter(
-                x=[coords[0] for coords in centers],
-                y=[coords[1] for coords in centers],
+                x=centers[:, 0],
+                y=centers[:, 1],
                 marker=marker,
-                c=select_colors,
+                c=list(select_colors),
                 s=ms,
                 zorder=zorder,
                 label="_nolegend_",
@@ -260,10 +241,14 @@ class NetworkPlotter:
         elif isinstance(link_width, float):
             link_width = pd.Series(index=get_link_ids(network), data=None)
 
+        geometry = network.geometry
         # plot pipes without marker
+        link_ids, polylines, centers = geometry.links("pipes")
         self._plot_single_link_type(
             ax=ax,
-            links=get_pipes(network),
+            link_ids=link_ids,
+            polylines=polylines,
+            centers=centers,
             marker=None,
             colors=colors,
             ms=self.markersize,
@@ -271,9 +256,12 @@ class NetworkPlotter:
             line_width=link_width,
         )
         # plot pumps with pentagon marker
+        link_ids, polylines, centers = geometry.links("pumps")
         self._plot_single_link_type(
             ax=ax,
-            links=get_pumps(network),
+            link_ids=link_ids,
+            polylines=polylines,
+            centers=centers,
             marker="p",
             colors=colors,
             ms=self.markersize,
@@ -281,9 +269,12 @@ class NetworkPlotter:
             line_width=link_width,
         )
         # plot pipes without down-facing triangle marker
+        link_ids, polylines, centers = geometry.links("valves")
         self._plot_single_link_type(
             ax=ax,
-            links=get_valves(network),
+            link_ids=link_ids,
+            polylines=polylines,
+            centers=centers,
             marker="v",
             colors=colors,
             ms=self.markersize,
@@ -306,10 +297,13 @@ class NetworkPlotter:
     def _plot_nodes(
         self, network: Network, ax: matplotlib.axes.Axes, colors: pd.Series
     ):
+        geometry = network.geometry
         # plot junctions with circle marker
+        node_ids, coordinates = geometry.nodes("junctions")
         self._plot_single_node_type(
             ax=ax,
-            nodes=get_junctions(network),
+            node_ids=node_ids,
+            coordinates=coordinates,
             marker="o",
             colors=colors,
             ms=self.markersize,
@@ -317,9 +311,11 @@ class NetworkPlotter:
             truncate_nodes=self.truncate_nodes,
         )
         # plot tanks with diamond marker
+        node_ids, coordinates = geometry.nodes("tanks")
         self._plot_single_node_type(
             ax=ax,
-            nodes=get_tanks(network),
+            node_ids=node_ids,
+            coordinates=coordinates,
             marker="D",
             colors=colors,
             ms=self.markersize,
@@ -327,9 +323,11 @@ class NetworkPlotter:
             truncate_nodes=False,
         )
         # plot reservoirs with square marker
+        node_ids, coordinates = geometry.nodes("reservoirs")
         self._plot_single_node_type(
             ax=ax,
-            nodes=get_reservoirs(network),
+            node_ids=node_ids,
+            coordinates=coordinates,
             marker="s",
             colors=colors,
             ms=self.markersize,
@@ -347,6 +345,9 @@ class NetworkPlotter:
         ax: Optional[matplotlib.axes.Axes] = None,
         nodes_vlim: Optional[tuple[float, float]] = None,
         links_vlim: Optional[tuple[float, float]] = None,
+        raster: bool = False,
+        detail_threshold: int = DEFAULT_DETAIL_THRESHOLD,
+        hit_testing: bool = False,
     ):
         """This function plots OOPNET networks with simulation results as a network plot with Matplotlib.
 
@@ -363,6 +364,11 @@ class NetworkPlotter:
           links_vlim:
           link_width: Values describing the link width as Pandas Series generated e.g. by one of OOPNET's SimulationReport functions (e.g. Flow(rpt)).
           ax: Matplotlib Axes object
+          raster: If True, the network is drawn for large networks: as long as more than detail_threshold Links are visible, Nodes and Links are binned into an image with the mean value per pixel, when zoomed in, the visible elements are drawn with simplified vertices. The link_width and truncate_nodes settings are ignored.
+          detail_threshold: maximum number of visible Links drawn as vector graphics in raster mode
+          hit_testing: If True, clicking an element shows its properties and values in an annotation. The HitTester is attached to the figure (see get_hit_tester).
+
+        The LevelOfDetailRenderer of a plot drawn in raster mode is stored in the renderer attribute.
 
         Returns:
           Matplotlib's figure handle
@@ -381,7 +387,7 @@ class NetworkPlotter:
             link_scalar_map = self._get_scalar_colormap(
                 vlim=links_vlim, colormap=self._node_colormap
             )
-            link_colors = links.apply(link_scalar_map.to_rgba)
+            link_colors = None if raster else links.apply(link_scalar_map.to_rgba)
 
         if (
             isinstance(self.colorbar, dict)
@@ -401,7 +407,7 @@ class NetworkPlotter:
             node_scalar_map = self._get_scalar_colormap(
                 vlim=nodes_vlim, colormap=self._node_colormap
             )
-            node_colors = nodes.apply(node_scalar_map.to_rgba)
+            node_colors = None if raster else nodes.apply(node_scalar_map.to_rgba)
 
         if (
             isinstance(self.colorbar, dict)
@@ -411,40 +417,270 @@ class NetworkPlotter:
         ) and nodes is not None:
             self._add_colorbar(str(nodes.name), node_scalar_map, nodes_vlim[2], ax=ax, fig=fig)
 
-        self._plot_nodes(network=network, ax=ax, colors=node_colors)
-        self._plot_links(
-            network=network, ax=ax, colors=link_colors, link_width=link_width
-        )
+        if raster:
+            geometry = network.geometry
+            self.renderer = LevelOfDetailRenderer(
+                ax=ax,
+                geometry=geometry,
+                node_values=None if nodes is None else nodes.reindex(geometry.node_ids),
+                link_values=None if links is None else links.reindex(geometry.link_ids),
+                node_scalar_map=node_scalar_map,
+                link_scalar_map=link_scalar_map,
+                markersize=self.markersize,
+                detail_threshold=detail_threshold,
+            )
+            self.renderer.draw()
+        else:
+            self._plot_nodes(network=network, ax=ax, colors=node_colors)
+            self._plot_links(
+                network=network, ax=ax, colors=link_colors, link_width=link_width
+            )
+        if hit_testing:
+            hit_tester = HitTester(network, nodes=nodes, links=links)
+            hit_tester.connect(ax)
+            attach_hit_tester(fig, hit_tester)
         self._resize_colorbar(fig=fig)
         return fig
 
-    def _render_animation_frame(
+    def _animation_setup(
+        self,
+        nodes: Union[pd.Series, pd.DataFrame, None],
+        links: Union[pd.Series, pd.DataFrame, None],
+        link_width: Union[pd.Series, pd.DataFrame, None],
+        nodes_vlim: Optional[tuple[float, float]],
+        links_vlim: Optional[tuple[float, float]],
+        node_label: Optional[str],
+        link_label: Optional[str],
+    ) -> tuple[
+        pd.Index,
+        Optional[cmx.ScalarMappable],
+        Optional[cmx.ScalarMappable],
+        list[tuple[Optional[str], cmx.ScalarMappable, str]],
+    ]:
+        """Derives the time steps, color maps and colorbars of an animation.
+
+        Returns:
+            time steps, Node and Link scalar color maps and a list of (label, scalar color map, extend) tuples
+            describing the colorbars
+
+        """
+        if isinstance(nodes, pd.DataFrame):
+            times = nodes.index
+        elif isinstance(links, pd.DataFrame):
+            times = links.index
+        elif isinstance(link_width, pd.DataFrame):
+            times = link_width.index
+        else:
+            raise ValueError(
+                "A pandas DataFrame must be provided for at least one of these arguments: nodes, links, link_width"
+            )
+
+        colorbars = []
+        # get Link colors
+        links_vlim = self._get_colorbar_limit(data=links, vlim=links_vlim)
+        link_scalar_map = None
+        if links is not None:
+            link_scalar_map = self._get_scalar_colormap(
+                vlim=links_vlim, colormap=self._link_colormap
+            )
+
+        link_colorbar = (
+            isinstance(self.colorbar, dict)
+            and self.colorbar["link"] is True
+            or isinstance(self.colorbar, bool)
+            and self.colorbar
+        ) and links is not None
+        if link_colorbar:
+            colorbars.append((link_label, link_scalar_map, links_vlim[2]))
+
+        # get Node colors
+        nodes_vlim = self._get_colorbar_limit(nodes, nodes_vlim)
+        node_scalar_map = None
+        if nodes is not None:
+            node_scalar_map = self._get_scalar_colormap(
+                vlim=nodes_vlim, colormap=self._node_colormap
+            )
+
+        node_colorbar = (
+            isinstance(self.colorbar, dict)
+            and self.colorbar["node"] is True
+            or isinstance(self.colorbar, bool)
+            and self.colorbar
+        ) and nodes is not None
+        if node_colorbar:
+            colorbars.append((node_label, node_scalar_map, nodes_vlim[2]))
+        return times, node_scalar_map, link_scalar_map, colorbars
+
+    @staticmethod
+    def _animation_colors(
+        data: Union[pd.Series, pd.DataFrame, None],
+        ids: list[str],
+        times: pd.Index,
+        scalar_map: Optional[cmx.ScalarMappable],
+    ) -> np.ndarray:
+        """Maps the values of all frames to RGBA colors with a single colormap call.
+
+        Elements without values are drawn black.
+
+        Returns:
+            array with the shape (frames, elements, 4), frames is 1 for constant colors
+
+        """
+        if data is None:
+            values = np.full((1, len(ids)), np.nan)
+        elif isinstance(data, pd.DataFrame):
+            values = data.reindex(index=times, columns=ids).to_numpy(dtype=float)
+        else:
+            values = data.reindex(ids).to_numpy(dtype=float)[np.newaxis]
+        colors = np.zeros((*values.shape, 4))
+        if scalar_map is not None:
+            colors = scalar_map.to_rgba(values)
+        colors[np.isnan(values)] = (0.0, 0.0, 0.0, 1.0)
+        return colors
+
+    @staticmethod
+    def _animation_link_widths(
+        link_width: Union[pd.Series, pd.DataFrame, None],
+        ids: list[str],
+        times: pd.Index,
+    ) -> np.ndarray:
+        """Scales the link widths of all frames to a maximum of 5 points per frame.
+
+        Returns:
+            array with the shape (frames, links), frames is 1 for constant widths
+
+        """
+        if isinstance(link_width, pd.DataFrame):
+            values = link_width.reindex(index=times, columns=ids).to_numpy(dtype=float)
+        elif isinstance(link_width, pd.Series):
+            values = link_width.reindex(ids).to_numpy(dtype=float)[np.newaxis]
+        else:
+            return np.full((1, len(ids)), 1.5)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            widths = values / np.nanmax(values, axis=1, keepdims=True) * 5
+        return np.nan_to_num(widths, nan=1.5)
+
+    def _animation_frames(
         self,
-        time,
+        geometry: NetworkGeometry,
+        nodes: Union[pd.Series, pd.DataFrame, None],
+        links: Union[pd.Series, pd.DataFrame, None],
+        link_width: Union[pd.Series, pd.DataFrame, None],
+        times: pd.Index,
+        node_scalar_map: Optional[cmx.ScalarMappable],
+        link_scalar_map: Optional[cmx.ScalarMappable],
+    ) -> dict[str, np.ndarray]:
+        """Precomputes the colors and widths of all frames of an animation.
+
+        Returns:
+            dictionary with the Node colors ("node_colors", shape (frames, nodes, 4)), Node marker sizes ("node_sizes"),
+            Link colors ("link_colors", shape (frames, links, 4)) and link widths ("link_widths", shape (frames, links)),
+            frames is 1 for values that do not change
+
+        """
+        node_ids = list(geometry.node_ids)
+        if nodes is None:
+            has_value = np.zeros(len(node_ids), dtype=bool)
+        elif isinstance(nodes, pd.DataFrame):
+            has_value = np.isin(node_ids, nodes.columns)
+        else:
+            has_value = np.isin(node_ids, nodes.index)
+        sizes = np.full(len(node_ids), self.markersize)
+        junctions = geometry.node_slices["junctions"]
+        if self.truncate_nodes and has_value[junctions].any():
+            sizes[junctions] = np.where(has_value[junctions], self.markersize, 0)
+
+        link_ids = list(geometry.link_ids)
+        return {
+            "node_colors": self._animation_colors(nodes, node_ids, times, node_scalar_map),
+            "node_sizes": sizes,
+            "link_colors": self._animation_colors(links, link_ids, times, link_scalar_map),
+            "link_widths": self._animation_link_widths(link_width, link_ids, times),
+        }
+
+    def _create_animation_artists(
+        self,
+        geometry: NetworkGeometry,
         ax: matplotlib.axes.Axes,
-        network: Network,
-        node_colors: pd.DataFrame,
-        link_colors: pd.DataFrame,
-        link_width: Optional[pd.DataFrame],
-    ):
-        ax.clear()
-        node_data = (
-            node_colors.loc[time]
-            if isinstance(node_colors, pd.DataFrame)
-            else node_colors
-        )
-        link_data = (
-            link_colors.loc[time]
-            if isinstance(link_colors, pd.DataFrame)
-            else link_colors
-        )
-        link_width_data = (
-            link_width.loc[time] if isinstance(link_width, pd.DataFrame) else link_width
-        )
-        self._plot_nodes(network=network, ax=ax, colors=node_data)
-        self._plot_links(
-            network=network, ax=ax, colors=link_data, link_width=link_width_data
-        )
+        frames: dict[str, np.ndarray],
+    ) -> list[tuple]:
+        """Creates the artists of an animation once.
+
+        Args:
+          geometry: geometry of the animated Network
+          ax: Matplotlib Axes object
+          frames: precomputed colors and widths (see _animation_frames)
+
+        Returns:
+            list of (setter, values) tuples, where values has one row per frame and setter is the bound artist method
+            updating the artist, values that do not change are only set when the artists are created
+
+        """
+        updates = []
+
+        node_groups = [("junctions", "o", 3), ("tanks", "D", 4), ("reservoirs", "s", 5)]
+        node_colors = frames["node_colors"]
+        for kind, marker, zorder in node_groups:
+            part = geometry.node_slices[kind]
+            coordinates = geometry.node_xy[part]
+            if not len(coordinates):
+                continue
+            artist = ax.scatter(
+                x=coordinates[:, 0],
+                y=coordinates[:, 1],
+                marker=marker,
+                c=node_colors[0, part],
+                s=frames["node_sizes"][part],
+                zorder=zorder,
+                label="_nolegend_",
+            )
+            updates.append((artist.set_color, node_colors[:, part]))
+
+        link_groups = [("pipes", None), ("pumps", "p"), ("valves", "v")]
+        link_colors = frames["link_colors"]
+        link_widths = frames["link_widths"]
+        for kind, marker in link_groups:
+            part = geometry.link_slices[kind]
+            _, polylines, centers = geometry.links(kind)
+            if not polylines:
+                continue
+            collection = LineCollection(
+                polylines,
+                colors=link_colors[0, part],
+                linewidths=link_widths[0, part],
+            )
+            ax.add_collection(collection)
+            updates.append((collection.set_color, link_colors[:, part]))
+            updates.append((collection.set_linewidth, link_widths[:, part]))
+            if marker:
+                artist = ax.scatter(
+                    x=centers[:, 0],
+                    y=centers[:, 1],
+                    marker=marker,
+                    c=link_colors[0, part],
+                    s=self.markersize,
+                    zorder=3,
+                    label="_nolegend_",
+                )
+                updates.append((artist.set_color, link_colors[:, part]))
+        ax.autoscale_view()
+
+        # values that do not change between frames are only set once
+        return [(setter, values) for setter, values in updates if len(values) > 1]
+
+    @staticmethod
+    def _update_animation_frame(frame: int, updates: list[tuple]) -> list:
+        """Sets the precomputed colors and widths of a frame on the persistent artists.
+
+        Returns:
+            list of the updated artists used for blitting
+
+        """
+        artists = []
+        for setter, values in updates:
+            setter(values[frame])
+            artists.append(setter.__self__)
+        return artists
 
     def animate(
         self,
@@ -460,6 +696,7 @@ class NetworkPlotter:
         repeat: bool = False,
         nodes_vlim: Optional[tuple[float, float]] = None,
         links_vlim: Optional[tuple[float, float]] = None,
+        blit: bool = True,
     ) -> FuncAnimation:
         """This function plots OOPNET networks with simulation results as a network plot with Matplotlib.
 
@@ -480,6 +717,10 @@ class NetworkPlotter:
           link_width: Values describing the link width as Pandas Series generated e.g. by one of OOPNET's SimulationReport functions (e.g. Flow(rpt)).
           interval: interval between the individual frames
           repeat: if True, the animation will be created as a recurring loop
+          blit: if True, only the updated artists are redrawn in every frame
+
+        The artists are created once. The colors and link widths of all frames are computed in advance with a single
+        colormap call and only set on the existing artists when a frame is drawn.
 
         Returns:
           Matplotlib's figure handle
@@ -488,67 +729,39 @@ class NetworkPlotter:
         self._set_colormaps(self.colormap)
         fig, ax = self._prepare_plot(ax=ax, fignum=fignum)
 
-        # get Link colors
-        links_vlim = self._get_colorbar_limit(data=links, vlim=links_vlim)
-        if links is None:
-            link_ids = get_link_ids(network)
-            link_colors = pd.Series(["k"] * len(link_ids), index=link_ids)
-            link_scalar_map = None
-        else:
-            link_scalar_map = self._get_scalar_colormap(
-                vlim=links_vlim, colormap=self._node_colormap
-            )
-            link_colors = links.map(link_scalar_map.to_rgba)
-
-        link_colorbar = (
-            isinstance(self.colorbar, dict)
-            and self.colorbar["link"] is True
-            or isinstance(self.colorbar, bool)
-            and self.colorbar
-        ) and links is not None
-        if link_colorbar:
-            self._add_colorbar(link_label, link_scalar_map, links_vlim[2], ax=ax, fig=fig)
-
-        # get Node colors
-        nodes_vlim = self._get_colorbar_limit(nodes, nodes_vlim)
-        if nodes is None:
-            node_ids = get_node_ids(network)
-            node_colors = pd.Series(["k"] * len(node_ids), index=node_ids)
-            node_scalar_map = None
-        else:
-            node_scalar_map = self._get_scalar_colormap(
-                vlim=nodes_vlim, colormap=self._node_colormap
-            )
-            node_colors = nodes.map(node_scalar_map.to_rgba)
-
-        node_colorbar = (
-            isinstance(self.colorbar, dict)
-            and self.colorbar["node"] is True
-            or isinstance(self.colorbar, bool)
-            and self.colorbar
-        ) and nodes is not None
-        if node_colorbar:
-            self._add_colorbar(node_label, node_scalar_map, nodes_vlim[2], ax=ax, fig=fig)
-
-        if isinstance(nodes, pd.DataFrame):
-            times = nodes.index
-        elif isinstance(links, pd.DataFrame):
-            times = links.index
-        elif isinstance(link_width, pd.DataFrame):
-            times = link_width.index
-        else:
-            raise ValueError(
-                "A pandas DataFrame must be provided for at least one of these arguments: nodes, links, link_width"
-            )
-        fun = partial(
-            self._render_animation_frame,
-            ax=ax,
-            link_colors=link_colors,
-            node_colors=node_colors,
+        times, node_scalar_map, link_scalar_map, colorbars = self._animation_setup(
+            nodes=nodes,
+            links=links,
+            link_width=link_width,
+            nodes_vlim=nodes_vlim,
+            links_vlim=links_vlim,
+            node_label=node_label,
+            link_label=link_label,
+        )
+        for label, scalar_map, extend in colorbars:
+            self._add_colorbar(label, scalar_map, extend, ax=ax, fig=fig)
+
+        geometry = network.geometry
+        frames = self._animation_frames(
+            geometry=geometry,
+            nodes=nodes,
+            links=links,
             link_width=link_width,
-            network=network,
+            times=times,
+            node_scalar_map=node_scalar_map,
+            link_scalar_map=link_scalar_map,
+        )
+        updates = self._create_animation_artists(geometry=geometry, ax=ax, frames=frames)
+        fun = partial(self._update_animation_frame, updates=updates)
+        anim = FuncAnimation(
+            fig,
+            fun,
+            frames=len(times),
+            init_func=lambda: [setter.__self__ for setter, _ in updates],
+            interval=interval,
+            repeat=repeat,
+            blit=blit,
         )
-        anim = FuncAnimation(fig, fun, frames=times, interval=interval, repeat=repeat)
 
         self._resize_colorbar(fig=fig)
 
@@ -565,3 +778,77 @@ class NetworkPlotter:
             labelleft=False,    # labels along the left edge are off
         )
         return anim
+
+    def render_animation(
+        self,
+        network: Network,
+        path: str,
+        nodes: Optional[pd.DataFrame] = None,
+        node_label: Optional[str] = None,
+        links: Optional[pd.DataFrame] = None,
+        link_label: Optional[str] = None,
+        link_width: Optional[pd.DataFrame] = None,
+        nodes_vlim: Optional[tuple[float, float]] = None,
+        links_vlim: Optional[tuple[float, float]] = None,
+        fps: float = 10,
+        dpi: float = 100,
+        figsize: Optional[tuple[float, float]] = None,
+        workers: Optional[int] = None,
+    ) -> str:
+        """Renders an animation of simulation results to a GIF or video file in parallel.
+
+        The plot looks like the one created with animate. The colors and link widths of all frames are computed once,
+        the time steps are split into chunks that are rendered by a pool of processes with matplotlib's Agg canvas, and
+        the frames are stitched to a GIF (with Pillow) or a video (with ffmpeg, e.g., ".mp4"). See render_frames.
+
+        Args:
+          network: OOPNET network object one wants to plot
+          path: path of the output file, files ending with ".gif" are written as GIF, all other files with ffmpeg
+          nodes: Values related to the nodes as Pandas DataFrame (e.g. rpt.pressure). If nodes is None or specific nodes do not have values, then the nodes are drawn as black circles
+          node_label: label for the Node values colorbar
+          links: Values related to the links as Pandas DataFrame (e.g. rpt.flow). If links is None or specific links do not have values, then the links are drawn as black lines
+          link_label: label for the Link values colorbar
+          link_width: Values describing the link width as Pandas DataFrame (e.g. rpt.flow.abs())
+          nodes_vlim: limits for the Node values colorbar as tuple (min, max)
+          links_vlim: limits for the Link values colorbar as tuple (min, max)
+          fps: frames per second
+          dpi: resolution of the frames
+          figsize: figure size in inches
+          workers: number of processes, defaults to the number of CPUs, 1 renders the frames in the current process
+
+        Returns:
+          path of the output file
+
+        """
+        self._set_colormaps(self.colormap)
+        times, node_scalar_map, link_scalar_map, colorbars = self._animation_setup(
+            nodes=nodes,
+            links=links,
+            link_width=link_width,
+            nodes_vlim=nodes_vlim,
+            links_vlim=links_vlim,
+            node_label=node_label,
+            link_label=link_label,
+        )
+        geometry = network.geometry
+        frames = self._animation_frames(
+            geometry=geometry,
+            nodes=nodes,
+            links=links,
+            link_width=link_width,
+            times=times,
+            node_scalar_map=node_scalar_map,
+            link_scalar_map=link_scalar_map,
+        )
+        return render_frames(
+            plotter=self,
+            geometry=geometry,
+            frames=frames,
+            colorbars=colorbars,
+            n_frames=len(times),
+            path=path,
+            fps=fps,
+            dpi=dpi,
+            figsize=figsize,
+            workers=workers,
+        )
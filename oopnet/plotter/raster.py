@@ -0,0 +1,397 @@
+from __future__ import annotations
+from typing import Optional, TYPE_CHECKING
+import logging
+
+import numpy as np
+import matplotlib.axes
+import matplotlib.cm as cmx
+from matplotlib.collections import LineCollection
+
+from oopnet.elements.geometry import clip_segments
+
+if TYPE_CHECKING:
+    from oopnet.elements.geometry import NetworkGeometry
+
+logger = logging.getLogger(__name__)
+
+AGGREGATIONS = ("mean", "min", "max", "count")
+DEFAULT_DETAIL_THRESHOLD = 5000
+NODE_MARKERS = (("junctions", "o", 3), ("tanks", "D", 4), ("reservoirs", "s", 5))
+LINK_MARKERS = (("pumps", "p"), ("valves", "v"))
+
+
+def _aggregate(
+    pixels: np.ndarray, values: Optional[np.ndarray], size: int, how: str
+) -> np.ndarray:
+    """Aggregates the values of samples falling into the same pixel.
+
+    Args:
+      pixels: flat pixel index of every sample
+      values: sample values, NaN values only count as coverage
+      size: number of pixels
+      how: aggregation ("mean", "min", "max" or "count")
+
+    Returns:
+        flat array with one value per pixel, NaN for pixels without samples
+
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(
+            f"Unknown aggregation {how!r}, use one of {', '.join(AGGREGATIONS)}."
+        )
+    counts = np.bincount(pixels, minlength=size).astype(float)
+    empty = counts == 0
+    if how == "count" or values is None:
+        counts[empty] = np.nan
+        return counts
+
+    valid = ~np.isnan(values)
+    if how == "mean":
+        sums = np.bincount(pixels[valid], weights=values[valid], minlength=size)
+        n = np.bincount(pixels[valid], minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / n
+    result = np.full(size, np.inf if how == "min" else -np.inf)
+    reduce = np.minimum if how == "min" else np.maximum
+    reduce.at(result, pixels[valid], values[valid])
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+def rasterize_points(
+    xy: np.ndarray,
+    values: Optional[np.ndarray],
+    extent: tuple[float, float, float, float],
+    shape: tuple[int, int],
+    how: str = "mean",
+) -> np.ndarray:
+    """Bins points into an image.
+
+    Args:
+      xy: point coordinates with the shape (points, 2)
+      values: value of every point, None only computes the number of points per pixel
+      extent: image extent (xmin, xmax, ymin, ymax)
+      shape: image shape (rows, columns)
+      how: aggregation of points in the same pixel ("mean", "min", "max" or "count")
+
+    Returns:
+        image with the given shape, the first row is at ymin, pixels without points are NaN
+
+    """
+    rows, columns = shape
+    xmin, xmax, ymin, ymax = extent
+    column = np.floor((xy[:, 0] - xmin) / (xmax - xmin) * columns).astype(int)
+    row = np.floor((xy[:, 1] - ymin) / (ymax - ymin) * rows).astype(int)
+    inside = (column >= 0) & (column < columns) & (row >= 0) & (row < rows)
+    pixels = row[inside] * columns + column[inside]
+    if values is not None:
+        values = np.asarray(values, dtype=float)[inside]
+    return _aggregate(pixels, values, rows * columns, how).reshape(shape)
+
+
+def _sample_segments(
+    segments: np.ndarray,
+    values: Optional[np.ndarray],
+    extent: tuple[float, float, float, float],
+    shape: tuple[int, int],
+) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """Clips segments to the extent and samples them once per pixel they cross.
+
+    Returns:
+        sample coordinates and the values of the samples' segments
+
+    """
+    inside, clipped = clip_segments(segments, extent)
+    rows, columns = shape
+    xmin, xmax, ymin, ymax = extent
+    scale = np.array([columns / (xmax - xmin), rows / (ymax - ymin)])
+    pixel_delta = np.abs(clipped[:, 1] - clipped[:, 0]) * scale
+    n_samples = np.ceil(pixel_delta.max(axis=1, initial=0)).astype(int) + 1
+    segment = np.repeat(np.arange(len(clipped)), n_samples)
+    first = np.cumsum(n_samples) - n_samples
+    step = np.arange(len(segment)) - np.repeat(first, n_samples)
+    t = step / np.maximum(n_samples - 1, 1)[segment]
+    points = clipped[segment, 0] + t[:, np.newaxis] * (
+        clipped[segment, 1] - clipped[segment, 0]
+    )
+    # samples on the upper and right border belong to the last pixel
+    points = np.minimum(points, np.nextafter([xmax, ymax], -np.inf))
+    if values is not None:
+        values = np.asarray(values, dtype=float)[inside][segment]
+    return points, values
+
+
+def rasterize_segments(
+    segments: np.ndarray,
+    values: Optional[np.ndarray],
+    extent: tuple[float, float, float, float],
+    shape: tuple[int, int],
+    how: str = "mean",
+) -> np.ndarray:
+    """Draws line segments into an image by binning samples taken along the segments.
+
+    The segments are clipped to the extent and sampled once per pixel they cross, so every pixel a segment passes
+    through receives at least one sample.
+
+    Args:
+      segments: segment coordinates with the shape (segments, 2, 2)
+      values: value of every segment, None only computes the number of samples per pixel
+      extent: image extent (xmin, xmax, ymin, ymax)
+      shape: image shape (rows, columns)
+      how: aggregation of samples in the same pixel ("mean", "min", "max" or "count")
+
+    Returns:
+        image with the given shape, the first row is at ymin, pixels without segments are NaN
+
+    """
+    points, values = _sample_segments(segments, values, extent, shape)
+    return rasterize_points(points, values, extent, shape, how)
+
+
+def simplify_polylines(
+    vertices: np.ndarray, offsets: np.ndarray, tolerance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Removes polyline vertices that fall into the same tolerance-sized grid cell as their predecessor.
+
+    The first and last point of every polyline are always kept. With the pixel size of a view as tolerance, the
+    simplified polylines look the same as the original ones.
+
+    Args:
+      vertices: vertex buffer with the shape (points, 2)
+      offsets: position of the first point of every polyline in vertices and the total number of points
+      tolerance: grid cell size in map units
+
+    Returns:
+        simplified vertex buffer and offsets
+
+    """
+    if tolerance <= 0 or len(vertices) == 0:
+        return vertices, offsets
+    cells = np.floor(vertices / tolerance)
+    keep = np.ones(len(vertices), dtype=bool)
+    keep[1:] = np.any(cells[1:] != cells[:-1], axis=1)
+    keep[offsets[:-1]] = True
+    keep[offsets[1:] - 1] = True
+    kept = np.concatenate([[0], np.cumsum(keep)])
+    return vertices[keep], kept[offsets]
+
+
+def _colors(values: np.ndarray, scalar_map: Optional[cmx.ScalarMappable]) -> np.ndarray:
+    """Maps values to RGBA colors, NaN values and all values without a scalar map are black."""
+    colors = np.tile([0.0, 0.0, 0.0, 1.0], (*values.shape, 1))
+    if scalar_map is not None:
+        valid = ~np.isnan(values)
+        colors[valid] = scalar_map.to_rgba(values[valid])
+    return colors
+
+
+def _rgba_image(
+    coverage: np.ndarray, image: np.ndarray, scalar_map: Optional[cmx.ScalarMappable]
+) -> np.ndarray:
+    """Colors an aggregated image, pixels without elements are transparent and pixels without values black."""
+    rgba = _colors(image, scalar_map)
+    rgba[np.isnan(coverage)] = 0.0
+    return rgba
+
+
+class LevelOfDetailRenderer:
+    """Draws large networks as aggregated images and switches to vector graphics when zoomed in.
+
+    If more than detail_threshold Links are visible, Links and Nodes are binned into an image with one pixel per screen
+    pixel of the Axes and the pixel values are aggregated (e.g., the mean pressure of all Nodes in a pixel). Otherwise,
+    the visible Links are drawn as polylines simplified to the pixel size and the visible Nodes as markers. The plot is
+    redrawn whenever the view limits change (panning, zooming).
+
+    Args:
+      ax: Matplotlib Axes object
+      geometry: Network geometry
+      node_values: values aligned with geometry.node_ids (NaN for Nodes without values), Nodes are drawn black if None
+      link_values: values aligned with geometry.link_ids (NaN for Links without values), Links are drawn black if None
+      node_scalar_map: scalar map for coloring Node values
+      link_scalar_map: scalar map for coloring Link values
+      markersize: Node marker size in vector mode
+      detail_threshold: maximum number of visible Links drawn as vector graphics
+      how: aggregation of values in the same pixel ("mean", "min", "max" or "count")
+
+    Attributes:
+      mode: "raster" or "vector", depending on the current view
+
+    """
+
+    def __init__(
+        self,
+        ax: matplotlib.axes.Axes,
+        geometry: NetworkGeometry,
+        node_values: Optional[np.ndarray] = None,
+        link_values: Optional[np.ndarray] = None,
+        node_scalar_map: Optional[cmx.ScalarMappable] = None,
+        link_scalar_map: Optional[cmx.ScalarMappable] = None,
+        markersize: float = 5.0,
+        detail_threshold: int = DEFAULT_DETAIL_THRESHOLD,
+        how: str = "mean",
+    ):
+        self.ax = ax
+        self.geometry = geometry
+        if node_values is None:
+            node_values = np.full(len(geometry.node_ids), np.nan)
+        if link_values is None:
+            link_values = np.full(len(geometry.link_ids), np.nan)
+        self.node_values = np.asarray(node_values, dtype=float)
+        self.link_values = np.asarray(link_values, dtype=float)
+        self.node_scalar_map = node_scalar_map
+        self.link_scalar_map = link_scalar_map
+        self.markersize = markersize
+        self.detail_threshold = detail_threshold
+        self.how = how
+        self.mode: Optional[str] = None
+        self._artists = []
+        self._updating = False
+
+        offsets = geometry.offsets
+        if len(geometry.link_ids):
+            self._link_min = np.minimum.reduceat(geometry.vertices, offsets[:-1])
+            self._link_max = np.maximum.reduceat(geometry.vertices, offsets[:-1])
+        else:
+            self._link_min = self._link_max = np.empty((0, 2))
+        self._segment_links, self._segments = geometry.segments()
+
+    def draw(self):
+        """Sets the view to the whole network, draws it and redraws it whenever the view limits change."""
+        points = np.concatenate([self.geometry.node_xy, self.geometry.vertices])
+        if len(points):
+            lower, upper = points.min(axis=0), points.max(axis=0)
+            margin = np.maximum((upper - lower) * 0.02, 1e-9)
+            self.ax.set_xlim(lower[0] - margin[0], upper[0] + margin[0])
+            self.ax.set_ylim(lower[1] - margin[1], upper[1] + margin[1])
+        self.ax.set_autoscale_on(False)
+        self.update()
+        # the lambda keeps the renderer alive, the callback registry only stores weak references to methods
+        self.ax.callbacks.connect("xlim_changed", lambda ax: self.update())
+        self.ax.callbacks.connect("ylim_changed", lambda ax: self.update())
+
+    def _view(self) -> tuple[tuple[float, float, float, float], tuple[int, int]]:
+        xmin, xmax = sorted(self.ax.get_xlim())
+        ymin, ymax = sorted(self.ax.get_ylim())
+        window = self.ax.get_window_extent()
+        shape = (max(int(window.height), 1), max(int(window.width), 1))
+        return (xmin, xmax, ymin, ymax), shape
+
+    def update(self):
+        """Redraws the network for the current view limits."""
+        if self._updating:
+            return
+        self._updating = True
+        try:
+            extent, shape = self._view()
+            visible = (
+                (self._link_max[:, 0] >= extent[0])
+                & (self._link_min[:, 0] <= extent[1])
+                & (self._link_max[:, 1] >= extent[2])
+                & (self._link_min[:, 1] <= extent[3])
+            )
+            for artist in self._artists:
+                artist.remove()
+            if visible.sum() <= self.detail_threshold:
+                self.mode = "vector"
+                self._artists = self._draw_vectors(extent, shape, visible)
+            else:
+                self.mode = "raster"
+                self._artists = self._draw_raster(extent, shape)
+            logger.debug(f"Drawing {visible.sum()} visible links in {self.mode} mode")
+        finally:
+            self._updating = False
+
+    def _draw_raster(
+        self, extent: tuple[float, float, float, float], shape: tuple[int, int]
+    ) -> list:
+        points, values = _sample_segments(
+            self._segments, self.link_values[self._segment_links], extent, shape
+        )
+        rgba = _rgba_image(
+            rasterize_points(points, None, extent, shape, "count"),
+            rasterize_points(points, values, extent, shape, self.how),
+            self.link_scalar_map,
+        )
+        xy = self.geometry.node_xy
+        nodes = _rgba_image(
+            rasterize_points(xy, None, extent, shape, "count"),
+            rasterize_points(xy, self.node_values, extent, shape, self.how),
+            self.node_scalar_map,
+        )
+        covered = nodes[..., 3] > 0
+        rgba[covered] = nodes[covered]
+        image = self.ax.imshow(
+            rgba,
+            extent=extent,
+            origin="lower",
+            interpolation="nearest",
+            aspect="auto",
+            zorder=2,
+        )
+        return [image]
+
+    def _draw_vectors(
+        self,
+        extent: tuple[float, float, float, float],
+        shape: tuple[int, int],
+        visible: np.ndarray,
+    ) -> list:
+        geometry = self.geometry
+        indices = np.flatnonzero(visible)
+        starts = geometry.offsets[indices]
+        lengths = geometry.offsets[indices + 1] - starts
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        selection = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        vertices, offsets = simplify_polylines(
+            geometry.vertices[selection], offsets, (extent[1] - extent[0]) / shape[1]
+        )
+        polylines = [
+            vertices[start:end] for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+        link_colors = _colors(self.link_values, self.link_scalar_map)
+        collection = LineCollection(
+            polylines, colors=link_colors[indices], linewidths=1.5, zorder=2
+        )
+        self.ax.add_collection(collection)
+        artists = [collection]
+
+        for kind, marker in LINK_MARKERS:
+            part = np.zeros(len(geometry.link_ids), dtype=bool)
+            part[geometry.link_slices[kind]] = True
+            part &= visible
+            if part.any():
+                artists.append(
+                    self.ax.scatter(
+                        *geometry.midpoints[part].T,
+                        marker=marker,
+                        c=link_colors[part],
+                        s=self.markersize,
+                        zorder=3,
+                        label="_nolegend_",
+                    )
+                )
+
+        xy = geometry.node_xy
+        in_view = (
+            (xy[:, 0] >= extent[0])
+            & (xy[:, 0] <= extent[1])
+            & (xy[:, 1] >= extent[2])
+            & (xy[:, 1] <= extent[3])
+        )
+        node_colors = _colors(self.node_values, self.node_scalar_map)
+        for kind, marker, zorder in NODE_MARKERS:
+            part = np.zeros(len(geometry.node_ids), dtype=bool)
+            part[geometry.node_slices[kind]] = True
+            part &= in_view
+            if part.any():
+                artists.append(
+                    self.ax.scatter(
+                        *xy[part].T,
+                        marker=marker,
+                        c=node_colors[part],
+                        s=self.markersize,
+                        zorder=zorder,
+                        label="_nolegend_",
+                    )
+                )
+        return artists
@@ -0,0 +1,212 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, TYPE_CHECKING
+import glob
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+from PIL import Image
+
+if TYPE_CHECKING:
+    import matplotlib.cm as cmx
+    from oopnet.elements.geometry import NetworkGeometry
+    from oopnet.plotter.pyplot import NetworkPlotter
+
+logger = logging.getLogger(__name__)
+
+# file name pattern of the rendered frames
+FRAME_PATTERN = "frame_%06d.png"
+# number of frame chunks per worker, more chunks balance the load better
+CHUNKS_PER_WORKER = 4
+
+# rendering state of the current process created by _init_renderer
+_renderer = {}
+
+
+def _ffmpeg_path() -> str:
+    """Returns the path of the ffmpeg executable configured in matplotlib's rcParams["animation.ffmpeg_path"]."""
+    path = shutil.which(matplotlib.rcParams["animation.ffmpeg_path"])
+    if path is None:
+        raise RuntimeError(
+            "Writing videos requires ffmpeg. Install ffmpeg, set matplotlib's rcParams['animation.ffmpeg_path'] or "
+            "export the animation as GIF instead."
+        )
+    return path
+
+
+def _frame_chunks(n_frames: int, workers: int) -> list[tuple[int, int]]:
+    """Splits the frames into contiguous (start, stop) chunks."""
+    n_chunks = min(n_frames, workers * CHUNKS_PER_WORKER) or 1
+    bounds = np.linspace(0, n_frames, n_chunks + 1).astype(int)
+    return [
+        (start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+    ]
+
+
+def _save_frames(frames: dict[str, np.ndarray], directory: str) -> dict[str, str]:
+    """Stores the precomputed frame values as .npy files the workers memory-map instead of receiving copies."""
+    files = {}
+    for name, values in frames.items():
+        files[name] = os.path.join(directory, f"{name}.npy")
+        np.save(files[name], np.asarray(values, dtype=np.float32))
+    return files
+
+
+def _init_renderer(
+    plotter: NetworkPlotter,
+    geometry: NetworkGeometry,
+    frames: dict[str, str],
+    colorbars: list[tuple[Optional[str], cmx.ScalarMappable, str]],
+    figsize: Optional[tuple[float, float]],
+    dpi: float,
+):
+    """Creates the figure and the persistent artists of the current process.
+
+    The figure is drawn with the Agg canvas, independent of the pyplot backend.
+
+    Args:
+      plotter: NetworkPlotter providing the plot settings
+      geometry: geometry of the animated Network
+      frames: paths of the precomputed colors and widths (see NetworkPlotter._animation_frames)
+      colorbars: list of (label, scalar color map, extend) tuples
+      figsize: figure size in inches
+      dpi: resolution of the frames
+
+    """
+    frames = {name: np.load(path, mmap_mode="r") for name, path in frames.items()}
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.grid(False)
+    ax.axis("equal")
+    ax.axis("off")
+    for label, scalar_map, extend in colorbars:
+        plotter._add_colorbar(label, scalar_map, extend, ax=ax, fig=fig)
+    updates = plotter._create_animation_artists(geometry=geometry, ax=ax, frames=frames)
+    plotter._resize_colorbar(fig=fig)
+    _renderer.update(figure=fig, updates=updates)
+
+
+def _render_frames(start: int, stop: int, directory: str) -> int:
+    """Renders the frames start to stop - 1 to PNG files in directory.
+
+    Returns:
+        number of rendered frames
+
+    """
+    fig = _renderer["figure"]
+    for frame in range(start, stop):
+        for setter, values in _renderer["updates"]:
+            setter(values[frame])
+        fig.canvas.draw()
+        image = Image.fromarray(np.asarray(fig.canvas.buffer_rgba()))
+        image.save(os.path.join(directory, FRAME_PATTERN % frame), compress_level=1)
+    return stop - start
+
+
+def _write_gif(files: list[str], path: str, fps: float):
+    """Stitches the rendered frames to an endlessly looping GIF."""
+    images = (Image.open(file).convert("RGB") for file in files)
+    first = next(images)
+    first.save(path, save_all=True, append_images=images, duration=1000 / fps, loop=0)
+
+
+def _write_video(ffmpeg: str, directory: str, path: str, fps: float):
+    """Encodes the rendered frames to a video with ffmpeg, the codec is chosen by ffmpeg from the file extension."""
+    command = [
+        ffmpeg,
+        "-y",
+        "-loglevel",
+        "error",
+        "-framerate",
+        str(fps),
+        "-i",
+        os.path.join(directory, FRAME_PATTERN),
+        # most codecs require even frame sizes
+        "-vf",
+        "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+        "-pix_fmt",
+        "yuv420p",
+        path,
+    ]
+    logger.debug(f"Running command {command}")
+    subprocess.run(command, check=True, capture_output=True)
+
+
+def render_frames(
+    plotter: NetworkPlotter,
+    geometry: NetworkGeometry,
+    frames: dict[str, np.ndarray],
+    colorbars: list[tuple[Optional[str], cmx.ScalarMappable, str]],
+    n_frames: int,
+    path: str,
+    fps: float = 10,
+    dpi: float = 100,
+    figsize: Optional[tuple[float, float]] = None,
+    workers: Optional[int] = None,
+) -> str:
+    """Renders the frames of an animation in a process pool and stitches them to a GIF or video file.
+
+    The precomputed colors and widths are stored once in memory-mapped files, every worker creates the figure and its
+    artists once and renders a contiguous chunk of frames at a time with the Agg canvas. Files ending with ".gif" are
+    written with Pillow, all other formats (e.g., ".mp4") are encoded with ffmpeg.
+
+    Args:
+      plotter: NetworkPlotter providing the plot settings
+      geometry: geometry of the animated Network
+      frames: precomputed colors and widths (see NetworkPlotter._animation_frames)
+      colorbars: list of (label, scalar color map, extend) tuples
+      n_frames: number of frames
+      path: path of the output file
+      fps: frames per second
+      dpi: resolution of the frames
+      figsize: figure size in inches, defaults to matplotlib's default figure size
+      workers: number of processes, defaults to the number of CPUs, 1 renders the frames in the current process
+
+    Returns:
+      path of the output file
+
+    """
+    gif = path.lower().endswith(".gif")
+    ffmpeg = None if gif else _ffmpeg_path()
+    workers = workers or os.cpu_count() or 1
+    chunks = _frame_chunks(n_frames, workers)
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = _save_frames(frames, directory)
+        initargs = (plotter, geometry, files, colorbars, figsize, dpi)
+        logger.debug(
+            f"Rendering {n_frames} frames in {len(chunks)} chunks with {workers} workers"
+        )
+        if workers == 1:
+            _init_renderer(*initargs)
+            try:
+                for start, stop in chunks:
+                    _render_frames(start, stop, directory)
+            finally:
+                _renderer.clear()
+        else:
+            with ProcessPoolExecutor(
+                workers, initializer=_init_renderer, initargs=initargs
+            ) as executor:
+                futures = [
+                    executor.submit(_render_frames, start, stop, directory)
+                    for start, stop in chunks
+                ]
+                for future in futures:
+                    future.result()
+
+        if gif:
+            _write_gif(
+                sorted(glob.glob(os.path.join(directory, "frame_*.png"))), path, fps
+            )
+        else:
+            _write_video(ffmpeg, directory, path, fps)
+    return path
@@ -1,5 +1,6 @@
 from typing import Callable, Optional
 from dataclasses import dataclass
+import bisect
 
 
 @dataclass
@@ -12,6 +13,47 @@ class ReaderDecorator:
     readerfunction: Optional[Callable] = None
 
 
+_section_readers: list[ReaderDecorator] = []
+
+
+def register_section_reader(
+    title: str,
+    priority: int,
+    readerfunction: Callable,
+    functionname: Optional[str] = None,
+) -> ReaderDecorator:
+    """Adds a section reader to the reader dispatch table.
+
+    The dispatch table is ordered by priority. Section readers with identical priorities are called in the order they
+    were registered. If a section reader for the same section title already exists, it is replaced.
+
+    Args:
+      title: section title
+      priority: reading priority
+      readerfunction: callable that takes a Network and an EPANET input file block as arguments
+      functionname: name of the section reader (defaults to the callable's name)
+
+    Returns:
+        the registered section reader
+
+    """
+    reader = ReaderDecorator(
+        sectionname=title,
+        functionname=functionname or readerfunction.__name__,
+        priority=priority,
+        readerfunction=readerfunction,
+    )
+    _section_readers[:] = [x for x in _section_readers if x.sectionname != title]
+    index = bisect.bisect_right([x.priority for x in _section_readers], priority)
+    _section_readers.insert(index, reader)
+    return reader
+
+
+def get_section_readers() -> list[ReaderDecorator]:
+    """Returns all registered section readers ordered by their priority."""
+    return list(_section_readers)
+
+
 def make_registering_decorator_factory(foreign_decorator_factory):
     """
 
@@ -43,7 +85,9 @@ def section_reader(title: str, priority: int) -> Callable:
     """Synchronization decorator.
 
     Used to decorate factory functions and classes for the EPANET input file reader.The title marks the section in the
-    input file and the priority is used for ordering the different factories.
+    input file and the priority is used for ordering the different factories. Decorated callables are added to the
+    reader dispatch table on decoration (see register_section_reader), which can be used to add custom sections or to
+    replace existing section readers.
 
     Args:
       title: section title
@@ -58,6 +102,7 @@ def section_reader(title: str, priority: int) -> Callable:
         def new_function(*args, **kw):
             return f(*args, **kw)
 
+        register_section_reader(title, priority, new_function, functionname=f.__name__)
         return new_function
 
     return wrap
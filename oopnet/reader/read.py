@@ -4,7 +4,9 @@ import logging
 from typing import Optional, TYPE_CHECKING
 
 from oopnet.reader.unit_converter.convert import convert
-from oopnet.reader.module_reader import list_section_reader_callables
+from oopnet.reader.decorators import get_section_readers
+
+# the reading modules register their section readers on import
 from oopnet.reader.reading_modules import (
     read_system_operation,
     read_options_and_reporting,
@@ -64,16 +66,6 @@ def read(
       network object
 
     """
-    modules = [
-        read_network_components,
-        read_network_map_tags,
-        read_options_and_reporting,
-        read_system_operation,
-        read_water_quality,
-    ]
-
-    all_functions = list_section_reader_callables(modules)
-
     if filename is not None:
         logger.info(f"Reading model from {filename!r}")
         with open(filename, "r") as fid:
@@ -87,9 +79,8 @@ def read(
         )
 
     blocks = filesplitter(content)
-    newlist = sorted(all_functions, key=lambda x: x.priority)
-    for f in newlist:
-        if f.sectionname in list(blocks.keys()):
+    for f in get_section_readers():
+        if f.sectionname in blocks:
             f.readerfunction(network, blocks[f.sectionname])
 
     # Convert network to SI units
@@ -273,22 +273,17 @@ def read_report(network: Network, block: list):
             if vals[1].upper() in ["NONE", "ALL"]:
                 r.nodes = vals[1].upper()
             else:
-                nodes = vals[1:]
-                for n in nodes:
-                    if r.nodes is None:
-                        r.nodes = [get_node(network, n)]
-                    else:
-                        r.nodes.append(get_node(network, n))
+                # multiple NODES lines are accumulated
+                if not isinstance(r.nodes, list):
+                    r.nodes = []
+                r.nodes.extend(get_node(network, n) for n in vals[1:])
         elif vals[0] == "LINKS":
             if vals[1].upper() in ["NONE", "ALL"]:
-                r.nodes = vals[1].upper()
+                r.links = vals[1].upper()
             else:
-                links = vals[1:]
-                for l in links:
-                    if r.links is None:
-                        r.links = [get_link(network, l)]
-                    else:
-                        r.links.append(get_link(network, l))
+                if not isinstance(r.links, list):
+                    r.links = []
+                r.links.extend(get_link(network, l) for l in vals[1:])
         elif vals[1].upper() == "PRECISION":
             if vals[0] == "ELEVATION":
                 precision.elevation = precision2report(vals)
@@ -1,5 +1,5 @@
 """
-Convert all units which are possible in the EPANET-Input file to LPS
+Convert all units which are possible in the EPANET-Input file to LPS and back
 Possible: (This are the flow units)
 - CFS ... cubic feet per second
 - GPM ... gallons per minute
@@ -12,19 +12,33 @@ Possible: (This are the flow units)
 - CMH ... cubic meters per hour
 - CMD ... cubic meters per day
 
-The Input of OOPNET is possible in all units, but OOPNET uses and returns SI-Units (LPS).
+The Input of OOPNET is possible in all units, but OOPNET uses and returns SI-Units (LPS). For writing, a network can
+be converted back to any of these units.
 """
+
+from __future__ import annotations
 import logging
+from itertools import chain
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
 
+from oopnet.elements.network_components import Junction, Tank, PRV, PSV, PBV, FCV, GPV
 from oopnet.utils.getters.element_lists import (
     get_junctions,
     get_tanks,
     get_reservoirs,
     get_pipes,
+    get_pumps,
+    get_valves,
+    get_energy_entries,
+    get_controls,
+    get_rules,
 )
 
+if TYPE_CHECKING:
+    from oopnet.elements.network import Network
+
 logger = logging.getLogger(__name__)
 
 FEET2METER = 0.3048
@@ -43,7 +57,13 @@ CMD2LPS = 0.0115741
 
 
 class Converter:
-    """ """
+    """Conversion factors from a network's units to LPS.
+
+    Args:
+      network: network whose headloss formula is used
+      units: flow units the factors are computed for, defaults to the network's units
+
+    """
 
     f_demand: float = 1.0
     f_diameter_pipes: float = 1.0
@@ -60,16 +80,17 @@ class Converter:
     f_velocity: float = 1.0
     f_volume: float = 1.0
 
-    def __init__(self, network):
-        if network.options.units == "LPS":
+    def __init__(self, network: Network, units: Optional[str] = None):
+        units = network.options.units if units is None else units
+        if units == "LPS":
             logger.debug("Already using LPS as unit. Skipping conversion.")
             return
 
-        logger.debug(f"Converting units from {network.options.units} to LPS")
+        logger.debug(f"Converting units from {units} to LPS")
 
         us_units = ["CFS", "GPM", "MGD", "IMGD", "AFD"]
 
-        if network.options.units in us_units:
+        if units in us_units:
 
             self.f_diameter_pipes = INCH2MILLIMETER
             self.f_diameter_tanks = FEET2METER
@@ -80,81 +101,252 @@ class Converter:
             self.f_pressure = PSI2METER
             self.f_reaction_coeff_wall = FEET2METER
             if network.options.headloss == "D-W":
-                self.f_roughness_coeff = 1.0e3 * FEET2METER
+                # Darcy-Weisbach roughness is given in millifeet and millimeters
+                self.f_roughness_coeff = FEET2METER
             self.f_velocity = FEET2METER
             self.f_volume = FEET2METER**3
 
-        if network.options.units == "CFS":
+        if units == "CFS":
             self.f_flow = CFS2LPS
-        elif network.options.units == "GPM":
+        elif units == "GPM":
             self.f_flow = GPM2LPS
-        elif network.options.units == "MGD":
+        elif units == "MGD":
             self.f_flow = MGD2LPS
-        elif network.options.units == "IMGD":
+        elif units == "IMGD":
             self.f_flow = IMGD2LPS
-        elif network.options.units == "AFD":
+        elif units == "AFD":
             self.f_flow = AFD2LPS
-        elif network.options.units == "LPM":
+        elif units == "LPM":
             self.f_flow = LPM2LPS
-        elif network.options.units == "MLD":
+        elif units == "MLD":
             self.f_flow = MLD2LPS
-        elif network.options.units == "CMH":
+        elif units == "CMH":
             self.f_flow = CMH2LPS
-        elif network.options.units == "CMD":
+        elif units == "CMD":
             self.f_flow = CMD2LPS
         else:
-            raise ValueError(f"Illegal unit {network.options.units} defined.")
+            raise ValueError(f"Illegal unit {units} defined.")
 
         self.f_demand = self.f_flow
         si_units = ["LPS", "LPM", "MLD", "CMH", "CMD"]
 
-        if network.options.units in us_units:
+        if units in us_units:
             self.f_emitter_coefficient = self.f_flow * 1.0 / np.sqrt(PSI2METER)
-        elif network.options.units in si_units:
+        elif units in si_units:
             self.f_emitter_coefficient = self.f_flow
 
 
-def convert(network):
-    """
+def get_conversion_factors(network: Network, units: str = "LPS") -> dict[str, float]:
+    """Computes the factors needed to convert a network from its current units to other units.
 
     Args:
-      network:
+      network: OOPNET network object
+      units: target flow units
 
     Returns:
+        dictionary mapping the Converter factor names (e.g., "f_flow") to the factors
+
+    """
+    source = Converter(network)
+    target = Converter(network, units=units)
+    return {
+        name: getattr(source, name) / getattr(target, name)
+        for name in Converter.__annotations__
+    }
+
+
+def _scale(components: list, attribute: str, factor: float):
+    """Multiplies an attribute of all passed objects with a factor.
+
+    The attribute values of all objects are gathered to a single array and scaled at once. Attributes holding lists
+    (e.g., multiple demands or curve values) are flattened for the multiplication and restored afterwards. None
+    values are skipped. The scaled values are assigned without triggering the modification hook of every single
+    component, instead the version of each affected ComponentRegistry is incremented once.
+
+    Args:
+      components: objects to be modified
+      attribute: name of the attribute to be scaled
+      factor: conversion factor
+
+    """
+    if factor == 1.0 or not components:
+        return
+    values = [getattr(component, attribute) for component in components]
+    flat = np.fromiter(
+        chain.from_iterable(
+            value if isinstance(value, list) else (value,) for value in values
+        ),
+        dtype=float,
+    )
+    scaled = (flat * factor).tolist()
+
+    modified = {}
+    position = 0
+    for component, value in zip(components, values):
+        if value is None:
+            position += 1
+            continue
+        if isinstance(value, list):
+            object.__setattr__(
+                component, attribute, scaled[position : position + len(value)]
+            )
+            position += len(value)
+        else:
+            object.__setattr__(component, attribute, scaled[position])
+            position += 1
+        if getattr(component, "_network_", None) is not None:
+            modified.setdefault(
+                (id(component._network_), component._registry_keys), component
+            )
+
+    for component in modified.values():
+        component._mark_modified(
+            attribute, geometry=attribute in component._geometry_attributes
+        )
+
+
+def _valve_setting_factor(valve, factors: dict[str, float]) -> float:
+    """Returns the conversion factor of a valve's setting based on the valve type."""
+    if isinstance(valve, (PRV, PSV, PBV)):
+        return factors["f_pressure"]
+    if isinstance(valve, FCV):
+        return factors["f_flow"]
+    return 1.0
+
+
+def _condition_factor(
+    obj, attribute: Optional[str], factors: dict[str, float]
+) -> float:
+    """Returns the conversion factor of a control or rule condition value based on the attribute it refers to."""
+    if attribute in ("DEMAND", "FLOW"):
+        return factors["f_flow"]
+    if attribute == "HEAD":
+        return factors["f_hydraulic_head"]
+    if attribute == "LEVEL":
+        return factors["f_elevation"]
+    if attribute == "PRESSURE":
+        return factors["f_pressure"]
+    if attribute == "SETTING":
+        return _valve_setting_factor(obj, factors)
+    return 1.0
 
+
+def _scale_by(items: list, factor_getter, attribute: str = "value"):
+    """Scales an attribute of items that each require an individual factor."""
+    groups = {}
+    for item in items:
+        if isinstance(getattr(item, attribute), float):
+            groups.setdefault(factor_getter(item), []).append(item)
+    for factor, group in groups.items():
+        _scale(group, attribute, factor)
+
+
+def _convert_curves(network: Network, factors: dict[str, float]):
+    """Converts curve values depending on what the curves are used for.
+
+    Curves used for more than one purpose are converted according to their first usage only.
     """
+    curves = {}
+
+    def collect(curve, x_factor, y_factor):
+        if curve is not None and id(curve) not in curves:
+            curves[id(curve)] = (curve, x_factor, y_factor)
+
+    for pump in get_pumps(network):
+        collect(pump.head, factors["f_flow"], factors["f_hydraulic_head"])
+    for energy in get_energy_entries(network):
+        if energy.keyword == "PUMP" and energy.parameter == "EFFICIENCY":
+            collect(energy.value, factors["f_flow"], 1.0)
+    for tank in get_tanks(network):
+        collect(tank.volumecurve, factors["f_elevation"], factors["f_volume"])
+    for valve in get_valves(network):
+        if isinstance(valve, GPV):
+            collect(
+                valve.headloss_curve, factors["f_flow"], factors["f_hydraulic_head"]
+            )
+
+    groups = {}
+    for curve, x_factor, y_factor in curves.values():
+        groups.setdefault((x_factor, y_factor), []).append(curve)
+    for (x_factor, y_factor), group in groups.items():
+        _scale(group, "xvalues", x_factor)
+        _scale(group, "yvalues", y_factor)
+
+
+def convert(network: Network, units: str = "LPS"):
+    """Converts all unit-bearing values of a network to other units.
+
+    Reading an EPANET input file converts the network to LPS. The same function can be used to convert a network to
+    any other EPANET flow unit (e.g., "GPM") before writing it. Patterns only contain dimensionless multipliers and are
+    therefore left unchanged.
+
+    Args:
+      network: OOPNET network object
+      units: target flow units
 
-    if network.options.units == "LPS":
+    """
+    if network.options.units == units:
         return
 
-    converter = Converter(network)
-
-    for j in get_junctions(network):
-        if j.emittercoefficient:
-            j.emittercoefficient *= converter.f_emitter_coefficient
-        if j.demand:
-            if isinstance(j.demand, list):
-                j.demand = [x * converter.f_demand for x in j.demand]
-            else:
-                j.demand *= converter.f_demand
-        if j.elevation:
-            j.elevation *= converter.f_elevation
-
-    for t in get_tanks(network):
-        t.diameter *= converter.f_diameter_tanks
-        t.elevation *= converter.f_elevation
-        t.initlevel *= converter.f_elevation
-        t.minlevel *= converter.f_elevation
-        t.maxlevel *= converter.f_elevation
-        t.minvolume *= converter.f_volume
-
-    for r in get_reservoirs(network):
-        r.elevation *= converter.f_elevation
-        r.head *= converter.f_hydraulic_head
-
-    for p in get_pipes(network):
-        p.diameter *= converter.f_diameter_pipes
-        p.length *= converter.f_length
-        p.roughness *= converter.f_roughness_coeff
-
-    network.options.units = "LPS"
+    f = get_conversion_factors(network, units)
+
+    junctions = get_junctions(network)
+    _scale(junctions, "emittercoefficient", f["f_emitter_coefficient"])
+    _scale(junctions, "demand", f["f_demand"])
+    _scale(junctions, "elevation", f["f_elevation"])
+
+    tanks = get_tanks(network)
+    _scale(tanks, "diameter", f["f_diameter_tanks"])
+    for attribute in ("elevation", "initlevel", "minlevel", "maxlevel"):
+        _scale(tanks, attribute, f["f_elevation"])
+    _scale(tanks, "minvolume", f["f_volume"])
+
+    reservoirs = get_reservoirs(network)
+    _scale(reservoirs, "elevation", f["f_elevation"])
+    _scale(reservoirs, "head", f["f_hydraulic_head"])
+
+    pipes = get_pipes(network)
+    _scale(pipes, "diameter", f["f_diameter_pipes"])
+    _scale(pipes, "length", f["f_length"])
+    _scale(pipes, "roughness", f["f_roughness_coeff"])
+    if network.reactions.orderwall == 1:
+        _scale(pipes, "reactionwall", f["f_reaction_coeff_wall"])
+        _scale([network.reactions], "globalwall", f["f_reaction_coeff_wall"])
+
+    _scale(get_pumps(network), "power", f["f_power"])
+
+    valves = get_valves(network)
+    _scale(valves, "diameter", f["f_diameter_pipes"])
+    _scale_by(
+        [v for v in valves if not isinstance(v, GPV)],
+        lambda v: _valve_setting_factor(v, f),
+        "setting",
+    )
+
+    _convert_curves(network, f)
+
+    # the pressure options are only used (and written) for pressure driven analyses
+    if network.options.demandmodel == "PDA":
+        _scale([network.options], "minimumpressure", f["f_pressure"])
+        _scale([network.options], "requiredpressure", f["f_pressure"])
+
+    controls = get_controls(network)
+    _scale_by(
+        [c.action for c in controls if c.action is not None],
+        lambda a: _valve_setting_factor(a.object, f),
+    )
+    _scale_by(
+        [c.condition for c in controls if c.condition is not None],
+        lambda c: (
+            f["f_elevation"]
+            if isinstance(c.object, Tank)
+            else f["f_pressure"] if isinstance(c.object, Junction) else 1.0
+        ),
+    )
+
+    _scale_by(
+        [condition for rule in get_rules(network) for condition in rule.condition],
+        lambda c: _condition_factor(c.object, c.attribute, f),
+    )
+
+    network.options.units = units
@@ -1 +1,2 @@
 from .report import SimulationReport
+from .collection import ReportCollection
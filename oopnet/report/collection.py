@@ -0,0 +1,200 @@
+from __future__ import annotations
+from typing import Hashable, Iterable, Optional, Union
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from xarray import DataArray
+
+from oopnet.report.report import SimulationReport
+from oopnet.simulator.result_buffer import ResultBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class ReportCollection:
+    """Results of many simulation runs (e.g., of a Monte Carlo simulation) stored as (scenario, time, id, vars) arrays.
+
+    All reports added to the collection have to contain the same variables, elements and time steps. If the number of
+    scenarios is known in advance, the memory for all scenarios is allocated at once. Otherwise, the collection doubles
+    its capacity (by at least chunksize scenarios) whenever it is full. If a directory is passed, the results are stored in memory-mapped files in this
+    directory instead of RAM.
+
+    Example:
+      >>> collection = ReportCollection(n_scenarios=100)
+      >>> for _ in range(100):
+      ...     collection.append(network.run())
+      >>> collection.mean("Pressure")
+
+    Args:
+      n_scenarios: number of scenarios to allocate memory for
+      chunksize: minimum number of scenarios the collection grows by if more reports are added than allocated
+      directory: directory for out-of-core storage
+
+    """
+
+    def __init__(
+        self,
+        n_scenarios: Optional[int] = None,
+        chunksize: int = 64,
+        directory: Optional[str] = None,
+    ):
+        self.n_scenarios = n_scenarios
+        self.chunksize = chunksize
+        self.directory = directory
+        self.scenarios: list[Hashable] = []
+        self._buffers: dict[str, Optional[ResultBuffer]] = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_reports(
+        cls, reports: Iterable[SimulationReport], **kwargs
+    ) -> ReportCollection:
+        """Creates a collection from existing simulation reports.
+
+        Args:
+          reports: simulation reports
+          **kwargs: keyword arguments passed to ReportCollection
+
+        Returns:
+          ReportCollection object
+
+        """
+        reports = list(reports)
+        kwargs.setdefault("n_scenarios", len(reports))
+        collection = cls(**kwargs)
+        for report in reports:
+            collection.append(report)
+        return collection
+
+    def __len__(self) -> int:
+        return len(self.scenarios)
+
+    def _create_buffer(self, kind: str, template: Optional[DataArray]):
+        if template is None:
+            self._buffers[kind] = None
+            return
+        capacity = self.n_scenarios or self.chunksize
+        self._buffers[kind] = ResultBuffer(
+            template, capacity, self.chunksize, self.directory, kind
+        )
+
+    def append(self, report: SimulationReport, scenario: Optional[Hashable] = None):
+        """Adds the results of a simulation run to the collection.
+
+        Args:
+          report: simulation report
+          scenario: scenario label, defaults to the scenario's index
+
+        """
+        if not self._buffers:
+            self._create_buffer("nodes", report.nodes)
+            self._create_buffer("links", report.links)
+        for kind, buffer in self._buffers.items():
+            array = getattr(report, kind)
+            if (buffer is None) != (array is None):
+                raise ValueError(
+                    f"Simulation report {'lacks' if array is None else 'contains'} {kind[:-1]} results."
+                )
+            if buffer is not None:
+                buffer.check(array)
+
+        index = len(self.scenarios)
+        for kind, buffer in self._buffers.items():
+            if buffer is not None:
+                buffer.set(index, getattr(report, kind))
+        self.scenarios.append(index if scenario is None else scenario)
+
+    def _get_array(self, kind: str) -> Optional[DataArray]:
+        buffer = self._buffers.get(kind)
+        if buffer is None:
+            return None
+        return DataArray(
+            buffer.data[: len(self.scenarios)],
+            coords={"scenario": self.scenarios, **buffer.coords},
+            dims=("scenario", *buffer.dims),
+        )
+
+    @property
+    def nodes(self) -> Optional[DataArray]:
+        """Node results of all scenarios with the dimensions (scenario, time, id, vars)."""
+        return self._get_array("nodes")
+
+    @property
+    def links(self) -> Optional[DataArray]:
+        """Link results of all scenarios with the dimensions (scenario, time, id, vars)."""
+        return self._get_array("links")
+
+    def get(self, var: str) -> DataArray:
+        """Returns a variable of all scenarios.
+
+        Node variables are preferred over Link variables if both were reported (e.g., "Quality").
+
+        Args:
+          var: variable name (e.g., "Pressure")
+
+        Returns:
+          DataArray with the dimensions (scenario, time, id)
+
+        """
+        for array in (self.nodes, self.links):
+            if array is not None and var in array["vars"].values:
+                return array.sel(vars=var)
+        raise KeyError(f"Variable {var!r} not found in the simulation results.")
+
+    def _aggregate(
+        self, var: str, name: str, function
+    ) -> Union[pd.Series, pd.DataFrame]:
+        array = self.get(var)
+        values = function(array.values)
+        result = DataArray(
+            values,
+            coords={dim: array[dim] for dim in array.dims[1:]},
+            dims=array.dims[1:],
+        ).to_pandas()
+        result.name = f"{var} ({name})"
+        return result
+
+    def mean(self, var: str) -> Union[pd.Series, pd.DataFrame]:
+        """Mean of a variable across all scenarios.
+
+        Args:
+          var: variable name (e.g., "Pressure")
+
+        Returns:
+          Pandas Series (single period) or DataFrame (extended period) indexed like the SimulationReport properties
+
+        """
+        return self._aggregate(var, "mean", lambda data: np.nanmean(data, axis=0))
+
+    def std(self, var: str, ddof: int = 1) -> Union[pd.Series, pd.DataFrame]:
+        """Standard deviation of a variable across all scenarios.
+
+        Args:
+          var: variable name (e.g., "Pressure")
+          ddof: delta degrees of freedom
+
+        Returns:
+          Pandas Series (single period) or DataFrame (extended period) indexed like the SimulationReport properties
+
+        """
+        return self._aggregate(
+            var, "std", lambda data: np.nanstd(data, axis=0, ddof=ddof)
+        )
+
+    def quantile(self, var: str, q: float) -> Union[pd.Series, pd.DataFrame]:
+        """Quantile of a variable across all scenarios.
+
+        Args:
+          var: variable name (e.g., "Pressure")
+          q: quantile between 0 and 1
+
+        Returns:
+          Pandas Series (single period) or DataFrame (extended period) indexed like the SimulationReport properties
+
+        """
+        return self._aggregate(
+            var, f"q{q:g}", lambda data: np.nanquantile(data, q, axis=0)
+        )
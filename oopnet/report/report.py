@@ -1,24 +1,46 @@
+from __future__ import annotations
 import datetime
-from typing import Optional, Union, Type, Callable
+from typing import Optional, Union, Type, Callable, Iterable
 import logging
 
 import pandas as pd
-from xarray import DataArray
+import xarray as xr
+from xarray import DataArray, Dataset
 
-from oopnet.elements.options_and_reporting import Reportprecision
+from oopnet.elements.options_and_reporting import Reportprecision, Times
+from oopnet.report.statistics import compute_statistics, resample_results
+from oopnet.report.storage import save_report, load_report
 from oopnet.simulator.binaryfile_reader import BinaryFileReader
-from oopnet.simulator.reportfile_reader import ReportFileReader
+from oopnet.simulator.reportfile_reader import ReportFileReader, ENERGY_COLUMNS
 
 logger = logging.getLogger(__name__)
 
 
+def _copy_on_write() -> bool:
+    """Checks if pandas copies the data of shallow copies on modification (always enabled since pandas 3.0)."""
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
 # todo: add documentation
 class SimulationReport:
     """Class for storing stimulation results.
 
+    The result arrays are sorted by time and ID once when the report is created. The properties (pressure, flow, ...)
+    are computed on first access and cached afterwards, subsequent accesses return a copy of the cached data without
+    sorting it again. Modifying the returned object never changes the cache. If pandas' copy-on-write mode is enabled
+    (the default since pandas 3.0), the copy shares the cached data until it is modified.
+
+    If a directory is passed, the results of extended period simulations are streamed to memory-mapped files in this
+    directory while the report file is read. The arrays nodes and links are then backed by these files and only the
+    parts that are accessed are loaded into memory. Use resample, node_statistics and link_statistics with a chunksize
+    to aggregate such results chunk by chunk.
+
     Attributes:
         nodes: Node results
         links: Link results
+        warnings: warnings EPANET wrote to the report file (e.g., negative pressures or disconnected Nodes) with the columns "time", "kind", "element" and "message"
     """
 
     nodes: DataArray
@@ -32,28 +54,243 @@ class SimulationReport:
         reader: Union[
             Type[BinaryFileReader], Type[ReportFileReader]
         ] = ReportFileReader,
+        directory: Optional[str] = None,
+        times: Optional[Times] = None,
+        relative_time: bool = False,
     ):
         """SimulationReport init method.
 
         Args:
             filename: name of EPANET input file be simulated
-            startdatetime:
+            startdatetime: start of the simulation, defaults to 2016-01-01 00:00
             reader: specifies whether the report or the binary file created by EPANET are read
+            directory: directory for storing the results in memory-mapped files instead of RAM
+            times: Times used for the simulation, the time coordinate is generated from the report start and time step
+            relative_time: if True, the time coordinate is the time since the start of the simulation (timedelta64)
 
         """
         logger.debug("Creating report.")
-        self.nodes, self.links = reader(filename, precision, startdatetime)
+        nodes, links, tables = reader(
+            filename,
+            precision,
+            startdatetime,
+            directory=directory,
+            times=times,
+            relative_time=relative_time,
+        )
+        self._set_results(nodes, links, tables)
+
+    def _set_results(
+        self,
+        nodes: Optional[DataArray],
+        links: Optional[DataArray],
+        tables: Optional[dict[str, pd.DataFrame]] = None,
+    ):
+        self.nodes = self._sort(nodes)
+        self.links = self._sort(links)
+        self._tables = tables or {}
+        self._cache = {}
+
+    def _get_table(self, name: str, columns: list[str]) -> pd.DataFrame:
+        if name not in self._tables:
+            return pd.DataFrame(columns=columns)
+        return self._tables[name]
+
+    @property
+    def warnings(self) -> pd.DataFrame:
+        """Warnings EPANET wrote to the report file.
+
+        Returns:
+          Pandas DataFrame with the columns "time", "kind" (e.g., "negative pressures", "unbalanced" or "disconnected"), "element" and "message"
+
+        """
+        return self._get_table("warnings", ["time", "kind", "element", "message"])
+
+    @property
+    def energy(self) -> pd.DataFrame:
+        """Pump energy usage (requires the Network's report setting energy to be 'YES').
+
+        The columns are the percentage of time the Pump was online ("Utilization"), the average efficiency in %
+        ("Efficiency"), the energy per volume pumped in kWh/m³ or kWh/Mgal depending on the flow units ("Energy"), the
+        average and peak power in kW ("Average Power" and "Peak Power") and the average cost per day ("Cost"). The
+        demand charge and the total cost of the simulation are stored in the DataFrame attributes "demand_charge" and
+        "total_cost".
+
+        Returns:
+          Pandas DataFrame indexed by the Pump IDs
+
+        """
+        return self._get_table("energy", ENERGY_COLUMNS)
+
+    @property
+    def status_events(self) -> pd.DataFrame:
+        """Status changes of Pumps, Valves and Pipes (requires the Network's report setting status to be 'YES').
+
+        Example:
+          Times Pump P-1 was switched:
+
+          >>> events = rpt.status_events
+          >>> events[(events["type"] == "Pump") & (events["id"] == "P-1")]
+
+        Returns:
+          Pandas DataFrame with the columns "time", "type" (e.g., "Pump" or "PRV"), "id", "status" (new status or None for messages like "changed by Tank T1 control") and "message"
+
+        """
+        return self._get_table(
+            "status_events", ["time", "type", "id", "status", "message"]
+        )
+
+    @property
+    def tank_events(self) -> pd.DataFrame:
+        """Filling, emptying and closing events of Tanks and Reservoirs (requires the Network's report setting status to be 'YES').
+
+        Returns:
+          Pandas DataFrame with the columns "time", "type" ("Tank" or "Reservoir"), "id", "status" (e.g., "filling", "emptying" or "closed") and "level" (water level at the time of the event)
+
+        """
+        return self._get_table("tank_events", ["time", "type", "id", "status", "level"])
+
+    @classmethod
+    def from_arrays(
+        cls, nodes: Optional[DataArray], links: Optional[DataArray]
+    ) -> SimulationReport:
+        """Creates a SimulationReport from already existing result arrays.
+
+        Args:
+          nodes: Node results with the dimensions (time, id, vars) or (id, vars)
+          links: Link results with the dimensions (time, id, vars) or (id, vars)
+
+        Returns:
+          SimulationReport object
+
+        """
+        report = cls.__new__(cls)
+        report._set_results(nodes, links)
+        return report
+
+    def save(
+        self,
+        path: str,
+        format: str = "netcdf",
+        chunks: Optional[dict[str, int]] = None,
+        complevel: int = 4,
+    ):
+        """Saves the simulation results to disk.
+
+        Supported formats are "netcdf" (single compressed file, compression requires netCDF4 or h5netcdf), "zarr"
+        (chunked directory, requires zarr) and "parquet" (directory with one file for Nodes and Links, requires
+        pyarrow).
+
+        Args:
+          path: file (NetCDF) or directory (Zarr, Parquet) path
+          format: storage format
+          chunks: chunk sizes along the dimensions "time" and "id" (e.g., {"time": 24, "id": 500})
+          complevel: compression level for NetCDF files
+
+        """
+        save_report(self, path, format, chunks, complevel)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        format: Optional[str] = None,
+        variables: Optional[list[str]] = None,
+        nodes: Optional[list[str]] = None,
+        links: Optional[list[str]] = None,
+        start: Optional[Union[datetime.datetime, datetime.timedelta, str]] = None,
+        end: Optional[Union[datetime.datetime, datetime.timedelta, str]] = None,
+        lazy: bool = False,
+    ) -> SimulationReport:
+        """Loads simulation results saved with SimulationReport.save.
+
+        Only the requested variables, elements and time steps are read from disk. If lazy is True, the NetCDF or Zarr
+        file is kept open and the data is only read when it is accessed (requires dask).
+
+        Example:
+          >>> rpt = SimulationReport.load("results.nc", variables=["Pressure"], nodes=["J-1", "J-2"])
+
+        Args:
+          path: file (NetCDF) or directory (Zarr, Parquet) path
+          format: storage format, detected from the path if None
+          variables: variables to be loaded (e.g., ["Pressure", "Flow"]), defaults to all variables
+          nodes: IDs of the Nodes to be loaded, defaults to all Nodes
+          links: IDs of the Links to be loaded, defaults to all Links
+          start: first time step to be loaded, a timedelta for reports with a relative time axis
+          end: last time step to be loaded, a timedelta for reports with a relative time axis
+          lazy: keep the data on disk until it is accessed
+
+        Returns:
+          SimulationReport object
+
+        """
+        node_array, link_array = load_report(
+            path, format, variables, nodes, links, start, end, lazy
+        )
+        return cls.from_arrays(node_array, link_array)
+
+    def time_window(
+        self,
+        start: Union[None, str, datetime.datetime, datetime.timedelta] = None,
+        end: Union[None, str, datetime.datetime, datetime.timedelta] = None,
+    ) -> SimulationReport:
+        """Returns the results between two time steps (both included).
+
+        The first and last time step are found by binary search in the sorted time coordinate. The returned report
+        shares the data with this report (no copies are made, memory-mapped results stay on disk). Warnings, events
+        and the energy usage table refer to the whole simulation.
+
+        Example:
+          >>> rpt.time_window("2016-01-02", "2016-01-02 12:00")
+          >>> relative_rpt.time_window(datetime.timedelta(hours=6))
+
+        Args:
+          start: first time step, defaults to the first reported time step
+          end: last time step, defaults to the last reported time step
+
+        Returns:
+          SimulationReport object
+
+        """
+        arrays = []
+        for array in (self.nodes, self.links):
+            if array is not None and "time" in array.dims:
+                times = array.indexes["time"]
+                first = 0 if start is None else times.searchsorted(start, "left")
+                last = len(times) if end is None else times.searchsorted(end, "right")
+                array = array.isel(time=slice(first, last))
+            arrays.append(array)
+        report = self.from_arrays(*arrays)
+        report._tables = self._tables
+        return report
 
     @staticmethod
+    def _sort(array: Optional[DataArray]) -> Optional[DataArray]:
+        """Sorts a result array by its time and id dimensions.
+
+        Dimensions that are already sorted are skipped, so arrays backed by files are not loaded into memory.
+        """
+        if array is None:
+            return None
+        for dim in ("time", "id"):
+            if dim in array.dims and not array.indexes[dim].is_monotonic_increasing:
+                array = array.sortby(dim)
+        return array
+
     def _get(
+        self,
         array: DataArray,
         var: str,
         unit: Optional[str] = None,
         calc: Optional[Callable] = None,
     ):
-        data = array.sel(vars=var).to_pandas().sort_index()
-        if calc:
-            data = calc(data)
+        key = (id(array), var, unit)
+        if key not in self._cache:
+            data = array.sel(vars=var).to_pandas()
+            if calc:
+                data = calc(data)
+            self._cache[key] = data
+        data = self._cache[key].copy(deep=not _copy_on_write())
         data.name = f"{var} ({unit})" if unit else var
         return data
 
@@ -175,8 +412,7 @@ class SimulationReport:
         """
 
         def convert(data):
-            l = self.length
-            l = l.replace(0, 1000.0)
+            l = self.length.replace(0, 1000.0)
             return l * data / 1000.0
 
         return self._get(self.links, "Headloss", "m", convert)
@@ -244,3 +480,126 @@ class SimulationReport:
 
         """
         return self._get_element_info(self.links, id)
+
+    def to_dataset(self) -> Dataset:
+        """Exposes all simulation results as a single xarray Dataset.
+
+        Every reported variable becomes a data variable of the Dataset. Node results use the dimension "node" and link
+        results the dimension "link" instead of "id". Variables reported for both Nodes and Links (e.g., "Quality") are
+        prefixed with "Node " and "Link ". The original variable name is stored in the attribute "variable".
+
+        Returns:
+          xarray Dataset containing the Node and Link results
+
+        """
+        datasets = {}
+        for kind, array in (("Node", self.nodes), ("Link", self.links)):
+            if array is not None:
+                dataset = array.rename(id=kind.lower()).to_dataset(dim="vars")
+                for var in dataset.data_vars:
+                    dataset[var].attrs["variable"] = var
+                datasets[kind] = dataset
+        if len(datasets) == 2:
+            shared = set(datasets["Node"].data_vars) & set(datasets["Link"].data_vars)
+            for kind, dataset in datasets.items():
+                datasets[kind] = dataset.rename(
+                    {var: f"{kind} {var}" for var in shared}
+                )
+        return xr.merge(datasets.values())
+
+    def node_statistics(
+        self,
+        variables: Optional[list[str]] = None,
+        percentiles: Iterable[float] = (),
+        below: Optional[dict[str, float]] = None,
+        chunksize: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Computes time series statistics of the Node results.
+
+        Example:
+          Minimum, maximum, mean and 5th percentile pressure and the hours with a pressure below 20 m:
+
+          >>> rpt.node_statistics(["Pressure"], percentiles=[5], below={"Pressure": 20.0})
+
+        Args:
+          variables: variables to be evaluated, defaults to all reported variables
+          percentiles: percentiles to be computed (values between 0 and 100)
+          below: dictionary mapping variables to thresholds, the time (in hours) the variable is below the threshold is computed
+            as the statistic "time_below_<variable>_<threshold>" (e.g., "time_below_Pressure_20")
+          chunksize: number of Nodes evaluated at once
+
+        Returns:
+          tidy pandas DataFrame with the columns "id", "variable", "statistic" and "value"
+
+        """
+        return compute_statistics(
+            self.nodes, variables, percentiles, below, chunksize=chunksize
+        )
+
+    def link_statistics(
+        self,
+        variables: Optional[list[str]] = None,
+        percentiles: Iterable[float] = (),
+        below: Optional[dict[str, float]] = None,
+        reversals: Optional[list[str]] = None,
+        chunksize: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Computes time series statistics of the Link results.
+
+        Example:
+          Peak velocities and the number of flow reversals:
+
+          >>> rpt.link_statistics(["Velocity"], reversals=["Flow"])
+
+        Args:
+          variables: variables to be evaluated, defaults to all reported variables
+          percentiles: percentiles to be computed (values between 0 and 100)
+          below: dictionary mapping variables to thresholds, the time (in hours) the variable is below the threshold is computed
+          reversals: variables whose sign changes are counted (e.g., ["Flow"] for flow reversals)
+          chunksize: number of Links evaluated at once
+
+        Returns:
+          tidy pandas DataFrame with the columns "id", "variable", "statistic" and "value"
+
+        """
+        return compute_statistics(
+            self.links, variables, percentiles, below, reversals, chunksize
+        )
+
+    def resample(
+        self,
+        var: str,
+        freq: str = "1D",
+        how: str = "min",
+        chunksize: Optional[int] = None,
+        scheduler: str = "synchronous",
+        workers: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Aggregates a variable of an extended period simulation to fixed time intervals.
+
+        The results are processed in chunks of whole intervals, so results stored on disk (see the directory argument
+        of Network.run and SimulationReport.load) are never loaded into memory at once.
+
+        Example:
+          Daily minimum pressures computed by four threads:
+
+          >>> rpt.resample("Pressure", "1D", "min", scheduler="threads", workers=4)
+
+        Args:
+          var: variable name (e.g., "Pressure"), Node variables are preferred over Link variables
+          freq: fixed pandas frequency string (e.g., "1D", "6h" or "15min")
+          how: reduction ("min", "max", "mean" or "sum")
+          chunksize: minimum number of time steps loaded at once
+          scheduler: "synchronous", "threads" or "processes"
+          workers: number of threads or processes, defaults to the number of CPUs
+
+        Returns:
+          pandas DataFrame with one row per interval and one column per element
+
+        """
+        for array in (self.nodes, self.links):
+            if array is not None and var in array["vars"].values:
+                return resample_results(
+                    array, var, freq, how, chunksize, scheduler, workers
+                )
+        raise KeyError(f"Variable {var!r} not found in the simulation results.")
@@ -0,0 +1,286 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Optional
+import collections
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from xarray import DataArray
+
+logger = logging.getLogger(__name__)
+
+SCHEDULERS = ("synchronous", "threads", "processes")
+REDUCTIONS = ("min", "max", "mean", "sum")
+DEFAULT_TIME_CHUNKS = 96
+
+
+def _step_durations(array: DataArray) -> np.ndarray:
+    """Calculates the duration (in hours) each reported time step is valid for.
+
+    Every time step is valid until the next one. The last time step is assigned the same duration as the one before.
+    Reports without a time dimension are treated as a single time step with a duration of 0 hours.
+
+    Args:
+      array: result array
+
+    Returns:
+        array containing the durations in hours
+
+    """
+    if "time" not in array.dims or array.sizes["time"] < 2:
+        return np.zeros(array.sizes.get("time", 1))
+    times = array["time"].values
+    steps = np.diff(times) / np.timedelta64(1, "h")
+    return np.append(steps, steps[-1])
+
+
+def _chunk_statistics(
+    data: np.ndarray,
+    durations: np.ndarray,
+    variables: list[str],
+    percentiles: Iterable[float],
+    below: dict[str, float],
+    reversals: list[str],
+) -> dict[str, np.ndarray]:
+    """Computes all statistics of a (time, id, vars) block at once.
+
+    Returns:
+        dictionary mapping statistic names to arrays with the shape (id, vars)
+
+    """
+    stats = {
+        "min": np.nanmin(data, axis=0),
+        "max": np.nanmax(data, axis=0),
+        "mean": np.nanmean(data, axis=0),
+    }
+    percentiles = list(percentiles)
+    if percentiles:
+        values = np.nanpercentile(data, percentiles, axis=0)
+        for percentile, value in zip(percentiles, values):
+            stats[f"p{percentile:g}"] = value
+
+    for var, threshold in below.items():
+        index = variables.index(var)
+        result = np.full(data.shape[1:], np.nan)
+        result[:, index] = (data[:, :, index] < threshold).T @ durations
+        stats[f"time_below_{var}_{threshold:g}"] = result
+
+    if reversals:
+        result = np.full(data.shape[1:], np.nan)
+        for var in reversals:
+            index = variables.index(var)
+            signs = np.sign(data[:, :, index])
+            result[:, index] = (signs[1:] * signs[:-1] < 0).sum(axis=0)
+        stats["reversals"] = result
+
+    return stats
+
+
+def compute_statistics(
+    array: DataArray,
+    variables: Optional[list[str]] = None,
+    percentiles: Iterable[float] = (),
+    below: Optional[dict[str, float]] = None,
+    reversals: Optional[list[str]] = None,
+    chunksize: Optional[int] = None,
+) -> pd.DataFrame:
+    """Computes time series statistics of simulation results.
+
+    All requested statistics are computed in a single vectorized pass over the (time, id, vars) array. If a chunksize
+    is passed, the array is processed in blocks of chunksize elements along the id dimension. This limits the memory
+    needed for intermediate results and only loads one block at a time from lazy (e.g., dask backed) arrays.
+
+    Args:
+      array: Node or Link result array
+      variables: variables to be evaluated (e.g., ["Pressure", "Head"]), defaults to all reported variables
+      percentiles: percentiles to be computed (values between 0 and 100)
+      below: dictionary mapping variables to thresholds, the time (in hours) the variable is below the threshold is computed
+        as the statistic "time_below_<variable>_<threshold>" (e.g., "time_below_Pressure_20")
+      reversals: variables whose sign changes are counted (e.g., ["Flow"] for flow reversals)
+      chunksize: number of elements evaluated at once
+
+    Returns:
+        tidy pandas DataFrame with the columns "id", "variable", "statistic" and "value"
+
+    """
+    below = below or {}
+    reversals = reversals or []
+    if variables is None:
+        variables = [str(var) for var in array["vars"].values]
+    else:
+        variables = list(variables)
+    for var in [*below, *reversals]:
+        if var not in variables:
+            variables.append(var)
+
+    array = array.sel(vars=variables)
+    if "time" not in array.dims:
+        array = array.expand_dims("time")
+    array = array.transpose("time", "id", "vars")
+    durations = _step_durations(array)
+
+    n_elements = array.sizes["id"]
+    chunksize = chunksize or n_elements
+    frames = []
+    for start in range(0, n_elements, chunksize):
+        block = array.isel(id=slice(start, start + chunksize))
+        logger.debug(
+            f"Computing statistics for elements {start} to {start + block.sizes['id']}"
+        )
+        stats = _chunk_statistics(
+            np.asarray(block.values, dtype=float),
+            durations,
+            variables,
+            percentiles,
+            below,
+            reversals,
+        )
+        ids = block["id"].values
+        for name, values in stats.items():
+            frame = pd.DataFrame(values, index=ids, columns=variables)
+            frame = frame.rename_axis(index="id", columns="variable").stack()
+            frames.append(frame.dropna().rename(name))
+
+    if not frames:
+        return pd.DataFrame(columns=["id", "variable", "statistic", "value"])
+    result = pd.concat(
+        frames, keys=[frame.name for frame in frames], names=["statistic"]
+    )
+    result = result.rename("value").reset_index()
+    return result[["id", "variable", "statistic", "value"]]
+
+
+def _reduce_bins(values: np.ndarray, offsets: np.ndarray, how: str) -> np.ndarray:
+    """Reduces consecutive time steps of a (time, id) block to one row per bin.
+
+    Args:
+      values: (time, id) block
+      offsets: index of the first time step of every bin in the block
+      how: reduction ("min", "max", "mean" or "sum"), NaN values are ignored
+
+    Returns:
+        array with the shape (bins, id)
+
+    """
+    if how == "min":
+        return np.fmin.reduceat(values, offsets, axis=0)
+    if how == "max":
+        return np.fmax.reduceat(values, offsets, axis=0)
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), offsets, axis=0)
+    if how == "sum":
+        return sums
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / np.add.reduceat(valid, offsets, axis=0)
+
+
+def _time_chunks(
+    bin_starts: np.ndarray, n_steps: int, chunksize: int
+) -> list[tuple[int, int, np.ndarray]]:
+    """Groups whole bins into chunks of at least chunksize time steps.
+
+    Returns:
+        list of (first time step, last time step + 1, bin offsets relative to the first time step) tuples
+
+    """
+    chunks = []
+    bounds = np.append(bin_starts, n_steps)
+    first = 0
+    for last in range(1, len(bounds)):
+        if bounds[last] - bounds[first] >= chunksize or last == len(bounds) - 1:
+            start = bounds[first]
+            chunks.append((start, bounds[last], bin_starts[first:last] - start))
+            first = last
+    return chunks
+
+
+def resample_results(
+    array: DataArray,
+    var: str,
+    freq: str = "1D",
+    how: str = "min",
+    chunksize: Optional[int] = None,
+    scheduler: str = "synchronous",
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Aggregates the results of an extended period simulation to fixed time intervals (e.g., daily minimum pressures).
+
+    The time steps are grouped into chunks of whole intervals and only one chunk per worker is loaded at a time. This
+    keeps memory use low for results that are backed by files (memory-mapped reports, lazily loaded NetCDF or Zarr
+    files, dask arrays). The chunks are reduced one after another ("synchronous"), in a thread pool ("threads") or in a
+    process pool ("processes"). Threads load and reduce chunks in parallel, processes receive chunks loaded by the main
+    process.
+
+    Args:
+      array: Node or Link result array with a time dimension
+      var: variable to be aggregated (e.g., "Pressure")
+      freq: fixed pandas frequency string (e.g., "1D", "6h" or "15min")
+      how: reduction ("min", "max", "mean" or "sum"), NaN values are ignored
+      chunksize: minimum number of time steps loaded at once, defaults to 96
+      scheduler: "synchronous", "threads" or "processes"
+      workers: number of threads or processes, defaults to the number of CPUs
+
+    Returns:
+        pandas DataFrame with one row per interval (labelled by its start) and one column per element
+
+    """
+    if how not in REDUCTIONS:
+        raise ValueError(
+            f"Unknown reduction {how!r}, use one of {', '.join(REDUCTIONS)}."
+        )
+    if scheduler not in SCHEDULERS:
+        raise ValueError(
+            f"Unknown scheduler {scheduler!r}, use one of {', '.join(SCHEDULERS)}."
+        )
+    if "time" not in array.dims:
+        raise ValueError(
+            "Only results of extended period simulations can be resampled."
+        )
+
+    data = array.sel(vars=var).transpose("time", "id")
+    labels = pd.Index(data["time"].values).floor(freq)
+    bin_starts = np.flatnonzero(np.append(True, labels[1:] != labels[:-1]))
+    chunks = _time_chunks(
+        bin_starts, data.sizes["time"], chunksize or DEFAULT_TIME_CHUNKS
+    )
+    logger.debug(
+        f"Resampling {var} to {len(bin_starts)} intervals in {len(chunks)} chunks"
+    )
+
+    def load(start: int, stop: int) -> np.ndarray:
+        return np.asarray(data.isel(time=slice(start, stop)).values, dtype=float)
+
+    def reduce(chunk: tuple[int, int, np.ndarray]) -> np.ndarray:
+        start, stop, offsets = chunk
+        return _reduce_bins(load(start, stop), offsets, how)
+
+    if scheduler == "synchronous":
+        results = [reduce(chunk) for chunk in chunks]
+    elif scheduler == "threads":
+        with ThreadPoolExecutor(workers) as executor:
+            results = list(executor.map(reduce, chunks))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            results = _stream_to_processes(executor, chunks, load, how, workers)
+
+    values = np.concatenate(results) if results else np.empty((0, data.sizes["id"]))
+    frame = pd.DataFrame(values, index=labels[bin_starts], columns=data["id"].values)
+    frame.index.name = "time"
+    frame.columns.name = "id"
+    return frame
+
+
+def _stream_to_processes(
+    executor: Executor, chunks: list, load, how: str, workers: Optional[int]
+) -> list[np.ndarray]:
+    """Submits chunks to a process pool while keeping at most two chunks per worker in memory."""
+    window = 2 * (workers or os.cpu_count() or 1)
+    pending = collections.deque()
+    results = []
+    for start, stop, offsets in chunks:
+        if len(pending) >= window:
+            results.append(pending.popleft().result())
+        pending.append(executor.submit(_reduce_bins, load(start, stop), offsets, how))
+    results.extend(future.result() for future in pending)
+    return results
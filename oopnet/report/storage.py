@@ -0,0 +1,329 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional, Union
+import datetime
+import importlib.util
+import logging
+import os
+
+import pandas as pd
+import xarray as xr
+from xarray import DataArray, Dataset
+
+if TYPE_CHECKING:
+    from oopnet.report.report import SimulationReport
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("netcdf", "zarr", "parquet")
+DEFAULT_CHUNKS = {"time": 96, "id": 1024}
+
+
+def _require(module: str, format: str):
+    """Raises an ImportError if an optional dependency needed for a storage format is missing."""
+    if importlib.util.find_spec(module) is None:
+        raise ImportError(
+            f"Storing simulation reports in the {format} format requires the optional dependency {module!r}. "
+            f"Install it with 'pip install oopnet[{format}]' or 'pip install {module}'."
+        )
+
+
+def _netcdf_engine() -> Optional[str]:
+    """Returns the first available netCDF4 engine supporting compression or None if only scipy is available."""
+    for engine, module in (("netcdf4", "netCDF4"), ("h5netcdf", "h5netcdf")):
+        if importlib.util.find_spec(module) is not None:
+            return engine
+    return None
+
+
+def _chunk_shape(variable: DataArray, chunks: dict[str, int]) -> tuple[int, ...]:
+    """Translates time and id chunk sizes to the chunk shape of a variable."""
+    shape = []
+    for dim in variable.dims:
+        size = chunks["time"] if dim == "time" else chunks["id"]
+        shape.append(max(1, min(size, variable.sizes[dim])))
+    return tuple(shape)
+
+
+def _detect_format(path: str) -> str:
+    """Detects the storage format of a saved report."""
+    if os.path.isdir(path):
+        if os.path.exists(os.path.join(path, "nodes.parquet")) or os.path.exists(
+            os.path.join(path, "links.parquet")
+        ):
+            return "parquet"
+        return "zarr"
+    return "netcdf"
+
+
+def _dataset_to_array(
+    dataset: Dataset,
+    kind: str,
+    variables: Optional[list[str]],
+    ids: Optional[list[str]],
+    start: Optional[Union[datetime.datetime, datetime.timedelta, str]],
+    end: Optional[Union[datetime.datetime, datetime.timedelta, str]],
+    lazy: bool = False,
+) -> Optional[DataArray]:
+    """Extracts a Node or Link result array from a Dataset created by SimulationReport.to_dataset.
+
+    The Dataset is restricted to the requested variables, element IDs and time window before any data is loaded.
+
+    Args:
+      dataset: Dataset opened from disk
+      kind: "node" or "link"
+      variables: variables to be loaded, None loads all variables
+      ids: element IDs to be loaded, None loads all elements
+      start: first time step to be loaded
+      end: last time step to be loaded
+      lazy: if True, the data is not loaded
+
+    Returns:
+        result array with the dimensions (time, id, vars) or None if no data was selected
+
+    """
+    names = {
+        var: dataset[var].attrs.get("variable", var)
+        for var in dataset.data_vars
+        if kind in dataset[var].dims
+    }
+    if variables is not None:
+        names = {var: name for var, name in names.items() if name in variables}
+    if not names:
+        return None
+
+    subset = dataset[list(names)]
+    if ids is not None:
+        available = set(subset[kind].values)
+        subset = subset.sel({kind: [id for id in ids if id in available]})
+    if "time" in subset.dims and (start is not None or end is not None):
+        subset = subset.sel(time=slice(start, end))
+    if not lazy:
+        subset = subset.load()
+    subset = subset.rename(names).rename({kind: "id"})
+    array = subset.to_dataarray(dim="vars")
+    dims = [dim for dim in ("time", "id", "vars") if dim in array.dims]
+    return array.transpose(*dims)
+
+
+def _time_chunks(array: DataArray, size: int):
+    """Yields consecutive parts of an array with at most size time steps each (the array itself if it has no time)."""
+    if "time" not in array.dims:
+        yield array
+        return
+    for start in range(0, array.sizes["time"], size):
+        yield array.isel(time=slice(start, start + size))
+
+
+def _save_parquet(report: SimulationReport, path: str, chunks: dict[str, int]):
+    """Writes the result arrays to Parquet files one chunk of time steps after another.
+
+    Only one chunk is converted to a DataFrame at a time, so memory-mapped results are never loaded completely.
+
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(path, exist_ok=True)
+    row_group_size = chunks["time"] * chunks["id"]
+    for name, array in (("nodes", report.nodes), ("links", report.links)):
+        if array is None:
+            continue
+        writer = None
+        try:
+            for chunk in _time_chunks(array, chunks["time"]):
+                frame = chunk.to_dataset(dim="vars").to_dataframe().reset_index()
+                if writer is None:
+                    table = pa.Table.from_pandas(frame, preserve_index=False)
+                    writer = pq.ParquetWriter(
+                        os.path.join(path, f"{name}.parquet"),
+                        table.schema,
+                        compression="zstd",
+                    )
+                else:
+                    table = pa.Table.from_pandas(
+                        frame, schema=writer.schema, preserve_index=False
+                    )
+                writer.write_table(table, row_group_size=row_group_size)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+def _time_filter_value(
+    value: Union[datetime.datetime, datetime.timedelta, str], time_type
+) -> Union[pd.Timestamp, pd.Timedelta]:
+    """Converts a start or end argument to the type of a Parquet file's time column (absolute or relative time)."""
+    import pyarrow as pa
+
+    if pa.types.is_duration(time_type):
+        return pd.Timedelta(value)
+    return pd.Timestamp(value)
+
+
+def _load_parquet(
+    path: str,
+    variables: Optional[list[str]],
+    nodes: Optional[list[str]],
+    links: Optional[list[str]],
+    start: Optional[Union[datetime.datetime, datetime.timedelta, str]],
+    end: Optional[Union[datetime.datetime, datetime.timedelta, str]],
+) -> tuple[Optional[DataArray], Optional[DataArray]]:
+    import pyarrow.parquet as pq
+
+    arrays = []
+    for name, ids in (("nodes", nodes), ("links", links)):
+        filename = os.path.join(path, f"{name}.parquet")
+        if not os.path.exists(filename):
+            arrays.append(None)
+            continue
+        schema = pq.read_schema(filename)
+        index = [column for column in ("time", "id") if column in schema.names]
+        columns = [column for column in schema.names if column not in index]
+        if variables is not None:
+            columns = [column for column in columns if column in variables]
+            if not columns:
+                arrays.append(None)
+                continue
+        filters = []
+        if ids is not None:
+            filters.append(("id", "in", list(ids)))
+        if "time" in index and start is not None:
+            time_type = schema.field("time").type
+            filters.append(("time", ">=", _time_filter_value(start, time_type)))
+        if "time" in index and end is not None:
+            time_type = schema.field("time").type
+            filters.append(("time", "<=", _time_filter_value(end, time_type)))
+        frame = pd.read_parquet(
+            filename, columns=index + columns, filters=filters or None
+        )
+        array = (
+            frame.set_index(index)
+            .to_xarray()
+            .to_dataarray(dim="vars")
+            .transpose(*index, "vars")
+        )
+        arrays.append(array)
+    return arrays[0], arrays[1]
+
+
+def save_report(
+    report: SimulationReport,
+    path: str,
+    format: str = "netcdf",
+    chunks: Optional[dict[str, int]] = None,
+    complevel: int = 4,
+):
+    """Saves simulation results to disk.
+
+    Supported formats:
+
+    - "netcdf": a single compressed and chunked NetCDF4 file (requires netCDF4 or h5netcdf, falls back to an uncompressed NetCDF3 file written with scipy otherwise)
+    - "zarr": a directory with compressed chunks (requires zarr)
+    - "parquet": a directory containing the files nodes.parquet and links.parquet (requires pyarrow)
+
+    Args:
+      report: SimulationReport to be saved
+      path: file (NetCDF) or directory (Zarr, Parquet) path
+      format: storage format
+      chunks: chunk sizes along the dimensions "time" and "id", Parquet files use row groups of time * id rows
+      complevel: compression level for NetCDF files
+
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}, use one of {', '.join(FORMATS)}.")
+    chunks = {**DEFAULT_CHUNKS, **(chunks or {})}
+    logger.info(f"Saving simulation report to {path!r} as {format}")
+
+    if format == "parquet":
+        _require("pyarrow", format)
+        _save_parquet(report, path, chunks)
+        return
+
+    dataset = report.to_dataset()
+    if format == "zarr":
+        _require("zarr", format)
+        encoding = {
+            var: {"chunks": _chunk_shape(dataset[var], chunks)}
+            for var in dataset.data_vars
+        }
+        dataset.to_zarr(path, mode="w", encoding=encoding)
+        return
+
+    engine = _netcdf_engine()
+    if engine is None:
+        logger.warning(
+            "Neither netCDF4 nor h5netcdf is installed, writing an uncompressed NetCDF3 file."
+        )
+        dataset.to_netcdf(path, engine="scipy")
+        return
+    encoding = {
+        var: {
+            "zlib": True,
+            "complevel": complevel,
+            "chunksizes": _chunk_shape(dataset[var], chunks),
+        }
+        for var in dataset.data_vars
+    }
+    dataset.to_netcdf(path, engine=engine, encoding=encoding)
+
+
+def load_report(
+    path: str,
+    format: Optional[str] = None,
+    variables: Optional[list[str]] = None,
+    nodes: Optional[list[str]] = None,
+    links: Optional[list[str]] = None,
+    start: Optional[Union[datetime.datetime, datetime.timedelta, str]] = None,
+    end: Optional[Union[datetime.datetime, datetime.timedelta, str]] = None,
+    lazy: bool = False,
+) -> tuple[Optional[DataArray], Optional[DataArray]]:
+    """Loads simulation results saved with save_report.
+
+    Only the requested variables, elements and time steps are read from disk. If lazy is True, NetCDF and Zarr files
+    stay open and the arrays are chunked dask arrays (requires dask) that are only read when the data is accessed.
+    Parquet files are always loaded completely.
+
+    Args:
+      path: file (NetCDF) or directory (Zarr, Parquet) path
+      format: storage format, detected from the path if None
+      variables: variables to be loaded (e.g., ["Pressure", "Flow"]), defaults to all variables
+      nodes: IDs of the Nodes to be loaded, defaults to all Nodes
+      links: IDs of the Links to be loaded, defaults to all Links
+      start: first time step to be loaded, a timedelta for reports with a relative time axis
+      end: last time step to be loaded, a timedelta for reports with a relative time axis
+      lazy: keep the data on disk until it is accessed
+
+    Returns:
+      Node and Link result arrays
+
+    """
+    format = format or _detect_format(path)
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}, use one of {', '.join(FORMATS)}.")
+    logger.info(f"Loading simulation report from {path!r}")
+
+    if format == "parquet":
+        _require("pyarrow", format)
+        return _load_parquet(path, variables, nodes, links, start, end)
+
+    chunks = None
+    if lazy:
+        if importlib.util.find_spec("dask") is None:
+            raise ImportError(
+                "Loading simulation reports lazily requires the optional dependency 'dask'. Install it with "
+                "'pip install dask' or use the directory argument of Network.run for memory-mapped results."
+            )
+        chunks = {}
+    if format == "zarr":
+        _require("zarr", format)
+        dataset = xr.open_dataset(path, engine="zarr", chunks=chunks)
+    else:
+        dataset = xr.open_dataset(path, chunks=chunks)
+    try:
+        return (
+            _dataset_to_array(dataset, "node", variables, nodes, start, end, lazy),
+            _dataset_to_array(dataset, "link", variables, links, start, end, lazy),
+        )
+    finally:
+        if not lazy:
+            dataset.close()
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import copy
 import datetime
 import os
 from sys import platform as _platform
@@ -6,13 +7,19 @@ import subprocess
 import uuid
 import shutil
 import re
-from typing import Union, Optional, TYPE_CHECKING
+import tempfile
+from typing import Iterator, Union, Optional, TYPE_CHECKING
 import logging
 
-from oopnet.simulator.reportfile_reader import ReportFileReader
+from oopnet.simulator.reportfile_reader import (
+    ReportFileReader,
+    ReportStep,
+    iter_report_steps,
+)
 from oopnet.simulator.binaryfile_reader import BinaryFileReader
 from oopnet.utils import utils
 from oopnet.report.report import SimulationReport
+from oopnet.utils.getters import get_node, get_link
 from oopnet.utils.oopnet_logging import logging_decorator
 
 if TYPE_CHECKING:
@@ -20,6 +27,37 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+NODE_VARIABLES = ["elevation", "demand", "head", "pressure", "quality"]
+LINK_VARIABLES = [
+    "length",
+    "diameter",
+    "flow",
+    "velocity",
+    "headloss",
+    "setting",
+    "reaction",
+    "ffactor",
+]
+
+RAM_BACKED_DIRS = ["/dev/shm"]
+
+
+def get_staging_dir() -> str:
+    """Returns a directory for placing temporary simulation files.
+
+    RAM-backed directories (e.g., /dev/shm on Linux) are preferred since they avoid disk and network file system I/O
+    for the short-lived input, report and binary output files. If no RAM-backed directory is writable, the system's
+    temporary directory is returned.
+
+    Returns:
+        path to the staging directory
+
+    """
+    for directory in RAM_BACKED_DIRS:
+        if os.path.isdir(directory) and os.access(directory, os.W_OK):
+            return directory
+    return tempfile.gettempdir()
+
 
 # todo: add proper documentation
 # todo: enable running EPANET input files directly again
@@ -31,7 +69,14 @@ class ModelSimulator:
       thing: either an OOPNET network object or the filename of an EPANET input file
       filename: if thing is an OOPNET network, filename is an option to perform command line EPANET simulations with a specific filename. If filename is a Python None object then a file with a random UUID (universally unique identifier) is generated
       delete: if delete is True the EPANET Input and Report file is deleted, if False then the simulation results won't be deleted and are stored in a folder named path
-      path: Path were to perform the simulations. If path is a Python None object then a tmp-folder is generated
+      path: Path were to perform the simulations. If path is a Python None object and delete is True, the files are placed in a RAM-backed directory (see get_staging_dir). If path is None and delete is False, a tmp-folder is generated
+      variables: report variables to be simulated and read (e.g., ["Pressure", "Flow"]), defaults to the Network's report parameters
+      nodes: IDs of the Nodes results are needed for, defaults to all Nodes
+      links: IDs of the Links results are needed for, defaults to all Links
+      start: first reported time step relative to the start of the simulation
+      end: last reported time step relative to the start of the simulation, the simulation is stopped afterwards
+      directory: directory the results of extended period simulations are streamed to (memory-mapped files), by default the results are kept in memory
+      relative_time: if True, the results are indexed by the time since the start of the simulation (timedelta64) instead of timestamps
 
     Returns:
       OOPNET report object
@@ -46,6 +91,13 @@ class ModelSimulator:
         path: Optional[str] = None,
         startdatetime: Optional[datetime.datetime] = None,
         output: bool = False,
+        variables: Optional[list[str]] = None,
+        nodes: Optional[list[str]] = None,
+        links: Optional[list[str]] = None,
+        start: Optional[datetime.timedelta] = None,
+        end: Optional[datetime.timedelta] = None,
+        directory: Optional[str] = None,
+        relative_time: bool = False,
     ):
         self.thing = thing
         self.filename = filename
@@ -53,12 +105,22 @@ class ModelSimulator:
         self.path = path
         self.startdatetime = startdatetime
         self.output = output
+        self.variables = variables
+        self.nodes = nodes
+        self.links = links
+        self.start = start
+        self.end = end
+        self.directory = directory
+        self.relative_time = relative_time
         self.command = None
+        self._overrides = []
 
     def _set_path(self):
         """Sets path for temporary file placement."""
         # Set Path and generate it, if it does not exist
-        if self.path is None:
+        if self.path is None and self.delete:
+            self.path = get_staging_dir()
+        elif self.path is None:
             self.path = "tmp"
             utils.mkdir(self.path)
         elif isinstance(self.path, str):
@@ -80,8 +142,69 @@ class ModelSimulator:
                 self.path, str(uuid.uuid4()) + ".inp"
             )  # generate filename with unique filename
 
+    def _override(self, obj, attribute: str, value):
+        """Temporarily sets an attribute of the simulated Network's settings, see _restore_settings."""
+        self._overrides.append((obj, attribute, getattr(obj, attribute)))
+        setattr(obj, attribute, value)
+
+    def _restore_settings(self):
+        """Restores all settings changed with _override."""
+        while self._overrides:
+            obj, attribute, value = self._overrides.pop()
+            setattr(obj, attribute, value)
+
+    def _has_selection(self) -> bool:
+        return any(
+            value is not None
+            for value in (self.variables, self.nodes, self.links, self.start, self.end)
+        )
+
+    def _setup_selection(self):
+        """Restricts the report to the selected variables, elements and time window.
+
+        Report variables that were not selected are disabled. If only Node (Link) variables are selected or only Node
+        (Link) IDs are passed without selecting variables, no Link (Node) results are reported at all. The end of the time
+        window limits the simulation duration, since results before the end do not depend on later time steps.
+        """
+        network = self.thing
+        report = network.report
+        selected = None
+        if self.variables is not None:
+            selected = {var.lower().replace("-", "") for var in self.variables}
+            unknown = selected - set(NODE_VARIABLES) - set(LINK_VARIABLES)
+            if unknown:
+                raise ValueError(f"Unknown report variables {sorted(unknown)}.")
+            for var in NODE_VARIABLES + LINK_VARIABLES:
+                if var in selected:
+                    self._override(network.reportparameter, var, "YES")
+                else:
+                    # a written precision would enable the variable again
+                    self._override(network.reportparameter, var, "NO")
+                    self._override(network.reportprecision, var, None)
+
+        for kind, ids, getter, variables, other in (
+            ("nodes", self.nodes, get_node, NODE_VARIABLES, self.links),
+            ("links", self.links, get_link, LINK_VARIABLES, self.nodes),
+        ):
+            if ids is not None:
+                value = [getter(network, id) for id in ids]
+            elif selected is not None:
+                value = "ALL" if selected & set(variables) else "NONE"
+            else:
+                value = "NONE" if other is not None else "ALL"
+            self._override(report, kind, value)
+
+        times = network.times
+        if self.start is not None:
+            self._override(times, "reportstart", self.start)
+        if self.end is not None and self.end < times.duration:
+            self._override(times, "duration", self.end)
+
     def _setup_report(self):
         """Sets up report."""
+        if self._has_selection():
+            self._setup_selection()
+            return
         if self.thing.report.nodes == "NONE" or not self.thing.report.nodes:
             self.thing.report.nodes = "ALL"
         if self.thing.report.links == "NONE" or not self.thing.report.links:
@@ -134,30 +257,89 @@ class ModelSimulator:
         if err and self.output:
             logger.info(decorate_string(err))
 
+    def _remove_files(self):
+        """Removes the input, report and binary output files of the simulation."""
+        for extension in (".inp", ".rpt", ".out"):
+            filename = self.filename.replace(".inp", extension)
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+    def stream(self, poll_interval: float = 0.1) -> Iterator[ReportStep]:
+        """Simulates a hydraulic model using EPANET and yields the results of every reported time step.
+
+        EPANET is started in the background and its report file is followed while it is being written (see
+        iter_report_steps). The command-line EPANET writes the result tables only after the simulation of the whole
+        period is finished, so the steps are yielded while the results are written and read, not during the
+        simulation. Every time step is yielded as soon as its result tables were read and only the results of the
+        current time step are kept in memory. If the iterator is closed early, EPANET is stopped.
+
+        Args:
+          poll_interval: time (in seconds) to wait for new results
+
+        Returns:
+          iterator of ReportStep objects
+
+        """
+        logging.info("Simulating model")
+        self._set_path()
+        self._set_filename()
+        self._create_command()
+        rpt_file = self.filename.replace(".inp", ".rpt")
+        if os.path.isfile(rpt_file):
+            os.remove(rpt_file)
+        try:
+            self._setup_report()
+            self.thing.write(filename=self.filename)
+        finally:
+            self._restore_settings()
+
+        output = None if self.output else subprocess.DEVNULL
+        process = subprocess.Popen(
+            self.command, stdout=output, stderr=output, shell=False
+        )
+        try:
+            yield from iter_report_steps(
+                rpt_file,
+                precision=self.thing.reportprecision,
+                startdatetime=self.startdatetime,
+                relative_time=self.relative_time,
+                running=lambda: process.poll() is None,
+                poll_interval=poll_interval,
+                pagesize=self.thing.report.pagesize,
+            )
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            if self.delete:
+                self._remove_files()
+
     def run(self):
         """Simulates a hydraulic model using EPANET."""
         logging.info("Simulating model")
         self._set_path()
         self._set_filename()
-        self._setup_report()
         self._create_command()
-        self._execute()
+        try:
+            self._setup_report()
+            # the report times are needed after the settings were restored
+            times = copy.copy(self.thing.times)
+            self._execute()
+        finally:
+            self._restore_settings()
 
         try:
             rpt = SimulationReport(
                 self.filename.replace(".inp", ".rpt"),
                 startdatetime=self.startdatetime,
                 reader=ReportFileReader,
-                precision=self.thing.reportprecision
+                precision=self.thing.reportprecision,
+                directory=self.directory,
+                times=times,
+                relative_time=self.relative_time,
             )
         finally:
             if self.delete:
-                os.remove(self.filename)
-                rpt_file = self.filename.replace(".inp", ".rpt")
-                out_file = self.filename.replace(".inp", ".out")
-                if os.path.isfile(rpt_file):
-                    os.remove(rpt_file)
-                if os.path.isfile(out_file):
-                    os.remove(out_file)
+                self._remove_files()
         if rpt:
             return rpt
@@ -1,31 +1,55 @@
 from re import compile
+from typing import Optional
 
-from oopnet.simulator.simulation_errors import get_error_list, EPANETSimulationError
+import pandas as pd
+
+from oopnet.simulator.simulation_errors import get_error_dict, EPANETSimulationError
+
+# error codes mapped to the error classes
+ERRORS = get_error_dict()
+
+# warning categories and the keywords identifying them in EPANET warning messages
+WARNING_KINDS = (
+    ("negative pressures", "negative pressures"),
+    ("unbalanced", "unbalanced"),
+    ("disconnected", "disconnected"),
+    ("unstable", "unstable"),
+    ("pump", "pump"),
+    ("valve", "valve"),
+)
 
 
 class ErrorManager:
-    """Class for managing errors encountered while simulating a hydraulic model.
+    """Class for managing errors and warnings encountered while simulating a hydraulic model.
 
     This class checks the EPANET report file for errors, stores these errors (and if available the error details) and
-    then raises an EPANETSimulationError that contains all the encountered errors.
+    then raises an EPANETSimulationError that contains all the encountered errors. Warnings (e.g., negative pressures,
+    unbalanced or disconnected systems) are stored in found_warnings and are available as a table via get_warnings.
+
+    Errors and warnings are only written to the header and status part of a report file, so the lines of the result
+    tables do not have to be checked.
 
     Attributes:
         found_errors: list of errors found in the report file
+        found_warnings: list of warnings found in the report file as (time, kind, element, message) tuples, the time is the simulation clock time as a pandas Timedelta or None
         _error_exp: regular expression used for finding errors
-        _error_list: list of possible errors that might be found in a report file as tuples where the first item is the
-        exception, the second one the general error message and an optional third item stores the error details.
+        _warning_exp: regular expression used for finding the time of a warning
+        _element_exp: regular expression used for finding the element a warning refers to
 
     """
 
     def __init__(self):
         self.found_errors = []
+        self.found_warnings = []
         self._error_exp = compile(r"\d{3}: ")
-        self._error_list = get_error_list()
+        self._warning_exp = compile(r" at (\d+:\d{2}(?::\d{2})?) hrs")
+        self._element_exp = compile(r"\b(?:Node|Link|Pump|Valve) (\S+)")
 
     def check_line(self, text_line: str) -> bool:
-        """Checks a single line of text for error codes.
+        """Checks a single line of text for error codes and warnings.
 
-        If an error is encountered, it is added to the found_errors list together with the error message.
+        If an error is encountered, it is added to the found_errors list together with the error message. Warnings are
+        added to the found_warnings list.
 
         Args:
             text_line: text line to be checked
@@ -35,17 +59,53 @@ class ErrorManager:
 
         """
         text_line = text_line.replace("\n", "")
+        if "WARNING" in text_line:
+            self._add_warning(text_line)
+            return False
         matches = self._error_exp.search(text_line)
         if matches:
             raised_code = matches.group()
-            raised_code_int = int(matches.group().replace(": ", ""))
-            error_text = text_line.split(raised_code)[1]
-            for error in self._error_list:
-                if raised_code_int == error.code:
-                    self.found_errors.append([error, error_text, None])
-                    return True
+            error = ERRORS.get(int(raised_code.replace(": ", "")))
+            if error is not None:
+                error_text = text_line.split(raised_code)[1]
+                self.found_errors.append([error, error_text, None])
+                return True
         return False
 
+    def _add_warning(self, text_line: str):
+        message = text_line.split("WARNING:", 1)[-1].strip()
+        time = self._warning_exp.search(message)
+        if time is not None:
+            time = pd.to_timedelta(time.group(1))
+        lowered = message.lower()
+        kind = next(
+            (kind for keyword, kind in WARNING_KINDS if keyword in lowered), "other"
+        )
+        element = self._element_exp.search(message)
+        if element is not None:
+            element = element.group(1)
+        self.found_warnings.append((time, kind, element, message))
+
+    def get_warnings(
+        self, startdatetime: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        """Returns the warnings found in the report file as a table.
+
+        Args:
+            startdatetime: start of the simulation, the warning times are converted to timestamps if passed
+
+        Returns:
+            pandas DataFrame with the columns "time", "kind", "element" and "message"
+
+        """
+        warnings = pd.DataFrame(
+            self.found_warnings, columns=["time", "kind", "element", "message"]
+        )
+        warnings["time"] = pd.to_timedelta(warnings["time"])
+        if startdatetime is not None:
+            warnings["time"] = startdatetime + warnings["time"]
+        return warnings
+
     def append_error_details(self, text_line: str):
         """Appends the details of an error to the already found error.
 
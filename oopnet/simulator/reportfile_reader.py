@@ -1,66 +1,49 @@
-from typing import Optional, Union
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, TextIO, Union
 import datetime
+import os
 import re
 import logging
+import time
 from collections import Counter
 
+import numpy as np
 import pandas as pd
 import xarray as xr
 from xarray import DataArray, Dataset
 
-from oopnet.elements.options_and_reporting import Reportprecision
+from oopnet.elements.options_and_reporting import Reportprecision, Times
 from oopnet.simulator.error_manager import ErrorManager
+from oopnet.simulator.result_buffer import ResultBuffer
+from oopnet.simulator.simulation_errors import (
+    EPANETSimulationError,
+    ReportFileAccessError,
+)
 from oopnet.utils.oopnet_logging import logging_decorator
 
 logger = logging.getLogger(__name__)
 
+# number of time steps the memory-mapped result files grow by
+OUT_OF_CORE_STEPS = 256
+# start of the simulation if no startdatetime is passed
+DEFAULT_STARTDATETIME = datetime.datetime(year=2016, month=1, day=1)
+# titles of the tables following the header and status part of a report file
+RESULT_TABLES = ("Node", "Link", "Energy")
+# columns of the pump energy usage table
+ENERGY_COLUMNS = [
+    "Utilization",
+    "Efficiency",
+    "Energy",
+    "Average Power",
+    "Peak Power",
+    "Cost",
+]
 
-def str2hms(timestring: str) -> tuple[int, int, float]:
-    """Converts a string to a tuple containing hours, minutes and seconds.
-
-    Args:
-      timestring: string to be parsed
-
-    Returns:
-        parsed timestring as a tuple
-    """
-    vals = timestring.split(":")
-    hours = int(vals[0])
-    minutes = int(vals[1])
-    seconds = float(vals[2]) if len(vals) > 2 else 0
-    return hours, minutes, seconds
-
-
-def blockkey2typetime(
-    blockkey: str, startdatetime: Optional[datetime.datetime] = None
-) -> tuple[str, datetime.datetime]:
-    """
-
-    Args:
-      blockkey:
-      startdatetime: (Default value = None)
-
-    Returns:
-
-    """
-
-    vals = blockkey.split()
-    kind = vals[0]
-
-    if len(vals) > 3:
-        time = vals[3]
-        hours, minutes, seconds = str2hms(time)
-        if startdatetime is None:
-            today = datetime.datetime(
-                year=2016, month=1, day=1, hour=0, minute=0, second=0
-            )
-        else:
-            today = startdatetime
-        time = today + datetime.timedelta(hours=hours, minutes=minutes, seconds=seconds)
-        # time = datetime.timedelta(hours=hours, minutes=minutes, seconds=seconds)
-    else:
-        time = None
-    return kind, time
+_status_exp = re.compile(
+    r"^(\d+:\d{2}:\d{2}): (Pipe|CV|Pump|PRV|PSV|PBV|FCV|TCV|GPV|Tank|Reservoir) (\S+) (.+)$"
+)
+_tank_status_exp = re.compile(r"^is (\S+)(?: at (\S+))?")
+_link_change_exp = re.compile(r"changed from (.+) to (.+)$")
 
 
 def lst2xray(lst: list, precision: Reportprecision) -> xr.DataArray:
@@ -124,72 +107,486 @@ def lst2xray(lst: list, precision: Reportprecision) -> xr.DataArray:
     return xr.DataArray(frame)
 
 
-# todo: refactor
+def blockkey2clock(blockkey: str) -> Optional[str]:
+    """Extracts the simulation clock time (e.g., "1:00:00") from a result table title.
+
+    Args:
+      blockkey: table title (e.g., "Node Results at 1:00:00 hrs:")
+
+    Returns:
+        clock time or None for tables without a time (single period simulations)
+
+    """
+    vals = blockkey.split()
+    return vals[3] if len(vals) > 3 else None
+
+
+def time_axis(
+    clocks: list[str],
+    startdatetime: Optional[datetime.datetime] = None,
+    times: Optional[Times] = None,
+    relative: bool = False,
+) -> np.ndarray:
+    """Creates the time coordinate of the result tables of an extended period simulation.
+
+    If the Network's Times are passed, the report times are generated arithmetically from the report start and the
+    report time step. The clock time of the last table is used to verify the result. Otherwise (or if the times do not
+    match), all clock times are parsed at once.
+
+    Args:
+      clocks: clock times of the result tables in the order of the report file
+      startdatetime: start of the simulation, defaults to DEFAULT_STARTDATETIME
+      times: Times used for the simulation
+      relative: if True, the time since the start of the simulation is returned instead of timestamps
+
+    Returns:
+        datetime64[ns] or timedelta64[ns] array
+
+    """
+    offsets = None
+    if clocks and times is not None and times.reporttimestep:
+        step = pd.Timedelta(times.reporttimestep).to_timedelta64()
+        start = pd.Timedelta(times.reportstart or 0).to_timedelta64()
+        offsets = (start + np.arange(len(clocks)) * step).astype("timedelta64[ns]")
+        if offsets[-1] != pd.Timedelta(clocks[-1]).to_timedelta64():
+            logger.debug("Report times do not match the Network's times")
+            offsets = None
+    if offsets is None:
+        offsets = pd.to_timedelta(clocks).values.astype("timedelta64[ns]")
+    if relative:
+        return offsets
+    start = np.datetime64(startdatetime or DEFAULT_STARTDATETIME, "ns")
+    return start + offsets
+
+
+class _ResultCollector:
+    """Collects the Node or Link result tables of a report file.
+
+    Tables are converted to DataArrays as soon as they were read. By default, the tables are kept in memory and
+    concatenated along the time dimension at the end. If a directory is passed, the tables of extended period
+    simulations are sorted by ID and written to a new memory-mapped .npy file in this directory instead, one time step
+    after another. Only the clock times of the tables are stored, the time coordinate is created at the end (see
+    time_axis).
+
+    Args:
+      kind: "Node" or "Link"
+      precision: report precision used to split merged values
+      directory: directory for out-of-core storage
+
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        precision: Reportprecision,
+        directory: Optional[str] = None,
+    ):
+        self.kind = kind
+        self.precision = precision
+        self.directory = directory
+        self.frames = {}
+        self.clocks = []
+        self.indexes = None
+        self.buffer = None
+
+    def add(self, key: str, lst: list):
+        frame = lst2xray(lst, self.precision)
+        clock = blockkey2clock(key)
+        if self.directory is None or clock is None:
+            self.frames[key] = (clock, frame)
+            return
+
+        frame = frame.rename({"dim_1": "vars"}).sortby("id")
+        if self.buffer is None:
+            self.indexes = {dim: frame.indexes[dim] for dim in frame.dims}
+            self.buffer = ResultBuffer(
+                frame,
+                OUT_OF_CORE_STEPS,
+                OUT_OF_CORE_STEPS,
+                self.directory,
+                f"{self.kind.lower()}s",
+            )
+        else:
+            self.buffer.check(frame)
+        self.buffer.set(len(self.clocks), frame)
+        self.clocks.append(clock)
+
+    def result(
+        self, create_time_axis: Callable[[list[str]], np.ndarray]
+    ) -> Optional[DataArray]:
+        if self.buffer is not None:
+            self.buffer.trim(len(self.clocks))
+            return DataArray(
+                self.buffer.data,
+                coords={"time": create_time_axis(self.clocks), **self.indexes},
+                dims=("time", *self.buffer.dims),
+            )
+        if not self.frames:
+            return None
+        clocks = [clock for clock, _ in self.frames.values() if clock is not None]
+        frames = [frame for _, frame in self.frames.values()]
+        if clocks:
+            data = xr.concat(frames, dim="time").rename({"dim_1": "vars"})
+            return data.assign_coords(time=create_time_axis(clocks))
+        return frames[0].rename({"dim_1": "vars"})
+
+
+class _StatusCollector:
+    """Collects the status changes EPANET writes to the status part of a report file (Report Status YES or FULL).
+
+    Every status line is matched once with a regular expression while the report file is read. The tables are
+    created at the end.
+
+    Attributes:
+      links: list of (time, type, id, status, message) tuples of Link status changes
+      tanks: list of (time, type, id, status, level) tuples of Tank and Reservoir status changes
+
+    """
+
+    def __init__(self):
+        self.links = []
+        self.tanks = []
+
+    def check_line(self, line: str):
+        match = _status_exp.match(line)
+        if match is None:
+            return
+        time, type, id, text = match.groups()
+        if type in ("Tank", "Reservoir"):
+            status = _tank_status_exp.match(text)
+            if status is not None:
+                level = float(status.group(2)) if status.group(2) else float("nan")
+                self.tanks.append((time, type, id, status.group(1), level))
+            return
+        change = _link_change_exp.search(text)
+        if change is not None:
+            status = change.group(2)
+        elif text.startswith("changed by") or "setting changed" in text:
+            status = None
+        else:
+            status = text
+        self.links.append((time, type, id, status, text))
+
+    @staticmethod
+    def _table(
+        rows: list[tuple],
+        columns: list[str],
+        startdatetime: Optional[datetime.datetime],
+    ) -> pd.DataFrame:
+        table = pd.DataFrame(rows, columns=columns)
+        table["time"] = pd.to_timedelta(table["time"])
+        if startdatetime is not None:
+            table["time"] = startdatetime + table["time"]
+        return table
+
+    def get_tables(
+        self, startdatetime: Optional[datetime.datetime]
+    ) -> dict[str, pd.DataFrame]:
+        """Returns the status changes as tables, times are relative to the start of the simulation if startdatetime is None."""
+        return {
+            "status_events": self._table(
+                self.links, ["time", "type", "id", "status", "message"], startdatetime
+            ),
+            "tank_events": self._table(
+                self.tanks, ["time", "type", "id", "status", "level"], startdatetime
+            ),
+        }
+
+
+def energy2frame(lst: list) -> pd.DataFrame:
+    """Converts the rows of the energy usage table of a report file to a DataFrame.
+
+    The demand charge and the total cost are stored in the attributes "demand_charge" and "total_cost" of the
+    DataFrame.
+
+    Args:
+      lst: rows of the energy usage table split into values
+
+    Returns:
+      pandas DataFrame indexed by the Pump IDs with the columns listed in ENERGY_COLUMNS
+
+    """
+    rows = [row for row in lst[2:] if len(row) == len(ENERGY_COLUMNS) + 1]
+    frame = pd.DataFrame(
+        [row[1:] for row in rows],
+        index=pd.Index([row[0] for row in rows], name="id"),
+        columns=ENERGY_COLUMNS,
+        dtype=float,
+    )
+    for row in lst:
+        if row[0] == "Demand":
+            frame.attrs["demand_charge"] = float(row[-1])
+        elif row[0] == "Total":
+            frame.attrs["total_cost"] = float(row[-1])
+    return frame
+
+
+def _iter_blocks(
+    lines: Iterable[str],
+    error_manager: ErrorManager,
+    status_collector: Optional[_StatusCollector] = None,
+) -> Iterator[tuple[str, list]]:
+    """Splits the lines of a report file into blocks separated by empty lines.
+
+    Errors, warnings and status changes are only searched for in the header and status part of the report file that
+    precedes the first result table.
+
+    Args:
+      lines: lines of the report file
+      error_manager: ErrorManager checking the header lines
+      status_collector: _StatusCollector checking the header lines
+
+    Returns:
+        iterator of (block title, rows of the block split into values) tuples
+
+    """
+    error_found = False
+    header = True
+    key = "start"
+    lst = []
+    new_block = False
+    for line in lines:
+        if header:
+            if error_found and len(line.strip()) != 0:
+                error_manager.append_error_details(line)
+            error_found = error_manager.check_line(line)
+
+        line = re.sub(r"\s+", " ", line.replace("\n", "").strip())
+        if header and status_collector is not None:
+            status_collector.check_line(line)
+        if new_block:
+            yield key, lst
+            key = line
+            lst = []
+            new_block = False
+            if header and key.startswith(RESULT_TABLES):
+                header = False
+        if len(line) == 0:
+            new_block = True
+        elif line not in key and not line.startswith("---------"):
+            lst.append(line.split(" "))
+    yield key, lst
+
+
 @logging_decorator(logger)
 class ReportFileReader:
+    """Reads the Node and Link results from an EPANET report file.
+
+    The file is parsed line by line and every result table is converted as soon as it was read, so only the
+    converted results are kept in memory. If a directory is passed, the results of extended period simulations are
+    streamed to memory-mapped files in this directory (nodes-<uuid>.npy and links-<uuid>.npy, see ResultBuffer) and
+    the returned arrays are backed by these files.
+
+    Errors, warnings and status changes are only searched for in the header and status part of the report file that
+    precedes the first result table. Warnings, Link status changes, Tank status changes and the pump energy usage
+    table are returned in the dictionary of additional tables (keys "warnings", "status_events", "tank_events" and
+    "energy").
+
+    The time coordinate is created from the Network's report start and report time step if times is passed (see
+    time_axis).
+
+    Args:
+      filename: path of the report file
+      precision: report precision used to split merged values
+      startdatetime: start of the simulation, defaults to DEFAULT_STARTDATETIME
+      directory: directory for out-of-core storage
+      times: Times used for the simulation
+      relative_time: if True, times are returned as time since the start of the simulation (timedelta64)
+
+    Returns:
+      Node results, Link results and a dictionary of additional tables
+
+    """
+
     def __new__(
-        cls, filename: str, precision: Reportprecision, startdatetime: Optional[datetime.datetime] = None
-    ) -> tuple[Union[DataArray, Dataset, None], Union[DataArray, Dataset, None]]:
+        cls,
+        filename: str,
+        precision: Reportprecision,
+        startdatetime: Optional[datetime.datetime] = None,
+        directory: Optional[str] = None,
+        times: Optional[Times] = None,
+        relative_time: bool = False,
+    ) -> tuple[
+        Union[DataArray, Dataset, None],
+        Union[DataArray, Dataset, None],
+        dict[str, pd.DataFrame],
+    ]:
         logger.debug("Reading Report File")
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        collectors = {
+            kind: _ResultCollector(kind, precision, directory)
+            for kind in ("Node", "Link")
+        }
+        error_manager = ErrorManager()
+        status_collector = _StatusCollector()
+        tables = {}
+
         with open(filename, "r") as fid:
-            content = fid.readlines()
-            # print(content)
-            block = {}
-            key = "start"
-            block[key] = []
-            error_manager = ErrorManager()
-            error_found = False
-
-            for linenumber, line in enumerate(content):
-                if error_found and len(line.strip()) != 0:
-                    error_manager.append_error_details(line)
-
-                error_found = error_manager.check_line(line)
-                if len(line.strip()) == 0:
-                    key = content[linenumber + 1]
-                    key = re.sub(r"\s+", " ", key.replace("\n", "").strip())
-                    block[key] = []
-                else:
-                    line = re.sub(r"\s+", " ", line.replace("\n", "").strip())
-                    if line not in key and (
-                        line in key or not line.startswith("---------")
-                    ):
-                        block[key].append(line.split(" "))
+            for key, lst in _iter_blocks(fid, error_manager, status_collector):
+                if key.startswith("Energy"):
+                    tables["energy"] = energy2frame(lst)
+                for kind, collector in collectors.items():
+                    if key.startswith(kind):
+                        collector.add(key, lst)
         error_manager.raise_errors()
-        links = None
-        nodes = None
-        data = None
-
-        format = "%y.%m.%d %H:%M:%S"
-        for k in list(block.keys()):
-            if "Node" not in k and "Link" not in k:
-                block.pop(k)
-
-        for kind in ["Node", "Link"]:
-            times = []
-            # for key in sorted(block.iterkeys(), key=lambda x: x.split(' ')[3].zfill(8)):
-            for key in sorted(block.keys()):
-                if key.startswith(kind):
-                    kind, time = blockkey2typetime(key, startdatetime=startdatetime)
-                    if time is not None:
-                        times.append(time)
-
-            frames = []
-            for key in sorted(block.keys()):
-                if key.startswith(kind):
-                    lst = block[key]
-                    x = lst2xray(lst, precision)
-                    frames.append(x)
-            if frames:
-                if times:
-                    data = xr.concat(frames, times)
-                    data = data.rename({"concat_dim": "time", "dim_1": "vars"})
-                else:
-                    data = frames[0]
-                    data = data.rename({"dim_1": "vars"})
-            if kind == "Node":
-                nodes = data
-            else:
-                links = data
 
-        return nodes, links
+        startdatetime = (
+            None if relative_time else startdatetime or DEFAULT_STARTDATETIME
+        )
+        tables["warnings"] = error_manager.get_warnings(startdatetime)
+        tables.update(status_collector.get_tables(startdatetime))
+
+        def create_time_axis(clocks: list[str]) -> np.ndarray:
+            return time_axis(clocks, startdatetime, times, relative_time)
+
+        return (
+            collectors["Node"].result(create_time_axis),
+            collectors["Link"].result(create_time_axis),
+            tables,
+        )
+
+
+@dataclass
+class ReportStep:
+    """Node and Link results of a single reported time step.
+
+    Attributes:
+      time: time of the step (timestamp or time since the start of the simulation), None for single period simulations
+      nodes: Node results indexed by the Node IDs with one column per report variable (e.g., "Pressure")
+      links: Link results indexed by the Link IDs with one column per report variable (e.g., "Flow")
+
+    """
+
+    time: Union[pd.Timestamp, pd.Timedelta, None]
+    nodes: Optional[pd.DataFrame] = None
+    links: Optional[pd.DataFrame] = None
+
+
+def _follow_lines(
+    fid: TextIO, running: Callable[[], bool], poll_interval: float
+) -> Iterator[str]:
+    """Yields the lines of a file that is still being written.
+
+    Incomplete lines are kept until the rest of the line was written. The file is read until it is not written to
+    anymore (running returns False).
+
+    Args:
+      fid: file object
+      running: callable returning True as long as the file is being written
+      poll_interval: time (in seconds) to wait for new lines
+
+    Returns:
+        iterator of lines
+
+    """
+    partial = ""
+    while True:
+        active = running()
+        line = fid.readline()
+        while line:
+            if not line.endswith("\n"):
+                partial += line
+                break
+            yield partial + line
+            partial = ""
+            line = fid.readline()
+        if not active:
+            break
+        time.sleep(poll_interval)
+    if partial:
+        yield partial
+
+
+def iter_report_steps(
+    filename: str,
+    precision: Reportprecision,
+    startdatetime: Optional[datetime.datetime] = None,
+    relative_time: bool = False,
+    running: Optional[Callable[[], bool]] = None,
+    poll_interval: float = 0.1,
+    pagesize: Optional[int] = None,
+) -> Iterator[ReportStep]:
+    """Reads an EPANET report file one reported time step at a time.
+
+    Only the results of the current step are kept in memory. If running is passed, the report file is followed while it
+    is being written (like `tail -f`) until running returns False. Errors in the header of the report file are raised
+    before the first step is yielded.
+
+    Reports with page breaks split long tables into several blocks, so a step is only known to be complete when the
+    first table of the next step was read and is yielded with a lag of one step. If pagesize is 0 (no page breaks), the
+    tables written for the first step are remembered and every later step is yielded as soon as all of these tables
+    were read.
+
+    Args:
+      filename: path of the report file
+      precision: report precision used to split merged values
+      startdatetime: start of the simulation, defaults to DEFAULT_STARTDATETIME
+      relative_time: if True, times are returned as time since the start of the simulation (Timedelta)
+      running: callable returning True as long as the report file is being written
+      poll_interval: time (in seconds) to wait for new lines while following the report file
+      pagesize: page size of the report (see Report.pagesize), None if unknown
+
+    Returns:
+        iterator of ReportStep objects
+
+    Raises:
+      EPANETSimulationError: if running is passed and the report file was not created
+
+    """
+    startdatetime = None if relative_time else startdatetime or DEFAULT_STARTDATETIME
+    while running is not None and running() and not os.path.isfile(filename):
+        time.sleep(poll_interval)
+    if running is not None and not os.path.isfile(filename):
+        raise EPANETSimulationError(
+            [
+                ReportFileAccessError(
+                    "cannot open report file", f"{filename} was not created"
+                )
+            ]
+        )
+
+    error_manager = ErrorManager()
+    clock, tables = None, {}
+    # tables written for every step, known after the first step
+    kinds = None
+    checked = False
+
+    def create_step() -> ReportStep:
+        step_time = None
+        if clock is not None:
+            step_time = pd.Timedelta(clock)
+            if startdatetime is not None:
+                step_time = pd.Timestamp(startdatetime) + step_time
+        frames = {
+            kind: pd.concat(frames) if len(frames) > 1 else frames[0]
+            for kind, frames in tables.items()
+        }
+        return ReportStep(
+            time=step_time, nodes=frames.get("Node"), links=frames.get("Link")
+        )
+
+    with open(filename, "r") as fid:
+        lines = fid if running is None else _follow_lines(fid, running, poll_interval)
+        for key, lst in _iter_blocks(lines, error_manager):
+            kind = key.split(" ", 1)[0]
+            if kind not in ("Node", "Link"):
+                continue
+            if not checked:
+                error_manager.raise_errors()
+                checked = True
+            block_clock = blockkey2clock(key)
+            if tables and block_clock != clock:
+                kinds = kinds or set(tables)
+                yield create_step()
+                tables = {}
+            clock = block_clock
+            frame = lst2xray(lst, precision).to_pandas()
+            frame.columns.name = "vars"
+            tables.setdefault(kind, []).append(frame)
+            if pagesize == 0 and kinds is not None and kinds <= tables.keys():
+                yield create_step()
+                tables = {}
+    error_manager.raise_errors()
+    if tables:
+        yield create_step()
@@ -0,0 +1,111 @@
+from typing import Optional
+import logging
+import os
+import uuid
+
+import numpy as np
+from xarray import DataArray
+
+logger = logging.getLogger(__name__)
+
+
+class ResultBuffer:
+    """Preallocated array storing result arrays with the same coordinates along a new leading dimension.
+
+    The buffer is used for the time steps of memory-mapped simulation reports and for the scenarios of a
+    ReportCollection. It is allocated with the shape of the first result array. If it is full, its capacity is doubled
+    (but grows by at least chunksize entries), so appending n entries copies O(n) entries in total. Call trim once all
+    entries were stored to release the unused capacity. If a directory is passed, the data is stored in a memory-mapped .npy file in this directory instead of
+    RAM. Every buffer creates its own file with a unique name, so results stored in the same directory earlier are
+    never overwritten.
+
+    Args:
+      template: first result array defining the coordinates of all entries
+      capacity: number of entries to allocate
+      chunksize: minimum number of entries the buffer grows by
+      directory: directory for out-of-core storage
+      name: prefix of the file name (e.g., "nodes")
+
+    Attributes:
+      dims: dimensions of the stored result arrays
+      coords: coordinates of the stored result arrays
+      filename: path of the memory-mapped file, None if the data is stored in RAM
+      data: array with the shape (capacity, ...)
+
+    """
+
+    def __init__(
+        self,
+        template: DataArray,
+        capacity: int,
+        chunksize: int,
+        directory: Optional[str] = None,
+        name: str = "results",
+    ):
+        self.dims = template.dims
+        self.coords = {dim: template[dim].values for dim in template.dims}
+        self.chunksize = chunksize
+        self.filename = None
+        if directory is not None:
+            self.filename = os.path.join(directory, f"{name}-{uuid.uuid4().hex}.npy")
+            logger.debug(f"Writing results to {self.filename}")
+        self.data = self._allocate(capacity, self.filename)
+
+    def _allocate(self, capacity: int, filename: Optional[str] = None) -> np.ndarray:
+        shape = (capacity, *[len(values) for values in self.coords.values()])
+        if filename is None:
+            return np.full(shape, np.nan)
+        data = np.lib.format.open_memmap(filename, mode="w+", dtype=float, shape=shape)
+        data[:] = np.nan
+        return data
+
+    def _grow(self, filled: int):
+        capacity = max(len(self.data) * 2, len(self.data) + self.chunksize)
+        logger.debug(f"Growing result buffer to {capacity} entries")
+        self._resize(capacity, filled)
+
+    def _resize(self, capacity: int, filled: int):
+        if self.filename is None:
+            new = self._allocate(capacity)
+            new[:filled] = self.data[:filled]
+            self.data = new
+            return
+
+        temporary = f"{self.filename}.tmp"
+        new = self._allocate(capacity, temporary)
+        new[:filled] = self.data[:filled]
+        new.flush()
+        del new
+        self.data = None
+        os.replace(temporary, self.filename)
+        self.data = np.lib.format.open_memmap(self.filename, mode="r+")
+
+    def trim(self, filled: int):
+        """Shrinks the buffer to the first filled entries.
+
+        Args:
+          filled: number of entries stored in the buffer
+
+        """
+        if filled < len(self.data):
+            logger.debug(f"Trimming result buffer to {filled} entries")
+            self._resize(filled, filled)
+        elif self.filename is not None:
+            self.data.flush()
+
+    def check(self, array: DataArray):
+        """Raises a ValueError if an array does not fit the coordinates of the buffer."""
+        if array.dims != self.dims or any(
+            not np.array_equal(array[dim].values, values)
+            for dim, values in self.coords.items()
+        ):
+            raise ValueError(
+                "Simulation results do not match the results stored before (dimensions, IDs, variables or time "
+                "steps differ)."
+            )
+
+    def set(self, index: int, array: DataArray):
+        """Stores a result array at an index, the buffer grows if the index exceeds its capacity."""
+        if index >= len(self.data):
+            self._grow(index)
+        self.data[index] = array.values
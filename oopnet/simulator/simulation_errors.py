@@ -205,3 +205,10 @@ def get_error_list() -> list[Type[EPANETError]]:
         for name, obj in getmembers(modules[__name__])
         if isclass(obj) and hasattr(obj, "code")
     ]
+
+
+def get_error_dict() -> dict[int, Type[EPANETError]]:
+    """Maps the codes of all errors implemented to the error classes."""
+    return {
+        error.code: error for error in get_error_list() if isinstance(error.code, int)
+    }
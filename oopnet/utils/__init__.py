@@ -4,5 +4,6 @@
 
 from .timer import tic, toc, time_it
 from .utils import make_measurement
+from .sensors import SensorLayout
 from .utils import copy as Copy
 from .oopnet_logging import logging_decorator, start_logger
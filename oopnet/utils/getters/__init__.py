@@ -47,6 +47,8 @@ from .property_getters import (
     get_status,
     get_setting,
     get_linkcenter_coordinates,
+    get_link_polyline_lengths,
+    get_link_midpoints,
     get_link_comment,
     get_length,
     get_diameter,
@@ -58,6 +60,7 @@ from .property_getters import (
     get_elevation,
     get_basedemand,
     get_node_comment,
+    get_property_table,
 )
 from .topology_getters import (
     get_neighbor_nodes,
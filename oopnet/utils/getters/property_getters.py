@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import Iterable, TYPE_CHECKING, Union
 
 import numpy as np
 import pandas as pd
 
+from oopnet.elements.geometry import LINK_TYPES, NODE_TYPES
 from oopnet.utils.getters.element_lists import (
     get_links,
     get_link_ids,
@@ -154,6 +155,8 @@ def get_setting(network: Network) -> pd.Series:
 def get_linkcenter_coordinates(network: Network) -> pd.DataFrame:
     """Get the center coordinates of all Links in the Network as a pandas Dataframe.
 
+    The centers are measured along the Links' vertices (see Link.center).
+
     Args:
       network: OOPNET Network object
 
@@ -161,17 +164,55 @@ def get_linkcenter_coordinates(network: Network) -> pd.DataFrame:
       Pandas DataFrame with Link IDs as index and the Links' center x and y coordinates as columns.
 
     """
-    x = [
-        (x.startnode.xcoordinate + x.endnode.xcoordinate) / 2
-        for x in get_links(network)
-    ]
-    y = [
-        (x.startnode.ycoordinate + x.endnode.ycoordinate) / 2
-        for x in get_links(network)
-    ]
+    geometry = network.geometry
+    return pd.DataFrame(
+        geometry.midpoints,
+        index=list(geometry.link_ids),
+        columns=["center x-coordinate", "center y-coordinate"],
+    )
+
+
+def get_link_polyline_lengths(network: Network) -> pd.Series:
+    """Gets the map lengths of all Links in the Network as a pandas Series.
+
+    The lengths are measured along the polylines through the start Nodes, the vertices and the end Nodes in map units
+    and are computed for all Links at once. They are not related to the hydraulic Pipe lengths (see get_length).
+
+    Args:
+      network: OOPNET Network object
+
+    Returns:
+      Pandas Series with Link IDs as index and polyline lengths as values.
+
+    """
+    geometry = network.geometry
+    series = pd.Series(
+        data=geometry.lengths, index=list(geometry.link_ids), dtype=np.float64
+    )
+    series.name = "polyline lengths"
+    series.units = "1"
+    return series
+
+
+def get_link_midpoints(network: Network, fraction: float = 0.5) -> pd.DataFrame:
+    """Gets the points at a fraction of the length of all Links in the Network as a pandas DataFrame.
+
+    The points are interpolated along the polylines through the start Nodes, the vertices and the end Nodes for all
+    Links at once (e.g., for placing labels or arrows).
+
+    Args:
+      network: OOPNET Network object
+      fraction: position along the Links between 0 (start Node) and 1 (end Node)
+
+    Returns:
+      Pandas DataFrame with Link IDs as index and the points' x and y coordinates as columns.
+
+    """
+    geometry = network.geometry
     return pd.DataFrame(
-        index=get_link_ids(network),
-        data={"center x-coordinate": x, "center y-coordinate": y},
+        geometry.interpolate(fraction),
+        index=list(geometry.link_ids),
+        columns=["x-coordinate", "y-coordinate"],
     )
 
 
@@ -377,3 +418,71 @@ def get_node_comment(network: Network) -> pd.Series:
     series = pd.Series(data=values, index=names, dtype=str)
     series.name = "node comment"
     return series
+
+
+def get_property_table(
+    network: Network,
+    kind: str,
+    attributes: Iterable[str],
+    values: Union[pd.Series, pd.DataFrame, None] = None,
+) -> pd.DataFrame:
+    """Collects the properties of all Nodes or Links in the order of the Network's geometry.
+
+    Args:
+      network: OOPNET Network object
+      kind: "nodes" or "links"
+      attributes: component attributes (e.g., "elevation"), missing attributes (e.g., the length of a Pump) are None
+      values: results indexed by ID, a Series is added as a property named like the Series, a DataFrame adds one
+        property per column, elements without values are None
+
+    Returns:
+      Pandas DataFrame with the columns "id", "type" (class name), the attributes and the joined values
+
+    Raises:
+      ValueError: if the values are not indexed by IDs of the elements (e.g., results of an extended period simulation
+        indexed by time), if a Series has no name or if a property name is used twice
+
+    """
+    registry, types = (
+        (network._nodes, NODE_TYPES)
+        if kind == "nodes"
+        else (network._links, LINK_TYPES)
+    )
+    attributes = list(attributes)
+    rows = [
+        (
+            component.id,
+            type(component).__name__,
+            *(getattr(component, attribute, None) for attribute in attributes),
+        )
+        for name in types
+        for component in registry[name].values()
+    ]
+    table = pd.DataFrame(rows, columns=["id", "type", *attributes])
+    if values is not None:
+        if isinstance(values, pd.Series):
+            if values.name is None:
+                raise ValueError(
+                    "The values have no name, name the Series to add it as a property."
+                )
+            values = values.to_frame()
+        unknown = [str(label) for label in values.index.difference(table["id"])]
+        if unknown:
+            raise ValueError(
+                f"The values are not indexed by {kind[:-1]} IDs (e.g., {unknown[:3]}). Results of extended period "
+                f"simulations have to be reduced to one value per element first (e.g., rpt.pressure.loc[time] or "
+                f"rpt.pressure.max())."
+            )
+        columns = [str(column) for column in values.columns]
+        clashes = sorted(
+            {column for column in columns if column in table.columns}
+            | {column for column in columns if columns.count(column) > 1}
+        )
+        if clashes:
+            raise ValueError(
+                f"The property names {clashes} are used more than once, rename the values."
+            )
+        joined = values.reindex(table["id"])
+        joined.columns = columns
+        table = pd.concat([table, joined.reset_index(drop=True)], axis=1)
+    return table
@@ -0,0 +1,187 @@
+from __future__ import annotations
+from typing import Callable, Iterable, Optional, Union, TYPE_CHECKING
+import logging
+
+import numpy as np
+import pandas as pd
+from xarray import DataArray
+
+if TYPE_CHECKING:
+    from oopnet.report.report import SimulationReport
+    from oopnet.report.collection import ReportCollection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRECISION = {"Flow": 3, "Pressure": 2}
+
+
+class SensorLayout:
+    """Sensor positions for extracting simulated measurements from simulation results.
+
+    The integer positions of the sensor IDs and variables in the result arrays are computed once and reused as long as
+    the results contain the same elements and variables. Measurements of single period and extended period reports and
+    of report ensembles are extracted with a single pointwise selection per element kind, so only the sensor values are
+    loaded from memory-mapped or lazy (e.g., dask backed) results. Noise and rounding are applied to all measurements at
+    once.
+
+    The measurements are ordered by sensor type (sorted alphabetically) and by the order of the IDs passed for each
+    type, see the attribute labels. Every sensor ID is looked up in the Node and in the Link results, so variables
+    reported for both element kinds (e.g., "Quality") can be measured at Nodes and Links. measure raises a KeyError if
+    a sensor is found in neither of them and a ValueError if its ID is found in both.
+
+    Example:
+      >>> layout = SensorLayout({"Flow": ["P-01"], "Pressure": ["J-05", "J-10"]}, noise={"Pressure": 0.1})
+      >>> measurements = layout.measure(rpt)
+
+    Args:
+      sensors: dictionary mapping report variables (e.g., "Flow" and "Pressure") to lists of Node or Link IDs
+      precision: dictionary mapping report variables to the number of decimals measurements are rounded to, defaults to 3 decimals for flows and 2 for pressures, variables without precision are not rounded
+      noise: dictionary mapping report variables to the standard deviation of normally distributed measurement errors or to a function taking the measurements and a numpy random Generator and returning the noisy measurements
+
+    Attributes:
+      labels: list of (variable, ID) tuples describing the measurements
+
+    Raises:
+      ValueError: if noise is passed for a variable without sensors
+
+    """
+
+    def __init__(
+        self,
+        sensors: dict[str, Iterable[str]],
+        precision: Optional[dict[str, int]] = None,
+        noise: Optional[dict[str, Union[float, Callable]]] = None,
+    ):
+        self.sensors = {what: list(sensors[what]) for what in sorted(sensors)}
+        self.precision = DEFAULT_PRECISION if precision is None else precision
+        self.noise = noise or {}
+        unknown = set(self.noise) - set(self.sensors)
+        if unknown:
+            raise ValueError(
+                f"No sensors defined for the noisy variables {sorted(unknown)}."
+            )
+        self.labels = [(what, id) for what, ids in self.sensors.items() for id in ids]
+        self._slices = {}
+        start = 0
+        for what, ids in self.sensors.items():
+            self._slices[what] = slice(start, start + len(ids))
+            start += len(ids)
+        self._positions = {}
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def _get_positions(
+        self, kind: str, array: DataArray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the cached positions of the sensors in an array or computes them if the array's coordinates changed.
+
+        Sensors whose variable or ID is not contained in the array are skipped.
+
+        Returns:
+            ID positions, variable positions and measurement vector positions of the sensors found in the array
+
+        """
+        ids = array["id"].values
+        variables = array["vars"].values
+        cached = self._positions.get(kind)
+        if (
+            cached is not None
+            and np.array_equal(cached[0], ids)
+            and np.array_equal(cached[1], variables)
+        ):
+            return cached[2]
+
+        logger.debug(f"Computing sensor positions in {kind} results")
+        index = pd.Index(ids)
+        rows, columns, targets = [], [], []
+        for what, sensor_ids in self.sensors.items():
+            if what not in variables:
+                continue
+            positions = index.get_indexer(sensor_ids)
+            contained = positions >= 0
+            rows.append(positions[contained])
+            columns.append(np.full(contained.sum(), list(variables).index(what)))
+            targets.append(np.flatnonzero(contained) + self._slices[what].start)
+        positions = (
+            np.concatenate(rows) if rows else np.array([], dtype=int),
+            np.concatenate(columns) if columns else np.array([], dtype=int),
+            np.concatenate(targets) if targets else np.array([], dtype=int),
+        )
+        self._positions[kind] = (ids, variables, positions)
+        return positions
+
+    def _extract(
+        self, results: Union[SimulationReport, ReportCollection]
+    ) -> np.ndarray:
+        arrays = {}
+        for kind in ("nodes", "links"):
+            array = getattr(results, kind)
+            if array is not None:
+                arrays[kind] = (array, self._get_positions(kind, array))
+
+        counts = np.zeros(len(self), dtype=int)
+        for _, (_, _, targets) in arrays.values():
+            counts[targets] += 1
+        if (counts == 0).any():
+            missing = [self.labels[i] for i in np.flatnonzero(counts == 0)]
+            raise KeyError(f"No simulation results found for the sensors {missing}.")
+        if (counts > 1).any():
+            ambiguous = [self.labels[i] for i in np.flatnonzero(counts > 1)]
+            raise ValueError(
+                f"The sensors {ambiguous} match both a Node and a Link in the simulation results."
+            )
+
+        out = None
+        for array, (rows, columns, targets) in arrays.values():
+            if not len(targets):
+                continue
+            values = array.isel(
+                id=DataArray(rows, dims="sensor"),
+                vars=DataArray(columns, dims="sensor"),
+            )
+            values = np.asarray(values.transpose(..., "sensor").values)
+            if out is None:
+                out = np.full((*values.shape[:-1], len(self)), np.nan)
+            out[..., targets] = values
+        return out
+
+    def measure(
+        self,
+        results: Union[SimulationReport, ReportCollection, Iterable[SimulationReport]],
+        rng: Union[None, int, np.random.Generator] = None,
+    ) -> np.ndarray:
+        """Extracts measurements from simulation results.
+
+        Args:
+          results: a SimulationReport, a ReportCollection or a list of SimulationReports
+          rng: numpy random Generator or seed used for the noise
+
+        Returns:
+          numpy array with the measurements along the last axis. The leading axes are scenario (ReportCollection or list
+          of reports) and time (extended period simulations).
+
+        """
+        if hasattr(results, "nodes"):
+            measurements = self._extract(results)
+        else:
+            measurements = np.stack([self._extract(report) for report in results])
+
+        if self.noise:
+            rng = np.random.default_rng(rng)
+            for what, model in self.noise.items():
+                part = self._slices[what]
+                if callable(model):
+                    measurements[..., part] = model(measurements[..., part], rng)
+                else:
+                    measurements[..., part] += rng.normal(
+                        0.0, model, measurements[..., part].shape
+                    )
+
+        for what, part in self._slices.items():
+            decimals = self.precision.get(what)
+            if decimals is not None:
+                measurements[..., part] = np.around(
+                    measurements[..., part], decimals=decimals
+                )
+        return measurements
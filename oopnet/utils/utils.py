@@ -8,6 +8,7 @@ import numpy as np
 if TYPE_CHECKING:
     from oopnet.elements.network_components import Junction, Pipe
 from oopnet.report.report import SimulationReport
+from oopnet.utils.sensors import SensorLayout
 
 
 def mkdir(newdir: str):
@@ -48,28 +49,15 @@ def make_measurement(
       sensors: dict with keys 'Flow' and/or 'Pressure' containing the node- resp. linkids as list
     -> {'Flow':['flowsensor1', 'flowsensor2], 'Pressure':['sensor1', 'sensor2', 'sensor3']}
       precision: dict with keys 'Flow' and/or 'Pressure' and number of decimals -> {'Flow':3, 'Pressure':2}
-      report: SimulationReport:
-      sensors: dict:
-      precision: Optional[dict]:  (Default value = None)
 
     Returns:
       numpy vector containing the measurements
 
+    Use a SensorLayout object instead if measurements are taken repeatedly (e.g., in a calibration loop), since it
+    caches the sensor positions and supports noise, time series and ensembles.
+
     """
-    vec = np.ndarray(0)
-    for what in sorted(sensors.keys()):
-        if what == "Flow":
-            dec = 3 if precision is None else precision[what]
-            vec = np.around(
-                np.concatenate((vec, report.flow[sensors[what]].values)), decimals=dec
-            )
-        elif what == "Pressure":
-            dec = 2 if precision is None else precision[what]
-            vec = np.around(
-                np.concatenate((vec, report.pressure[sensors[what]].values)),
-                decimals=dec,
-            )
-    return vec
+    return SensorLayout(sensors, precision).measure(report)
 
 
 def copy(network):
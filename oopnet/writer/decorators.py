@@ -1,4 +1,5 @@
-from typing import Optional, Callable
+from typing import Optional, Callable, Sequence
+import bisect
 
 
 class WriterDecorator:
@@ -9,6 +10,10 @@ class WriterDecorator:
         functionname:
         priority:
         writerfunction:
+        dependencies: ComponentRegistries the section depends on (e.g., "junctions" or "nodes"), optionally restricted
+          to their IDs ("nodes:ids"), their geometry ("links:geometry") or a single attribute ("nodes:initialquality").
+          Sections without dependencies are rendered on every write, all others are cached until one of their
+          dependencies changes.
 
     """
 
@@ -19,11 +24,57 @@ class WriterDecorator:
         functionname: Optional[str] = None,
         priority: Optional[int] = None,
         writerfunction: Optional[Callable] = None,
+        dependencies: Optional[Sequence[str]] = None,
     ):
         self.sectionname = sectionname
         self.functionname = functionname
         self.priority = priority
         self.writerfunction = writerfunction
+        self.dependencies = dependencies
+
+
+_section_writers: list[WriterDecorator] = []
+
+
+def register_section_writer(
+    title: str,
+    priority: int,
+    writerfunction: Callable,
+    dependencies: Optional[Sequence[str]] = None,
+    functionname: Optional[str] = None,
+) -> WriterDecorator:
+    """Adds a section writer to the writer dispatch table.
+
+    The dispatch table is ordered by priority. Section writers with identical priorities are called in the order they
+    were registered. If a section writer for the same section title already exists, it is replaced.
+
+    Args:
+      title: section title
+      priority: write priority
+      writerfunction: callable that takes a Network and an output object as arguments
+      dependencies: ComponentRegistries the section's content depends on (see WriterDecorator)
+      functionname: name of the section writer (defaults to the callable's name)
+
+    Returns:
+        the registered section writer
+
+    """
+    writer = WriterDecorator(
+        sectionname=title,
+        functionname=functionname or writerfunction.__name__,
+        priority=priority,
+        writerfunction=writerfunction,
+        dependencies=dependencies,
+    )
+    _section_writers[:] = [x for x in _section_writers if x.sectionname != title]
+    index = bisect.bisect_right([x.priority for x in _section_writers], priority)
+    _section_writers.insert(index, writer)
+    return writer
+
+
+def get_section_writers() -> list[WriterDecorator]:
+    """Returns all registered section writers ordered by their priority."""
+    return list(_section_writers)
 
 
 def make_registering_decorator_factory(foreign_decorator_factory):
@@ -70,12 +121,19 @@ def make_registering_decorator_factory(foreign_decorator_factory):
     return new_decorator_factory
 
 
-def section_writer(title: str, priority: int):
+def section_writer(
+    title: str, priority: int, dependencies: Optional[Sequence[str]] = None
+):
     """Synchronization decorator
 
+    Decorated functions are added to the writer dispatch table on decoration (see register_section_writer). This can
+    be used to add custom sections or to replace existing section writers.
+
     Args:
       title: section title
       priority: write priority
+      dependencies: ComponentRegistries the section's content depends on (see WriterDecorator). If None, the section
+        is rendered again on every write.
 
     Returns:
 
@@ -103,6 +161,13 @@ def section_writer(title: str, priority: int):
             """
             return f(*args, **kw)
 
+        register_section_writer(
+            title,
+            priority,
+            new_function,
+            dependencies=dependencies,
+            functionname=f.__name__,
+        )
         return new_function
 
     return wrap
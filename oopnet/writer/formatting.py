@@ -0,0 +1,55 @@
+from typing import Iterable, Optional
+
+# maximum number of characters and values per line EPANET reads from an input file
+MAX_LINE_LENGTH = 1024
+MAX_LINE_TOKENS = 40
+
+
+def format_line(*values, comment: Optional[str] = None) -> str:
+    """Joins values to a single EPANET input file line.
+
+    Trailing None values (omitted optional fields) are skipped, all other values are converted with str() and
+    separated by spaces. If a comment is passed, it is appended to the line after a semicolon.
+
+    Args:
+      *values: values to be written to the line
+      comment: optional comment
+
+    Returns:
+        formatted line without a trailing newline character
+
+    Raises:
+        ValueError: if a None value is followed by other values, skipping it would shift them into the wrong columns
+
+    """
+    end = len(values)
+    while end and values[end - 1] is None:
+        end -= 1
+    if any(value is None for value in values[:end]):
+        raise ValueError(
+            f"Cannot write {values!r}: only trailing values may be omitted (None)."
+        )
+    line = " ".join([str(value) for value in values[:end]])
+    if comment is not None:
+        line = f"{line} ; {comment}"
+    return line
+
+
+def format_section(
+    title: str, lines: Iterable[str], columns: Optional[str] = None
+) -> str:
+    """Renders a complete EPANET input file section.
+
+    Args:
+      title: section title without brackets (e.g., "JUNCTIONS")
+      lines: already formatted section lines
+      columns: optional column description that is written as a comment below the section title
+
+    Returns:
+        section text including the section title and a trailing blank line
+
+    """
+    header = [f"[{title}]"]
+    if columns is not None:
+        header.append(f";{columns}")
+    return "\n".join([*header, *lines]) + "\n\n"
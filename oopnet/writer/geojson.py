@@ -0,0 +1,346 @@
+from __future__ import annotations
+from typing import Iterable, Iterator, Optional, TextIO, TYPE_CHECKING, Union
+import json
+import logging
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from oopnet.elements.geometry import NetworkGeometry, douglas_peucker
+from oopnet.utils.getters.property_getters import get_property_table
+
+if TYPE_CHECKING:
+    from oopnet.elements.network import Network
+
+logger = logging.getLogger(__name__)
+
+# component attributes exported by default, missing attributes (e.g., the length of a Pump) are exported as null
+NODE_ATTRIBUTES = ("elevation",)
+LINK_ATTRIBUTES = ("length", "diameter", "roughness", "status")
+# number of features serialized at once
+DEFAULT_CHUNKSIZE = 10000
+# tile resolution used to derive the simplification tolerance of a zoom level
+DEFAULT_TILE_EXTENT = 256
+
+
+def _json_value(value):
+    """Converts attribute values to JSON compatible values, NaN values become null."""
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    return str(value)
+
+
+def _coordinates(points: np.ndarray, precision: Optional[int]) -> list:
+    if precision is not None:
+        points = np.round(points, precision)
+    return points.tolist()
+
+
+def _features(
+    table: pd.DataFrame,
+    indices: np.ndarray,
+    geometries: Iterator[dict],
+) -> Iterator[str]:
+    """Serializes the features of the elements at indices one after another."""
+    columns = list(table.columns)
+    records = table.iloc[indices].itertuples(index=False, name=None)
+    for record, geometry in zip(records, geometries):
+        properties = {
+            column: _json_value(value) for column, value in zip(columns, record)
+        }
+        yield json.dumps(
+            {"type": "Feature", "geometry": geometry, "properties": properties}
+        )
+
+
+def _node_features(
+    geometry: NetworkGeometry,
+    table: pd.DataFrame,
+    indices: np.ndarray,
+    precision: Optional[int],
+) -> Iterator[str]:
+    points = _coordinates(geometry.node_xy[indices], precision)
+    return _features(
+        table,
+        indices,
+        ({"type": "Point", "coordinates": point} for point in points),
+    )
+
+
+def _link_features(
+    vertices: np.ndarray,
+    offsets: np.ndarray,
+    table: pd.DataFrame,
+    indices: np.ndarray,
+    precision: Optional[int],
+) -> Iterator[str]:
+    lines = (
+        {
+            "type": "LineString",
+            "coordinates": _coordinates(
+                vertices[offsets[index] : offsets[index + 1]], precision
+            ),
+        }
+        for index in indices
+    )
+    return _features(table, indices, lines)
+
+
+def _write_collection(fid: TextIO, chunks: Iterator[Iterator[str]]) -> int:
+    """Writes a GeoJSON FeatureCollection chunk by chunk.
+
+    Returns:
+        number of written features
+
+    """
+    fid.write('{"type": "FeatureCollection", "features": [\n')
+    count = 0
+    for chunk in chunks:
+        features = list(chunk)
+        if not features:
+            continue
+        if count:
+            fid.write(",\n")
+        fid.write(",\n".join(features))
+        count += len(features)
+    fid.write("\n]}\n")
+    return count
+
+
+def _chunks(n: int, chunksize: int) -> Iterator[np.ndarray]:
+    for start in range(0, n, chunksize):
+        yield np.arange(start, min(start + chunksize, n))
+
+
+def write_geojson(
+    network: Network,
+    filename: Union[str, TextIO],
+    nodes: Union[pd.Series, pd.DataFrame, None] = None,
+    links: Union[pd.Series, pd.DataFrame, None] = None,
+    node_attributes: Iterable[str] = NODE_ATTRIBUTES,
+    link_attributes: Iterable[str] = LINK_ATTRIBUTES,
+    tolerance: float = 0.0,
+    precision: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    elements: Iterable[str] = ("nodes", "links"),
+) -> int:
+    """Writes the Nodes and Links of a Network as a GeoJSON FeatureCollection.
+
+    Nodes are written as Points and Links as LineStrings (start Node, vertices, end Node). Every feature has the
+    properties "id", "type" (e.g., "Junction" or "PRV"), the requested component attributes and the joined result
+    values. The features are serialized and written in chunks of chunksize features, so the whole document is never
+    held in memory. The coordinates are written in the Network's coordinate system.
+
+    Example:
+      >>> write_geojson(network, "network.geojson", nodes=rpt.pressure, links=rpt.flow, tolerance=1.0)
+
+    Args:
+      network: OOPNET network object
+      filename: path or file object the GeoJSON document is written to
+      nodes: Node results joined by ID (e.g., rpt.pressure of a single period simulation or a DataFrame of statistics)
+      links: Link results joined by ID (e.g., rpt.flow)
+      node_attributes: Node attributes added as properties
+      link_attributes: Link attributes added as properties
+      tolerance: Douglas-Peucker tolerance (in map units) the Link vertices are simplified with, 0 keeps all vertices
+      precision: number of decimals the coordinates are rounded to
+      chunksize: number of features serialized at once
+      elements: element kinds to be written ("nodes" and/or "links")
+
+    Returns:
+      number of written features
+
+    """
+    elements = list(elements)
+    geometry = network.geometry
+    vertices, offsets = geometry.vertices, geometry.offsets
+    if tolerance > 0:
+        vertices, offsets = douglas_peucker(vertices, offsets, tolerance)
+        logger.debug(
+            f"Simplified {len(geometry.vertices)} to {len(vertices)} link vertices"
+        )
+
+    def chunks() -> Iterator[Iterator[str]]:
+        if "nodes" in elements:
+            table = get_property_table(network, "nodes", node_attributes, nodes)
+            for indices in _chunks(len(geometry.node_ids), chunksize):
+                yield _node_features(geometry, table, indices, precision)
+        if "links" in elements:
+            table = get_property_table(network, "links", link_attributes, links)
+            for indices in _chunks(len(geometry.link_ids), chunksize):
+                yield _link_features(vertices, offsets, table, indices, precision)
+
+    if isinstance(filename, str):
+        with open(filename, "w") as fid:
+            return _write_collection(fid, chunks())
+    return _write_collection(filename, chunks())
+
+
+def _tile_ranges(
+    bounds: np.ndarray, origin: np.ndarray, size: float, n_tiles: int
+) -> np.ndarray:
+    """Computes the tiles covered by bounding boxes.
+
+    Args:
+      bounds: bounding boxes (xmin, ymin, xmax, ymax) with the shape (n, 4)
+      origin: upper left corner of the tiled area
+      size: tile size in map units
+      n_tiles: number of tiles per row and column
+
+    Returns:
+        array with the first and last tile column and row (x0, y0, x1, y1) of every bounding box, rows are counted
+        from the top
+
+    """
+    x = (bounds[:, [0, 2]] - origin[0]) / size
+    y = (origin[1] - bounds[:, [3, 1]]) / size
+    ranges = np.floor(np.column_stack([x[:, 0], y[:, 0], x[:, 1], y[:, 1]]))
+    return np.clip(ranges, 0, n_tiles - 1).astype(int)
+
+
+def _tile_members(ranges: np.ndarray, n_tiles: int) -> tuple[np.ndarray, np.ndarray]:
+    """Assigns elements to all tiles their bounding boxes overlap.
+
+    Returns:
+        tile numbers (row * n_tiles + column) and element positions sorted by tile
+
+    """
+    columns = ranges[:, 2] - ranges[:, 0] + 1
+    rows = ranges[:, 3] - ranges[:, 1] + 1
+    counts = columns * rows
+    elements = np.repeat(np.arange(len(ranges)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    x = ranges[elements, 0] + local % columns[elements]
+    y = ranges[elements, 1] + local // columns[elements]
+    tiles = y * n_tiles + x
+    order = np.argsort(tiles, kind="stable")
+    return tiles[order], elements[order]
+
+
+def write_geojson_tiles(
+    network: Network,
+    directory: str,
+    min_zoom: int = 0,
+    max_zoom: int = 4,
+    nodes: Union[pd.Series, pd.DataFrame, None] = None,
+    links: Union[pd.Series, pd.DataFrame, None] = None,
+    node_attributes: Iterable[str] = NODE_ATTRIBUTES,
+    link_attributes: Iterable[str] = LINK_ATTRIBUTES,
+    extent: int = DEFAULT_TILE_EXTENT,
+    precision: Optional[int] = None,
+) -> int:
+    """Writes the Nodes and Links of a Network as a pyramid of GeoJSON tiles.
+
+    The square enclosing the Network is split into 2^z x 2^z tiles at zoom level z. The tiles are written to
+    directory/{z}/{x}/{y}.geojson, x counts the columns from the left and y the rows from the top, like web map tiles.
+    Every feature is written to all tiles its bounding box overlaps. The Link vertices of a zoom level are simplified
+    with the Douglas-Peucker algorithm with a tolerance of one pixel of a tile with extent x extent pixels. Empty tiles
+    are skipped. The tiled area, zoom levels and extent are stored in directory/metadata.json.
+
+    The coordinates are written in the Network's coordinate system, the tile assignment and simplification are computed
+    with NumPy for all elements of a zoom level at once and the tiles are written one after another.
+
+    Args:
+      network: OOPNET network object
+      directory: output directory
+      min_zoom: lowest zoom level
+      max_zoom: highest zoom level
+      nodes: Node results joined by ID
+      links: Link results joined by ID
+      node_attributes: Node attributes added as properties
+      link_attributes: Link attributes added as properties
+      extent: tile resolution in pixels used to derive the simplification tolerance
+      precision: number of decimals the coordinates are rounded to
+
+    Returns:
+      number of written tiles
+
+    """
+    if not 0 <= min_zoom <= max_zoom:
+        raise ValueError(
+            f"Invalid zoom levels {min_zoom} to {max_zoom}, 0 <= min_zoom <= max_zoom is required."
+        )
+    geometry = network.geometry
+    points = np.concatenate([geometry.node_xy, geometry.vertices])
+    if not len(points):
+        raise ValueError("The Network has no elements to be written.")
+    lower, upper = points.min(axis=0), points.max(axis=0)
+    side = float((upper - lower).max()) or 1.0
+    origin = np.array([lower[0], lower[1] + side])
+
+    node_table = get_property_table(network, "nodes", node_attributes, nodes)
+    link_table = get_property_table(network, "links", link_attributes, links)
+    node_bounds = np.column_stack([geometry.node_xy, geometry.node_xy])
+
+    n_written = 0
+    for zoom in range(min_zoom, max_zoom + 1):
+        n_tiles = 2**zoom
+        size = side / n_tiles
+        vertices, offsets = douglas_peucker(
+            geometry.vertices, geometry.offsets, size / extent
+        )
+        starts = offsets[:-1]
+        link_bounds = (
+            np.column_stack(
+                [
+                    np.minimum.reduceat(vertices[:, 0], starts),
+                    np.minimum.reduceat(vertices[:, 1], starts),
+                    np.maximum.reduceat(vertices[:, 0], starts),
+                    np.maximum.reduceat(vertices[:, 1], starts),
+                ]
+            )
+            if len(starts)
+            else np.empty((0, 4))
+        )
+
+        members = {}
+        for kind, bounds in (("nodes", node_bounds), ("links", link_bounds)):
+            tiles, elements = _tile_members(
+                _tile_ranges(bounds, origin, size, n_tiles), n_tiles
+            )
+            unique, first = np.unique(tiles, return_index=True)
+            for tile, part in zip(unique, np.split(elements, first[1:])):
+                members.setdefault(tile, {})[kind] = part
+
+        for tile in sorted(members):
+            y, x = divmod(int(tile), n_tiles)
+            path = os.path.join(directory, str(zoom), str(x))
+            os.makedirs(path, exist_ok=True)
+            elements = members[tile]
+            chunks = []
+            if "nodes" in elements:
+                chunks.append(
+                    _node_features(geometry, node_table, elements["nodes"], precision)
+                )
+            if "links" in elements:
+                chunks.append(
+                    _link_features(
+                        vertices, offsets, link_table, elements["links"], precision
+                    )
+                )
+            with open(os.path.join(path, f"{y}.geojson"), "w") as fid:
+                _write_collection(fid, iter(chunks))
+        logger.debug(f"Wrote {len(members)} tiles of zoom level {zoom}")
+        n_written += len(members)
+
+    with open(os.path.join(directory, "metadata.json"), "w") as fid:
+        json.dump(
+            {
+                "bounds": [
+                    float(lower[0]),
+                    float(lower[1]),
+                    float(lower[0] + side),
+                    float(lower[1] + side),
+                ],
+                "min_zoom": min_zoom,
+                "max_zoom": max_zoom,
+                "extent": extent,
+            },
+            fid,
+        )
+    return n_written
@@ -1,8 +1,12 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, TextIO, Union
+from copy import deepcopy
+import io
 import logging
 
-from oopnet.writer.module_reader import list_section_writer_callables
+from oopnet.writer.decorators import WriterDecorator, get_section_writers
+
+# the writing modules register their section writers on import
 from oopnet.writer.writing_modules import (
     write_system_operation,
     write_network_map_tags,
@@ -10,41 +14,149 @@ from oopnet.writer.writing_modules import (
     write_options_and_reporting,
     write_network_components,
 )
+from oopnet.reader.unit_converter.convert import convert
 from oopnet.utils.oopnet_logging import logging_decorator
 
 if TYPE_CHECKING:
     from oopnet.elements.network import Network
+    from oopnet.elements.component_registry import (
+        ComponentRegistry,
+        SuperComponentRegistry,
+    )
 
 logger = logging.getLogger(__name__)
 
 
+def _get_registry(
+    network: Network, name: str
+) -> Union[ComponentRegistry, SuperComponentRegistry]:
+    """Returns a Network's ComponentRegistry or SuperComponentRegistry by its name.
+
+    Args:
+      network: OOPNET network object
+      name: registry name (e.g., "nodes", "junctions", "links", "pipes", "curves")
+
+    Returns:
+        requested registry
+
+    """
+    if name == "nodes":
+        return network._nodes
+    elif name == "links":
+        return network._links
+    elif name in network._nodes:
+        return network._nodes[name]
+    elif name in network._links:
+        return network._links[name]
+    return getattr(network, f"_{name}")
+
+
+def _get_version(network: Network, dependency: str) -> tuple:
+    """Returns the version of a section dependency.
+
+    A dependency is either a registry name (any change), or a registry name followed by ":ids" (components added,
+    removed or renamed), ":geometry" (components added, removed or moved) or ":<attribute>" (components added, removed,
+    renamed or the attribute reassigned).
+
+    Args:
+      network: OOPNET network object
+      dependency: dependency specification (e.g., "junctions", "nodes:ids", "links:geometry" or "nodes:initialquality")
+
+    Returns:
+        tuple of the registry's identity and its version(s)
+
+    """
+    name, _, qualifier = dependency.partition(":")
+    registry = _get_registry(network, name)
+    if not qualifier:
+        return id(registry), registry.version
+    elif qualifier == "ids":
+        return id(registry), registry.id_version
+    elif qualifier == "geometry":
+        return id(registry), registry.geometry_version
+    return id(registry), registry.id_version, registry.attribute_version(qualifier)
+
+
+def _write_section(
+    network: Network, writer: WriterDecorator, fid: TextIO, cache: bool = False
+):
+    """Writes a single section either from the Network's section cache or by calling the section writer.
+
+    The cache entries are validated with a change token built from the versions of the section's dependencies (see
+    _get_version). Sections without dependencies are always rendered again.
+
+    Args:
+      network: OOPNET network object
+      writer: section writer
+      fid: output object
+      cache: if False, the section is always rendered again and the cache is neither read nor updated
+
+    """
+    if not cache or writer.dependencies is None:
+        writer.writerfunction(network, fid)
+        return
+
+    token = tuple(
+        _get_version(network, dependency) for dependency in writer.dependencies
+    )
+    cached = network._section_cache.get(writer.sectionname)
+    if cached is not None and cached[0] == token:
+        fid.write(cached[1])
+        return
+
+    buffer = io.StringIO()
+    writer.writerfunction(network, buffer)
+    content = buffer.getvalue()
+    network._section_cache[writer.sectionname] = (token, content)
+    fid.write(content)
+
+
 @logging_decorator(logger)
-def write(network: Network, filename: str) -> int:
+def write(
+    network: Network,
+    filename: Union[str, TextIO],
+    units: Optional[str] = None,
+    cache: bool = False,
+) -> int:
     """Converts an OOPNET network to an EPANET input file and saves it with a desired filename.
 
+    Instead of a filename, any writable text stream (e.g., an open file or an io.StringIO object) can be passed. The
+    stream is neither rewound nor closed after writing.
+
+    With cache=True, the rendered text of sections describing network components is cached on the Network and only
+    rendered again if components were added, removed or had one of their attributes reassigned. In-place
+    modifications of mutable attribute values (e.g., `pattern.multipliers.append(1.2)`, changing a Junction's demand
+    list or appending a Vertex) are not detected and lead to outdated sections. Only enable the cache for repeated
+    writes of a Network whose attributes are always reassigned (e.g., `pattern.multipliers = new_multipliers`).
+
+    If units are passed, a converted copy of the network is written (e.g., units="GPM" writes the network in US
+    customary units). The network itself is not modified.
+
     Args:
       network: OOPNET network object which one wants to be written to a file
-      filename: desired filename/path were the user wants to store the file
+      filename: desired filename/path were the user wants to store the file or a writable text stream
+      units: EPANET flow units the file should be written in, defaults to the network's units
+      cache: if True, sections of unchanged components are taken from the Network's section cache
 
     Returns:
       0 if successful
 
     """
-    logger.info(f"Writing network to {filename!r}")
+    if units is not None and units != network.options.units:
+        network = deepcopy(network)
+        convert(network, units)
 
-    modules = [
-        write_network_components,
-        write_network_map_tags,
-        write_options_and_reporting,
-        write_system_operation,
-        write_water_quality,
-    ]
+    newlist = get_section_writers()
 
-    all_functions = list_section_writer_callables(modules)
+    if hasattr(filename, "write"):
+        logger.info("Writing network to stream")
+        for f in newlist:
+            _write_section(network, f, filename, cache)
+        return 0
 
-    newlist = sorted(all_functions, key=lambda x: x.priority)
+    logger.info(f"Writing network to {filename!r}")
     with open(filename, "w") as fid:
         for f in newlist:
-            f.writerfunction(network, fid)
+            _write_section(network, f, fid, cache)
 
     return 0
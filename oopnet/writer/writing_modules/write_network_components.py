@@ -14,13 +14,46 @@ from oopnet.utils.getters.element_lists import (
     get_valves,
 )
 from oopnet.writer.decorators import section_writer
+from oopnet.writer.formatting import format_line, format_section
 
 if TYPE_CHECKING:
     from oopnet.elements.network import Network
+    from oopnet.elements.network_components import Link, Valve
 
 logger = logging.getLogger(__name__)
 
 
+def _first(value):
+    """Returns the first item of a list or the value itself if it is not a list."""
+    return value[0] if isinstance(value, list) else value
+
+
+def _id_or_none(component):
+    """Returns a component's ID or None if no component was passed."""
+    return component.id if component is not None else None
+
+
+def _end_node_ids(link: Link) -> tuple:
+    """Returns the start and end node IDs of a Link."""
+    return _id_or_none(link.startnode), _id_or_none(link.endnode)
+
+
+def _valve_setting(valve: Valve):
+    """Returns the setting of a Valve as it has to be written to an EPANET input file."""
+    if isinstance(valve, PRV):
+        return valve.maximum_pressure
+    elif isinstance(valve, TCV):
+        return valve.headloss_coefficient
+    elif isinstance(valve, PSV):
+        return valve.pressure_limit
+    elif isinstance(valve, GPV):
+        return valve.headloss_curve.id
+    elif isinstance(valve, PBV):
+        return valve.pressure_drop
+    elif isinstance(valve, FCV):
+        return valve.maximum_flow
+
+
 @section_writer("TITLE", 0)
 def write_title(network: Network, fid: TextIOWrapper):
     """Writes the Network title to an EPANET input file.
@@ -31,13 +64,11 @@ def write_title(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing title")
-    print("[TITLE]", file=fid)
-    if network.title:
-        print(network.title, file=fid)
-    print("\n", file=fid)
+    lines = [network.title] if network.title else []
+    fid.write(format_section("TITLE", lines))
 
 
-@section_writer("JUNCTIONS", 1)
+@section_writer("JUNCTIONS", 1, dependencies=("junctions", "patterns:ids"))
 def write_junctions(network: Network, fid: TextIOWrapper):
     """Writes Junctions to an EPANET input file.
 
@@ -47,27 +78,20 @@ def write_junctions(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Junctions section")
-    print("[JUNCTIONS]", file=fid)
-    print(";id elevation demand demandpattern", file=fid)
-    for j in get_junctions(network):
-        print(j.id, end=" ", file=fid)
-        print(j.elevation, end=" ", file=fid)
-        if isinstance(j.demand, list):
-            print(j.demand[0], end=" ", file=fid)
-        else:
-            print(j.demand, end=" ", file=fid)
-        if j.demandpattern is not None:
-            if isinstance(j.demandpattern, list):
-                print(j.demandpattern[0].id, end=" ", file=fid)
-            else:
-                print(j.demandpattern.id, end=" ", file=fid)
-        if j.comment is not None:
-            print(";", j.comment, end=" ", file=fid)
-        print("\n", end=" ", file=fid)
-    print("\n", end=" ", file=fid)
-
-
-@section_writer("RESERVOIRS", 1)
+    lines = [
+        format_line(
+            j.id,
+            j.elevation,
+            _first(j.demand),
+            _id_or_none(_first(j.demandpattern)),
+            comment=j.comment,
+        )
+        for j in get_junctions(network)
+    ]
+    fid.write(format_section("JUNCTIONS", lines, "id elevation demand demandpattern"))
+
+
+@section_writer("RESERVOIRS", 1, dependencies=("reservoirs", "patterns:ids"))
 def write_reservoirs(network: Network, fid: TextIOWrapper):
     """Writes Reservoirs to an EPANET input file.
 
@@ -77,20 +101,14 @@ def write_reservoirs(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Reservoirs section")
-    print("[RESERVOIRS]", file=fid)
-    print(";id head pattern", file=fid)
-    for r in get_reservoirs(network):
-        print(r.id, end=" ", file=fid)
-        print(r.head, end=" ", file=fid)
-        if r.headpattern is not None:
-            print(r.headpattern.id, end=" ", file=fid)
-        if r.comment is not None:
-            print(";", r.comment, end=" ", file=fid)
-        print("\n", end=" ", file=fid)
-    print("\n", end=" ", file=fid)
-
-
-@section_writer("TANKS", 1)
+    lines = [
+        format_line(r.id, r.head, _id_or_none(r.headpattern), comment=r.comment)
+        for r in get_reservoirs(network)
+    ]
+    fid.write(format_section("RESERVOIRS", lines, "id head pattern"))
+
+
+@section_writer("TANKS", 1, dependencies=("tanks", "curves:ids"))
 def write_tanks(network: Network, fid: TextIOWrapper):
     """Writes tanks to an EPANET input file.
 
@@ -100,29 +118,30 @@ def write_tanks(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Tanks section")
-    print("[TANKS]", file=fid)
-    print(
-        ";id elevation initlevel minlevel maxlevel diameter minvolume volumecurve",
-        file=fid,
+    lines = [
+        format_line(
+            t.id,
+            t.elevation,
+            t.initlevel,
+            t.minlevel,
+            t.maxlevel,
+            t.diameter,
+            t.minvolume,
+            _id_or_none(t.volumecurve),
+            comment=t.comment,
+        )
+        for t in get_tanks(network)
+    ]
+    fid.write(
+        format_section(
+            "TANKS",
+            lines,
+            "id elevation initlevel minlevel maxlevel diameter minvolume volumecurve",
+        )
     )
-    for t in get_tanks(network):
-        print(t.id, end=" ", file=fid)
-        print(t.elevation, end=" ", file=fid)
-        print(t.initlevel, end=" ", file=fid)
-        print(t.minlevel, end=" ", file=fid)
-        print(t.maxlevel, end=" ", file=fid)
-        print(t.diameter, end=" ", file=fid)
-        if t.minvolume is not None:
-            print(t.minvolume, end=" ", file=fid)
-        if t.volumecurve is not None:
-            print(t.volumecurve.id, end=" ", file=fid)
-        if t.comment is not None:
-            print(";", t.comment, end=" ", file=fid)
-        print("\n", end=" ", file=fid)
-    print("\n", end=" ", file=fid)
-
-
-@section_writer("PIPES", 2)
+
+
+@section_writer("PIPES", 2, dependencies=("pipes", "nodes:ids"))
 def write_pipes(network: Network, fid: TextIOWrapper):
     """Writes pipes to an EPANET input file.
 
@@ -132,29 +151,29 @@ def write_pipes(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Pipes section")
-    print("[PIPES]", file=fid)
-    print(
-        ";id startnode endnode length diameter roughness minorloss", file=fid
-    )  # status', file=fid)
-    for p in get_pipes(network):
-        print(p.id, end=" ", file=fid)
-        if p.startnode is not None:
-            print(p.startnode.id, end=" ", file=fid)
-        if p.endnode is not None:
-            print(p.endnode.id, end=" ", file=fid)
-        print(p.length, end=" ", file=fid)
-        print(p.diameter, end=" ", file=fid)
-        print(p.roughness, end=" ", file=fid)
-        print(p.minorloss, end=" ", file=fid)
-        if p.status == "CV":
-            print(p.status, end=" ", file=fid)
-        if p.comment is not None:
-            print(";", p.comment, end=" ", file=fid)
-        print("\n", end=" ", file=fid)
-    print("\n", end=" ", file=fid)
-
-
-@section_writer("PUMPS", 2)
+    lines = [
+        format_line(
+            p.id,
+            *_end_node_ids(p),
+            p.length,
+            p.diameter,
+            p.roughness,
+            p.minorloss,
+            p.status if p.status == "CV" else None,
+            comment=p.comment,
+        )
+        for p in get_pipes(network)
+    ]
+    fid.write(
+        format_section(
+            "PIPES", lines, "id startnode endnode length diameter roughness minorloss"
+        )
+    )
+
+
+@section_writer(
+    "PUMPS", 2, dependencies=("pumps", "nodes:ids", "curves:ids", "patterns:ids")
+)
 def write_pumps(network: Network, fid: TextIOWrapper):
     """Writes pumps to an EPANET input file.
 
@@ -164,29 +183,22 @@ def write_pumps(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Pumps section")
-    print("[PUMPS]", file=fid)
-    print(";id startnode endnode keyword value", file=fid)
+    lines = []
     for p in get_pumps(network):
-        print(p.id, end=" ", file=fid)
-        if p.startnode is not None:
-            print(p.startnode.id, end=" ", file=fid)
-        if p.endnode is not None:
-            print(p.endnode.id, end=" ", file=fid)
+        values = [p.id, *_end_node_ids(p)]
         if p.power is not None:
-            print("POWER", p.power, end=" ", file=fid)
+            values.extend(["POWER", p.power])
         if p.head is not None:
-            print("HEAD", p.head.id, end=" ", file=fid)
+            values.extend(["HEAD", p.head.id])
         if p.speed is not None:
-            print("SPEED", p.speed, end=" ", file=fid)
+            values.extend(["SPEED", p.speed])
         if p.pattern is not None:
-            print("PATTERN", p.pattern.id, end=" ", file=fid)
-        if p.comment is not None:
-            print(";", p.comment, end=" ", file=fid)
-        print("\n", end=" ", file=fid)
-    print("\n", end=" ", file=fid)
+            values.extend(["PATTERN", p.pattern.id])
+        lines.append(format_line(*values, comment=p.comment))
+    fid.write(format_section("PUMPS", lines, "id startnode endnode keyword value"))
 
 
-@section_writer("VALVES", 2)
+@section_writer("VALVES", 2, dependencies=("valves", "nodes:ids", "curves:ids"))
 def write_valves(network: Network, fid: TextIOWrapper):
     """Writes valves to an EPANET input file.
 
@@ -196,36 +208,28 @@ def write_valves(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Valves section")
-    print("[VALVES]", file=fid)
-    print(";id startnode endnode diameter valvetype setting minorloss", file=fid)
-    for v in get_valves(network):
-        print(v.id, end=" ", file=fid)
-        if v.startnode is not None:
-            print(v.startnode.id, end=" ", file=fid)
-        if v.endnode is not None:
-            print(v.endnode.id, end=" ", file=fid)
-        print(v.diameter, end=" ", file=fid)
-        print(v.__class__.__name__, end=" ", file=fid)
-        if isinstance(v, PRV):
-            print(v.maximum_pressure, end=" ", file=fid)
-        elif isinstance(v, TCV):
-            print(v.headloss_coefficient, end=" ", file=fid)
-        elif isinstance(v, PSV):
-            print(v.pressure_limit, end=" ", file=fid)
-        elif isinstance(v, GPV):
-            print(v.headloss_curve.id, end=" ", file=fid)
-        elif isinstance(v, PBV):
-            print(v.pressure_drop, end=" ", file=fid)
-        elif isinstance(v, FCV):
-            print(v.maximum_flow, end=" ", file=fid)
-        print(v.minorloss, end=" ", file=fid)
-        if v.comment is not None:
-            print(";", v.comment, end=" ", file=fid)
-        print("\n", end=" ", file=fid)
-    print("\n", end=" ", file=fid)
-
-
-@section_writer("EMITTERS", 3)
+    lines = [
+        format_line(
+            v.id,
+            *_end_node_ids(v),
+            v.diameter,
+            v.__class__.__name__,
+            _valve_setting(v),
+            v.minorloss,
+            comment=v.comment,
+        )
+        for v in get_valves(network)
+    ]
+    fid.write(
+        format_section(
+            "VALVES",
+            lines,
+            "id startnode endnode diameter valvetype setting minorloss",
+        )
+    )
+
+
+@section_writer("EMITTERS", 3, dependencies=("junctions:emittercoefficient",))
 def write_emitter(network: Network, fid: TextIOWrapper):
     """Writes Junction emitters to an EPANET input file.
 
@@ -235,9 +239,9 @@ def write_emitter(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Emitter section")
-    print("[EMITTERS]", file=fid)
-    print(";id emittercoefficient", file=fid)
-    for j in get_junctions(network):
-        if j.emittercoefficient > 0.0:
-            print(j.id, j.emittercoefficient, file=fid)
-    print("\n", file=fid)
+    lines = [
+        format_line(j.id, j.emittercoefficient)
+        for j in get_junctions(network)
+        if j.emittercoefficient > 0.0
+    ]
+    fid.write(format_section("EMITTERS", lines, "id emittercoefficient"))
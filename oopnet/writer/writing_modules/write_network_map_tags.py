@@ -5,6 +5,7 @@ import logging
 
 from oopnet.utils.getters.element_lists import get_nodes, get_links
 from oopnet.writer.decorators import section_writer
+from oopnet.writer.formatting import format_line, format_section
 
 if TYPE_CHECKING:
     from oopnet.elements.network import Network
@@ -12,7 +13,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-@section_writer("COORDINATES", 4)
+@section_writer("COORDINATES", 4, dependencies=("nodes:geometry",))
 def write_coordinates(network: Network, fid: TextIOWrapper):
     """Writes coordinates to an EPANET input file.
 
@@ -22,14 +23,13 @@ def write_coordinates(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Coordinates section")
-    print("[COORDINATES]", file=fid)
-    print(";nodeid xcoordinate ycoordinate", file=fid)
-    for n in get_nodes(network):
-        print(n.id, n.xcoordinate, n.ycoordinate, file=fid)
-    print("\n", end=" ", file=fid)
+    lines = [
+        format_line(n.id, n.xcoordinate, n.ycoordinate) for n in get_nodes(network)
+    ]
+    fid.write(format_section("COORDINATES", lines, "nodeid xcoordinate ycoordinate"))
 
 
-@section_writer("VERTICES", 4)
+@section_writer("VERTICES", 4, dependencies=("links:geometry",))
 def write_vertices(network: Network, fid: TextIOWrapper):
     """Writes vertices to an EPANET input file.
 
@@ -39,12 +39,12 @@ def write_vertices(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Vertices section")
-    print("[VERTICES]", file=fid)
-    print(";linkkid xcoordinate ycoordinate", file=fid)
-    for l in get_links(network):
-        for v in l.vertices:
-            print(l.id, v.xcoordinate, v.ycoordinate, file=fid)
-    print("\n", end=" ", file=fid)
+    lines = [
+        format_line(l.id, v.xcoordinate, v.ycoordinate)
+        for l in get_links(network)
+        for v in l.vertices
+    ]
+    fid.write(format_section("VERTICES", lines, "linkkid xcoordinate ycoordinate"))
 
 
 @section_writer("LABELS", 4)
@@ -58,9 +58,7 @@ def write_labels(network: Network, fid: TextIOWrapper):
     """
     # ToDo: Implement Printer for Labels
     # logger.debug('Writing Labels section')
-    print("[LABELS]", file=fid)
-    print(";xcoordinate ycoordinate label anchornode", file=fid)
-    print("\n", end=" ", file=fid)
+    fid.write(format_section("LABELS", [], "xcoordinate ycoordinate label anchornode"))
 
 
 @section_writer("BACKDROP", 4)
@@ -74,8 +72,7 @@ def write_backdrop(network: Network, fid: TextIOWrapper):
     """
     # ToDo: Implement Printer for Backdrop
     # logger.debug('Writing Backdrop section')
-    print("[BACKDROP]", file=fid)
-    print("\n", end=" ", file=fid)
+    fid.write(format_section("BACKDROP", []))
 
 
 @section_writer("TAGS", 4)
@@ -89,5 +86,4 @@ def write_tags(network: Network, fid: TextIOWrapper):
     """
     # ToDo: Implement Printer for Tags
     # logger.debug('Writing Tags section')
-    print("[TAGS]", file=fid)
-    print("\n", end=" ", file=fid)
+    fid.write(format_section("TAGS", []))
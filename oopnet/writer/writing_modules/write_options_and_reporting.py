@@ -6,6 +6,12 @@ from typing import Union
 import logging
 
 from oopnet.writer.decorators import section_writer
+from oopnet.writer.formatting import (
+    format_line,
+    format_section,
+    MAX_LINE_LENGTH,
+    MAX_LINE_TOKENS,
+)
 
 if TYPE_CHECKING:
     from oopnet.elements.network import Network
@@ -81,47 +87,56 @@ def write_options(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Options section")
-    print("[OPTIONS]", file=fid)
     o = network.options
-    print("UNITS", o.units, file=fid)
-    print("HEADLOSS", o.headloss, file=fid)
+    lines = [
+        format_line("UNITS", o.units),
+        format_line("HEADLOSS", o.headloss),
+    ]
     if o.hydraulics:
-        print("HYDRAULICS", o.hydraulics[0], o.hydraulics[1], file=fid)
+        lines.append(format_line("HYDRAULICS", o.hydraulics[0], o.hydraulics[1]))
     if not isinstance(o.quality, list):
-        print("QUALITY", o.quality, file=fid)
+        lines.append(format_line("QUALITY", o.quality))
     elif o.quality[0] == "AGE":
-        print("QUALITY", o.quality[0], file=fid)
+        lines.append(format_line("QUALITY", o.quality[0]))
     elif o.quality[0] == "CHEMICAL":
-        print("QUALITY", o.quality[0], o.quality[1], o.quality[2], file=fid)
+        lines.append(format_line("QUALITY", o.quality[0], o.quality[1], o.quality[2]))
     elif o.quality[0] == "TRACE":
-        print("QUALITY", o.quality[0], o.quality[1].id, file=fid)
+        lines.append(format_line("QUALITY", o.quality[0], o.quality[1].id))
     else:
-        print("QUALTIY", "NONE", file=fid)
-    print("VISCOSITY", o.viscosity, file=fid)
-    print("DIFFUSIVITY", o.diffusivity, file=fid)
-    print("SPECIFIC GRAVITY", o.specificgravity, file=fid)
-    print("TRIALS", o.trials, file=fid)
-    print("ACCURACY", str(o.accuracy).replace("e", "E"), file=fid)
+        lines.append(format_line("QUALITY", "NONE"))
+    lines.extend(
+        [
+            format_line("VISCOSITY", o.viscosity),
+            format_line("DIFFUSIVITY", o.diffusivity),
+            format_line("SPECIFIC GRAVITY", o.specificgravity),
+            format_line("TRIALS", o.trials),
+            format_line("ACCURACY", str(o.accuracy).replace("e", "E")),
+        ]
+    )
     if not isinstance(o.unbalanced, tuple):
-        print("UNBALANCED", o.unbalanced, file=fid)
+        lines.append(format_line("UNBALANCED", o.unbalanced))
     else:
-        print("UNBALANCED", o.unbalanced[0], o.unbalanced[1], file=fid)
-    print("PATTERN", end=" ", file=fid)
-    try:
-        print(o.pattern.id, file=fid)
-    except:
-        print(o.pattern, file=fid)
-    print("DEMAND MULTIPLIER", o.demandmultiplier, file=fid)
-    print("EMITTER EXPONENT", o.emitterexponent, file=fid)
-    print("TOLERANCE", str(o.tolerance).replace("e", "E"), file=fid)
+        lines.append(format_line("UNBALANCED", o.unbalanced[0], o.unbalanced[1]))
+    lines.extend(
+        [
+            format_line("PATTERN", getattr(o.pattern, "id", o.pattern)),
+            format_line("DEMAND MULTIPLIER", o.demandmultiplier),
+            format_line("EMITTER EXPONENT", o.emitterexponent),
+            format_line("TOLERANCE", str(o.tolerance).replace("e", "E")),
+        ]
+    )
     if o.map:
-        print("MAP", o.map, file=fid)
+        lines.append(format_line("MAP", o.map))
     if o.demandmodel == "PDA":
-        print("DEMAND MODEL", o.demandmodel, file=fid)
-        print("MINIMUM PRESSURE", o.minimumpressure, file=fid)
-        print("REQUIRED PRESSURE", o.requiredpressure, file=fid)
-        print("PRESSURE EXPONENT", o.pressureexponent, file=fid)
-    print("\n", end=" ", file=fid)
+        lines.extend(
+            [
+                format_line("DEMAND MODEL", o.demandmodel),
+                format_line("MINIMUM PRESSURE", o.minimumpressure),
+                format_line("REQUIRED PRESSURE", o.requiredpressure),
+                format_line("PRESSURE EXPONENT", o.pressureexponent),
+            ]
+        )
+    fid.write(format_section("OPTIONS", lines))
 
 
 @section_writer("TIMES", 3)
@@ -134,22 +149,75 @@ def write_times(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Times section")
-    print("[TIMES]", file=fid)
     t = network.times
-    print("DURATION", timedelta2hours(t.duration), file=fid)
-    print("HYDRAULIC TIMESTEP", timedelta2hours(t.hydraulictimestep), file=fid)
+    lines = [
+        format_line("DURATION", timedelta2hours(t.duration)),
+        format_line("HYDRAULIC TIMESTEP", timedelta2hours(t.hydraulictimestep)),
+    ]
     if t.qualitytimestep:
-        print("QUALITY TIMESTEP", timedelta2hours(t.qualitytimestep), file=fid)
+        lines.append(
+            format_line("QUALITY TIMESTEP", timedelta2hours(t.qualitytimestep))
+        )
     if t.ruletimestep:
-        print("RULE TIMESTEP", timedelta2hours(t.ruletimestep), file=fid)
+        lines.append(format_line("RULE TIMESTEP", timedelta2hours(t.ruletimestep)))
     if t.patterntimestep:
-        print("PATTERN TIMESTEP", timedelta2hours(t.patterntimestep), file=fid)
-    print("PATTERN START", timedelta2hours(t.patternstart), file=fid)
-    print("REPORT TIMESTEP", timedelta2hours(t.reporttimestep), file=fid)
-    print("REPORT START", timedelta2hours(t.reportstart), file=fid)
-    print("START CLOCKTIME", timedelta2startclocktime(t.startclocktime), file=fid)
-    print("STATISTIC", t.statistic, file=fid)
-    print("\n", end=" ", file=fid)
+        lines.append(
+            format_line("PATTERN TIMESTEP", timedelta2hours(t.patterntimestep))
+        )
+    lines.extend(
+        [
+            format_line("PATTERN START", timedelta2hours(t.patternstart)),
+            format_line("REPORT TIMESTEP", timedelta2hours(t.reporttimestep)),
+            format_line("REPORT START", timedelta2hours(t.reportstart)),
+            format_line("START CLOCKTIME", timedelta2startclocktime(t.startclocktime)),
+            format_line("STATISTIC", t.statistic),
+        ]
+    )
+    fid.write(format_section("TIMES", lines))
+
+
+REPORT_PARAMETERS = [
+    ("ELEVATION", "elevation"),
+    ("DEMAND", "demand"),
+    ("HEAD", "head"),
+    ("PRESSURE", "pressure"),
+    ("QUALITY", "quality"),
+    ("LENGTH", "length"),
+    ("DIAMETER", "diameter"),
+    ("FLOW", "flow"),
+    ("VELOCITY", "velocity"),
+    ("HEADLOSS", "headloss"),
+    ("SETTING", "setting"),
+    ("REACTION", "reaction"),
+    ("F-FACTOR", "ffactor"),
+]
+
+
+def _id_lines(keyword: str, ids: list[str]) -> list[str]:
+    """Distributes IDs over as many lines starting with keyword as needed to stay within EPANET's line limits.
+
+    Args:
+      keyword: line keyword (e.g., "NODES")
+      ids: component IDs
+
+    Returns:
+        formatted lines
+
+    """
+    if not ids:
+        return [format_line(keyword, "NONE")]
+    lines = []
+    line = [keyword]
+    length = len(keyword)
+    for id in ids:
+        if length + len(id) + 1 >= MAX_LINE_LENGTH or len(line) == MAX_LINE_TOKENS:
+            lines.append(" ".join(line))
+            line = [keyword]
+            length = len(keyword)
+        line.append(id)
+        length += len(id) + 1
+    lines.append(" ".join(line))
+    return lines
 
 
 @section_writer("REPORT", 3)
@@ -162,54 +230,32 @@ def write_report(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Report section")
-    print("[REPORT]", file=fid)
     r = network.report
-    print("PAGESIZE", r.pagesize, file=fid)
+    lines = [format_line("PAGESIZE", r.pagesize)]
     if r.file:
-        print("FILE", r.file, file=fid)
-    print("STATUS", r.status, file=fid)
-    print("SUMMARY", r.summary, file=fid)
-    print("ENERGY", r.energy, file=fid)
-    if isinstance(r.nodes, str):
-        print("NODES", r.nodes, file=fid)
-    else:
-        print("NODES", end=" ", file=fid)
-        for n in r.nodes:
-            print(n.id, end=" ", file=fid)
-        print("\n", end=" ", file=fid)
-    if isinstance(r.links, str):
-        print("LINKS", r.links, file=fid)
-    else:
-        print("LINKS", end=" ", file=fid)
-        for l in r.links:
-            print(l.id, end=" ", file=fid)
-        print("\n", end=" ", file=fid)
-    r = network.reportparameter
-    print("ELEVATION", reportparameter2str(r.elevation), file=fid)
-    print("DEMAND", reportparameter2str(r.demand), file=fid)
-    print("HEAD", reportparameter2str(r.head), file=fid)
-    print("PRESSURE", reportparameter2str(r.pressure), file=fid)
-    print("QUALITY", reportparameter2str(r.quality), file=fid)
-    print("LENGTH", reportparameter2str(r.length), file=fid)
-    print("DIAMETER", reportparameter2str(r.diameter), file=fid)
-    print("FLOW", reportparameter2str(r.flow), file=fid)
-    print("VELOCITY", reportparameter2str(r.velocity), file=fid)
-    print("HEADLOSS", reportparameter2str(r.headloss), file=fid)
-    print("SETTING", reportparameter2str(r.setting), file=fid)
-    print("REACTION", reportparameter2str(r.reaction), file=fid)
-    print("F-FACTOR", reportparameter2str(r.ffactor), file=fid)
-    r = network.reportprecision
-    print("ELEVATION", reportprecision2str(r.elevation), file=fid)
-    print("DEMAND", reportprecision2str(r.demand), file=fid)
-    print("HEAD", reportprecision2str(r.head), file=fid)
-    print("PRESSURE", reportprecision2str(r.pressure), file=fid)
-    print("QUALITY", reportprecision2str(r.quality), file=fid)
-    print("LENGTH", reportprecision2str(r.length), file=fid)
-    print("DIAMETER", reportprecision2str(r.diameter), file=fid)
-    print("FLOW", reportprecision2str(r.flow), file=fid)
-    print("VELOCITY", reportprecision2str(r.velocity), file=fid)
-    print("HEADLOSS", reportprecision2str(r.headloss), file=fid)
-    print("SETTING", reportprecision2str(r.setting), file=fid)
-    print("REACTION", reportprecision2str(r.reaction), file=fid)
-    print("F-FACTOR", reportprecision2str(r.ffactor), file=fid)
-    print("\n", end=" ", file=fid)
+        lines.append(format_line("FILE", r.file))
+    lines.extend(
+        [
+            format_line("STATUS", r.status),
+            format_line("SUMMARY", r.summary),
+            format_line("ENERGY", r.energy),
+        ]
+    )
+    for keyword, components in (("NODES", r.nodes), ("LINKS", r.links)):
+        if isinstance(components, str):
+            lines.append(format_line(keyword, components))
+        else:
+            lines.extend(_id_lines(keyword, [c.id for c in components]))
+    parameters = network.reportparameter
+    lines.extend(
+        format_line(keyword, reportparameter2str(getattr(parameters, attribute)))
+        for keyword, attribute in REPORT_PARAMETERS
+    )
+    # EPANET enables a parameter's reporting if its precision is set, precisions set to None are therefore not written
+    precision = network.reportprecision
+    lines.extend(
+        format_line(keyword, reportprecision2str(getattr(precision, attribute)))
+        for keyword, attribute in REPORT_PARAMETERS
+        if getattr(precision, attribute) is not None
+    )
+    fid.write(format_section("REPORT", lines))
@@ -19,6 +19,7 @@ from oopnet.utils.getters.element_lists import (
     get_rules,
 )
 from oopnet.writer.decorators import section_writer
+from oopnet.writer.formatting import format_line, format_section
 
 if TYPE_CHECKING:
     from oopnet.elements.network import Network
@@ -26,7 +27,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-@section_writer("CURVES", 3)
+@section_writer("CURVES", 3, dependencies=("curves",))
 def write_curves(network: Network, fid: TextIOWrapper):
     """Writes curves to an EPANET input file.
 
@@ -36,15 +37,15 @@ def write_curves(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Curves section")
-    print("[CURVES]", file=fid)
-    print(";id xvalue yvalue", file=fid)
-    for c in get_curves(network):
-        for x, y in zip(c.xvalues, c.yvalues):
-            print(c.id, x, y, file=fid)
-    print("\n", end=" ", file=fid)
+    lines = [
+        format_line(c.id, x, y)
+        for c in get_curves(network)
+        for x, y in zip(c.xvalues, c.yvalues)
+    ]
+    fid.write(format_section("CURVES", lines, "id xvalue yvalue"))
 
 
-@section_writer("PATTERNS", 3)
+@section_writer("PATTERNS", 3, dependencies=("patterns",))
 def write_patterns(network: Network, fid: TextIOWrapper):
     """Writes patterns to an EPANET input file.
 
@@ -54,14 +55,8 @@ def write_patterns(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Patterns section")
-    print("[PATTERNS]", file=fid)
-    print(";id multipliers", file=fid)
-    for p in get_patterns(network):
-        for m in p.multipliers:
-            print(p.id, end=" ", file=fid)
-            print(m, file=fid)
-        print("\n", end=" ", file=fid)
-    print("\n", end=" ", file=fid)
+    lines = [format_line(p.id, m) for p in get_patterns(network) for m in p.multipliers]
+    fid.write(format_section("PATTERNS", lines, "id multipliers"))
 
 
 @section_writer("ENERGY", 3)
@@ -74,24 +69,23 @@ def write_energy(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Energy section")
-    print("[ENERGY]", file=fid)
+    lines = []
     for e in get_energy_entries(network):
+        if e.value is None:
+            continue
         keyword = e.keyword if e.keyword != "DEMAND_CHARGE" else "DEMAND CHARGE"
-        print(keyword, end=" ", file=fid)
+        value = e.value.id if isinstance(e.value, (Curve, Pattern)) else e.value
+        # the Pump ID and the parameter are optional tokens, not empty columns
+        tokens = [keyword]
         if keyword == "PUMP":
-            print(e.pumpid.id, end=" ", file=fid)
+            tokens.append(e.pumpid.id)
         if e.parameter is not None:
-            print(e.parameter, end=" ", file=fid)
-        if e.value is not None:
-            if isinstance(e.value, (Curve, Pattern)):
-                print(e.value.id, end=" ", file=fid)
-            else:
-                print(e.value, end=" ", file=fid)
-            print("\n", end=" ", file=fid)
-    print("\n", end=" ", file=fid)
+            tokens.append(e.parameter)
+        lines.append(format_line(*tokens, value))
+    fid.write(format_section("ENERGY", lines))
 
 
-@section_writer("STATUS", 3)
+@section_writer("STATUS", 3, dependencies=("links:status",))
 def write_status(network: Network, fid: TextIOWrapper):
     """Writes status section to an EPANET input file.
 
@@ -101,20 +95,12 @@ def write_status(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Status section")
-    print("[STATUS]", file=fid)
-    print(";id status/setting", file=fid)
-    for l in get_pipes(network):
-        if l.status == "CLOSED":
-            print(l.id, l.status, file=fid)
-    for v in get_valves(network):
-        if v.status == "CLOSED":
-            print(v.id, v.status, file=fid)
-    for pu in get_pumps(network):
-        if pu.status == "CLOSED":
-            print(pu.id, pu.status, file=fid)
-        # elif pu.keyword == 'SPEED':
-        #     print(pu.id, pu, file=fid)
-    print("\n", end=" ", file=fid)
+    lines = [
+        format_line(l.id, l.status)
+        for l in get_pipes(network) + get_valves(network) + get_pumps(network)
+        if l.status == "CLOSED"
+    ]
+    fid.write(format_section("STATUS", lines, "id status/setting"))
 
 
 @section_writer("CONTROLS", 3)
@@ -127,26 +113,27 @@ def write_controls(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Controls section")
-    print("[CONTROLS]", file=fid)
+    lines = []
     for c in get_controls(network):
-        print("LINK", c.action.object.id, c.action.value, end=" ", file=fid)
+        action = ["LINK", c.action.object.id, c.action.value]
         if c.condition.object is not None:
-            print(
+            condition = [
                 "IF NODE",
                 c.condition.object.id,
                 c.condition.relation,
                 c.condition.value,
-                file=fid,
-            )
+            ]
         elif c.condition.time is not None:
-            print("AT TIME", str(c.condition.time)[:-3], file=fid)
+            condition = ["AT TIME", str(c.condition.time)[:-3]]
         elif c.condition.clocktime is not None:
-            print(
+            condition = [
                 "AT CLOCKTIME",
                 datetime.datetime.strftime(c.condition.clocktime, "%I:%M %p"),
-                file=fid,
-            )
-    print("\n", end=" ", file=fid)
+            ]
+        else:
+            condition = []
+        lines.append(format_line(*action, *condition))
+    fid.write(format_section("CONTROLS", lines))
 
 
 @section_writer("RULES", 3)
@@ -159,47 +146,45 @@ def write_rules(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Rules section")
-    print("[RULES]", file=fid)
+    lines = []
     for r in get_rules(network):
-        print("RULE", r.id, file=fid)
+        lines.append(format_line("RULE", r.id))
         for c in r.condition:
             if isinstance(c.object, NetworkComponent):
-                object_type = "Valve" if isinstance(c.object, Valve) else c.object.__class__.__name__
-
-                print(
-                    c.logical,
-                    object_type,
-                    c.object.id,
-                    c.attribute,
-                    c.relation,
-                    c.value,
-                    file=fid,
+                object_type = (
+                    "Valve"
+                    if isinstance(c.object, Valve)
+                    else c.object.__class__.__name__
                 )
-            elif c.attribute is not None:
-                object_type = "SYSTEM"
-                if c.attribute == "TIME":
-                    print(
+                lines.append(
+                    format_line(
                         c.logical,
                         object_type,
+                        c.object.id,
                         c.attribute,
                         c.relation,
-                        str(c.value)[:-3],
-                        file=fid,
+                        c.value,
                     )
+                )
+            elif c.attribute is not None:
+                object_type = "SYSTEM"
+                if c.attribute == "TIME":
+                    value = str(c.value)[:-3]
                 elif c.attribute == "CLOCKTIME":
-                    timeformat = "%I:%M %p"
-                    print(
-                        c.logical,
-                        object_type,
-                        c.attribute,
-                        c.relation,
-                        datetime.datetime.strftime(c.value, timeformat),
-                        file=fid,
-                    )
-    print("\n", end=" ", file=fid)
+                    value = datetime.datetime.strftime(c.value, "%I:%M %p")
+                else:
+                    continue
+                lines.append(
+                    format_line(c.logical, object_type, c.attribute, c.relation, value)
+                )
+    fid.write(format_section("RULES", lines))
 
 
-@section_writer("DEMANDS", 3)
+@section_writer(
+    "DEMANDS",
+    3,
+    dependencies=("junctions:demand", "junctions:demandpattern", "patterns:ids"),
+)
 def write_demands(network: Network, fid: TextIOWrapper):
     """Writes the demand section to an EPANET input file.
 
@@ -209,21 +194,15 @@ def write_demands(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Demands section")
-    print("[DEMANDS]", file=fid)
-    print(";id demand pattern category", file=fid)
+    lines = []
     for j in get_junctions(network):
         if j.demand is None or isinstance(j.demand, (float, int)):
-            pass
+            continue
         elif isinstance(j.demand, list):
+            patterns = j.demandpattern if isinstance(j.demandpattern, list) else []
             for i, d in enumerate(j.demand):
-                print(j.id, end=" ", file=fid)
-                print(d, end=" ", file=fid)
-                # todo: replace try except
-                try:
-                    print(j.demandpattern[i].id, end=" ", file=fid)
-                except:
-                    pass
-                print("\n", end=" ", file=fid)
+                pattern_id = patterns[i].id if i < len(patterns) else None
+                lines.append(format_line(j.id, d, pattern_id))
         else:
             raise TypeError(f"Unknown demand dtype {type(j.demand)}")
-    print("\n", end=" ", file=fid)
+    fid.write(format_section("DEMANDS", lines, "id demand pattern category"))
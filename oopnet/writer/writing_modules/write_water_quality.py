@@ -5,6 +5,7 @@ import logging
 
 from oopnet.utils.getters.element_lists import get_tanks, get_nodes
 from oopnet.writer.decorators import section_writer
+from oopnet.writer.formatting import format_line, format_section
 
 if TYPE_CHECKING:
     from oopnet.elements.network import Network
@@ -12,7 +13,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-@section_writer("QUALITY", 3)
+@section_writer("QUALITY", 3, dependencies=("nodes:initialquality",))
 def write_quality(network: Network, fid: TextIOWrapper):
     """Writes quality section to an EPANET input file.
 
@@ -22,12 +23,12 @@ def write_quality(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Quality section")
-    print("[QUALITY]", file=fid)
-    print(";id initialquality", file=fid)
-    for n in get_nodes(network):
-        if n.initialquality > 0.0:
-            print(n.id, n.initialquality, file=fid)
-    print("\n", end=" ", file=fid)
+    lines = [
+        format_line(n.id, n.initialquality)
+        for n in get_nodes(network)
+        if n.initialquality > 0.0
+    ]
+    fid.write(format_section("QUALITY", lines, "id initialquality"))
 
 
 @section_writer("REACTIONS", 3)
@@ -40,30 +41,37 @@ def write_reactions(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Reactions section")
-    print("[REACTIONS]", file=fid)
     r = network.reactions
-    print("ORDER BULK", r.orderbulk, file=fid)
-    print("ORDER WALL", r.orderwall, file=fid)
-    print("ORDER TANK", r.ordertank, file=fid)
-    print("GLOBAL BULK", r.globalbulk, file=fid)
-    print("GLOBAL WALL", r.globalwall, file=fid)
+    lines = [
+        format_line("ORDER BULK", r.orderbulk),
+        format_line("ORDER WALL", r.orderwall),
+        format_line("ORDER TANK", r.ordertank),
+        format_line("GLOBAL BULK", r.globalbulk),
+        format_line("GLOBAL WALL", r.globalwall),
+    ]
     if r.limitingpotential is not None:
-        print("LIMITING POTENTIAL", r.limitingpotential, file=fid)
+        lines.append(format_line("LIMITING POTENTIAL", r.limitingpotential))
     if r.roughnesscorrelation is not None:
-        print("ROUGHNESS CORRELATION", r.roughnesscorrelation, file=fid)
+        lines.append(format_line("ROUGHNESS CORRELATION", r.roughnesscorrelation))
     if r.bulk:
-        for p in r.bulk:
-            print("BULK", p.id, p.reactionbulk, file=fid)
+        lines.extend(format_line("BULK", p.id, p.reactionbulk) for p in r.bulk)
     if r.wall:
-        for p in r.wall:
-            print("WALL", p.id, p.reactionwall, file=fid)
+        lines.extend(format_line("WALL", p.id, p.reactionwall) for p in r.wall)
     if r.tank:
-        for p in r.tank:
-            print("TANK", p.id, p.tank, file=fid)
-    print("\n", end=" ", file=fid)
-
-
-@section_writer("SOURCES", 3)
+        lines.extend(format_line("TANK", p.id, p.tank) for p in r.tank)
+    fid.write(format_section("REACTIONS", lines))
+
+
+@section_writer(
+    "SOURCES",
+    3,
+    dependencies=(
+        "nodes:sourcetype",
+        "nodes:strength",
+        "nodes:sourcepattern",
+        "patterns:ids",
+    ),
+)
 def write_sources(network: Network, fid: TextIOWrapper):
     """Writes sources section to an EPANET input file.
 
@@ -73,20 +81,22 @@ def write_sources(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Sources section")
-    print("[SOURCES]", file=fid)
-    print(";id sourcetype strength sourcepattern", file=fid)
-    for n in get_nodes(network):
-        if n.sourcetype:
-            print(n.id, n.sourcetype, end=" ", file=fid)
-            if n.strength > 0.0:
-                print(n.strength, end=" ", file=fid)
-            if n.sourcepattern:
-                print(n.sourcepattern.id, end=" ", file=fid)
-            print("\n", end=" ", file=fid)
-    print("\n", end=" ", file=fid)
-
-
-@section_writer("MIXING", 3)
+    lines = [
+        format_line(
+            n.id,
+            n.sourcetype,
+            n.strength if n.strength > 0.0 else None,
+            n.sourcepattern.id if n.sourcepattern else None,
+        )
+        for n in get_nodes(network)
+        if n.sourcetype
+    ]
+    fid.write(format_section("SOURCES", lines, "id sourcetype strength sourcepattern"))
+
+
+@section_writer(
+    "MIXING", 3, dependencies=("tanks:mixingmodel", "tanks:compartmentvolume")
+)
 def write_mixing(network: Network, fid: TextIOWrapper):
     """Writes mixing section to an EPANET input file.
 
@@ -96,12 +106,17 @@ def write_mixing(network: Network, fid: TextIOWrapper):
 
     """
     logger.debug("Writing Mixing section")
-    print("[MIXING]", file=fid)
-    print(";tankid mixingmodel compartmentvolume", file=fid)
-    for t in get_tanks(network):
-        if t.mixingmodel:
-            print(t.id, t.mixingmodel, end=" ", file=fid)
-            if t.compartmentvolume and t.compartmentvolume != 0.0:
-                print(t.compartmentvolume, end=" ", file=fid)
-            print("\n", end=" ", file=fid)
-    print("\n", end=" ", file=fid)
+    lines = [
+        format_line(
+            t.id,
+            t.mixingmodel,
+            (
+                t.compartmentvolume
+                if t.compartmentvolume and t.compartmentvolume != 0.0
+                else None
+            ),
+        )
+        for t in get_tanks(network)
+        if t.mixingmodel
+    ]
+    fid.write(format_section("MIXING", lines, "tankid mixingmodel compartmentvolume"))
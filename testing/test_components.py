@@ -72,6 +72,10 @@ class TestLink(unittest.TestCase):
         print(self._test_pipe.coordinates_2d)
         self.assertListEqual([2.0, 2.0], center.tolist())
 
+    def test_center_asymmetric_vertices(self):
+        self._test_pipe.vertices.append(Vertex(xcoordinate=3, ycoordinate=1))
+        center = self._test_pipe.center
+        self.assertListEqual([3.0, 1.0], center.tolist())
 
 if __name__ == '__main__':
     unittest.main()
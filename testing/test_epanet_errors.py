@@ -1,13 +1,16 @@
 import unittest
 
+import pandas as pd
+
 from oopnet.elements.network import Network
 from oopnet.elements.network_components import Tank, Junction
 from oopnet.elements.system_operation import Curve
 from oopnet.utils.adders import add_junction, add_tank, add_curve
-from oopnet.utils.getters import get_pipe, get_tank, get_pump
+from oopnet.utils.getters import get_pipe, get_tank, get_pump, get_node, get_adjacent_links
+from oopnet.simulator.error_manager import ErrorManager
 from oopnet.simulator.simulation_errors import EPANETSimulationError
 
-from testing.base import create_dummy_spa_network
+from testing.base import create_dummy_spa_network, PoulakisEnhancedPDAModel
 
 
 # todo: fix and expand
@@ -74,5 +77,35 @@ class ExistingModelTest(unittest.TestCase):
     def test_id_duplicate(self):
         pass
 
+
+class SimulationWarningTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = PoulakisEnhancedPDAModel()
+
+    def test_no_warnings(self):
+        rpt = self.model.network.run()
+        self.assertTrue(rpt.warnings.empty)
+
+    def test_negative_pressures_and_disconnected(self):
+        network = self.model.network
+        network.options.demandmodel = 'DDA'
+        network.options.demandmultiplier = 30
+        for link in get_adjacent_links(network, get_node(network, 'J-13')):
+            link.status = 'CLOSED'
+        rpt = network.run()
+        self.assertEqual(['time', 'kind', 'element', 'message'], list(rpt.warnings.columns))
+        self.assertIn('negative pressures', set(rpt.warnings['kind']))
+        disconnected = rpt.warnings[rpt.warnings['kind'] == 'disconnected']
+        self.assertIn('J-13', set(disconnected['element']))
+
+    def test_warning_parsing(self):
+        manager = ErrorManager()
+        self.assertFalse(manager.check_line('  WARNING: System unbalanced at 12:00:00 hrs.\n'))
+        self.assertTrue(manager.check_line('  Error 200: one or more errors detected in input file.\n'))
+        warnings = manager.get_warnings()
+        self.assertEqual('unbalanced', warnings['kind'][0])
+        self.assertEqual(pd.Timedelta(hours=12), warnings['time'][0])
+        self.assertEqual(1, len(manager.found_errors))
+
 if __name__ == '__main__':
     unittest.main()
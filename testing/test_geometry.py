@@ -0,0 +1,125 @@
+import unittest
+
+import numpy as np
+
+from oopnet.elements.geometry import douglas_peucker, point_segment_distance
+from oopnet.elements.network_map_tags import Vertex
+from oopnet.utils.getters import get_link, get_links, get_node, get_nodes
+
+from testing.base import MicropolisModel, SimpleModel
+
+
+def polyline_midpoint(points: np.ndarray) -> np.ndarray:
+    lengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    half = lengths.sum() / 2
+    for start, end, length in zip(points[:-1], points[1:], lengths):
+        if half <= length:
+            return start + (end - start) * (half / length if length else 0.0)
+        half -= length
+    return points[-1]
+
+
+class MicropolisGeometryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = MicropolisModel()
+        self.network = self.model.network
+
+    def test_nodes(self):
+        geometry = self.network.geometry
+        nodes = get_nodes(self.network)
+        self.assertListEqual(list(geometry.node_ids), [node.id for node in nodes])
+        np.testing.assert_array_equal(
+            geometry.node_xy, [node.coordinates[:2] for node in nodes]
+        )
+        ids, coordinates = geometry.nodes("tanks")
+        self.assertEqual(len(ids), self.model.n_tanks)
+        self.assertEqual(coordinates.shape, (self.model.n_tanks, 2))
+
+    def test_polylines(self):
+        geometry = self.network.geometry
+        links = get_links(self.network)
+        self.assertListEqual(list(geometry.link_ids), [link.id for link in links])
+        self.assertEqual(len(geometry.offsets), len(links) + 1)
+        self.assertGreater(len(geometry.vertices), 2 * len(links))
+        for link, polyline in zip(links, geometry.polylines()):
+            np.testing.assert_array_equal(polyline, link.coordinates_2d)
+
+    def test_segments(self):
+        geometry = self.network.geometry
+        part = geometry.link_slices["valves"]
+        links, segments = geometry.segments(part)
+        counts = np.diff(geometry.offsets)[part] - 1
+        self.assertEqual(len(segments), counts.sum())
+        self.assertTrue(np.all(links >= part.start) and np.all(links < part.stop))
+        same = links[1:] == links[:-1]
+        np.testing.assert_array_equal(segments[1:, 0][same], segments[:-1, 1][same])
+
+    def test_midpoints(self):
+        geometry = self.network.geometry
+        expected = [polyline_midpoint(link.coordinates_2d) for link in get_links(self.network)]
+        np.testing.assert_allclose(geometry.midpoints, expected)
+
+    def test_cache(self):
+        geometry = self.network.geometry
+        self.assertIs(self.network.geometry, geometry)
+        get_node(self.network, geometry.node_ids[0]).elevation += 1.0
+        get_link(self.network, geometry.link_ids[0]).status = "CLOSED"
+        self.assertIs(self.network.geometry, geometry)
+
+    def test_invalidation(self):
+        geometry = self.network.geometry
+        node = get_node(self.network, geometry.node_ids[0])
+        node.xcoordinate += 100.0
+        updated = self.network.geometry
+        self.assertIsNot(updated, geometry)
+        self.assertEqual(updated.node_xy[0, 0], geometry.node_xy[0, 0] + 100.0)
+
+        link = get_link(self.network, geometry.link_ids[0])
+        link.vertices = [Vertex(xcoordinate=0.0, ycoordinate=0.0)]
+        self.assertIsNot(self.network.geometry, updated)
+        np.testing.assert_array_equal(
+            self.network.geometry.polylines(slice(0, 1))[0], link.coordinates_2d
+        )
+
+
+class SimpleModelGeometryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.network = SimpleModel().network
+
+    def test_midpoint_with_vertices(self):
+        link = get_links(self.network)[0]
+        start, end = link.startnode.coordinates[:2], link.endnode.coordinates[:2]
+        link.vertices = [Vertex(xcoordinate=start[0], ycoordinate=end[1])]
+        points = link.coordinates_2d
+        index = list(self.network.geometry.link_ids).index(link.id)
+        np.testing.assert_allclose(
+            self.network.geometry.midpoints[index], polyline_midpoint(points)
+        )
+
+
+
+class DouglasPeuckerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.vertices = np.array([[0, 0], [1, 0.1], [2, -0.1], [3, 5], [4, 6], [5, 7], [7, 9], [0, 0], [1, 1]],
+                                 dtype=float)
+        self.offsets = np.array([0, 7, 9])
+
+    def test_simplify(self):
+        vertices, offsets = douglas_peucker(self.vertices, self.offsets, 0.5)
+        np.testing.assert_array_equal([0, 4, 6], offsets)
+        np.testing.assert_array_equal([[0, 0], [2, -0.1], [3, 5], [7, 9], [0, 0], [1, 1]], vertices)
+
+    def test_tolerance(self):
+        _, offsets = douglas_peucker(self.vertices, self.offsets, 100.0)
+        np.testing.assert_array_equal([0, 2, 4], offsets)
+        _, offsets = douglas_peucker(self.vertices, self.offsets, 0.0)
+        np.testing.assert_array_equal([0, 5, 7], offsets)
+
+    def test_point_segment_distance(self):
+        points = np.array([[0.5, 1.0], [2.0, 0.0], [1.0, 1.0]])
+        starts = np.zeros((3, 2))
+        ends = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 0.0]])
+        np.testing.assert_allclose([1.0, 1.0, np.sqrt(2)], point_segment_distance(points, starts, ends))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,13 @@
 import unittest
 import pickle
 
-from testing.base import CTownModel
+import numpy as np
+import xarray as xr
+
+from oopnet.report.collection import ReportCollection
+from oopnet.report.report import SimulationReport
+from oopnet.utils import make_measurement, SensorLayout
+from testing.base import CTownModel, PoulakisEnhancedPDAModel, MicropolisModel
 
 
 class PickleTest(unittest.TestCase):
@@ -22,5 +28,69 @@ class PickleTest(unittest.TestCase):
         xr.testing.assert_equal(rpt.links, new_rpt.links)
 
 
+class SensorLayoutTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = PoulakisEnhancedPDAModel()
+        self.rpt = self.model.network.run()
+        self.sensors = {'Pressure': ['J-05', 'J-10'], 'Flow': ['P-01', 'P-02']}
+
+    def test_measure(self):
+        layout = SensorLayout(self.sensors)
+        expected = np.concatenate([self.rpt.flow[['P-01', 'P-02']].values.round(3),
+                                   self.rpt.pressure[['J-05', 'J-10']].values.round(2)])
+        self.assertTrue(np.array_equal(expected, layout.measure(self.rpt)))
+        self.assertTrue(np.array_equal(expected, make_measurement(self.rpt, self.sensors)))
+        self.assertEqual(('Flow', 'P-01'), layout.labels[0])
+
+    def test_ensemble(self):
+        layout = SensorLayout(self.sensors)
+        collection = ReportCollection.from_reports([self.rpt, self.rpt])
+        measurements = layout.measure(collection)
+        self.assertEqual((2, 4), measurements.shape)
+        self.assertTrue(np.array_equal(measurements, layout.measure([self.rpt, self.rpt])))
+
+    def test_noise(self):
+        layout = SensorLayout(self.sensors, precision={}, noise={'Pressure': 0.5})
+        exact = SensorLayout(self.sensors, precision={}).measure(self.rpt)
+        noisy = layout.measure(self.rpt, rng=42)
+        self.assertTrue(np.array_equal(exact[:2], noisy[:2]))
+        self.assertFalse(np.array_equal(exact[2:], noisy[2:]))
+        self.assertTrue(np.array_equal(noisy, layout.measure(self.rpt, rng=42)))
+
+    def test_time_series(self):
+        model = MicropolisModel()
+        model.network.times.duration = model.network.times.reporttimestep * 4
+        rpt = model.network.run()
+        measurements = SensorLayout({'Pressure': ['HY1', 'HY11']}).measure(rpt)
+        self.assertEqual((5, 2), measurements.shape)
+        self.assertTrue(np.array_equal(rpt.pressure[['HY1', 'HY11']].values.round(2), measurements))
+
+    def quality_report(self, node_variable: str, link_variable: str) -> SimulationReport:
+        nodes = self.rpt.nodes.sel(vars=[node_variable]).assign_coords(vars=['Quality'])
+        links = self.rpt.links.sel(vars=[link_variable]).assign_coords(vars=['Quality'])
+        return SimulationReport.from_arrays(xr.concat([self.rpt.nodes, nodes], dim='vars'),
+                                            xr.concat([self.rpt.links, links], dim='vars'))
+
+    def test_link_quality(self):
+        rpt = self.quality_report('Pressure', 'Flow')
+        measurements = SensorLayout({'Quality': ['J-05', 'P-01', 'P-02']}, precision={}).measure(rpt)
+        expected = [self.rpt.pressure['J-05'], self.rpt.flow['P-01'], self.rpt.flow['P-02']]
+        self.assertTrue(np.array_equal(expected, measurements))
+
+    def test_ambiguous_sensor(self):
+        rpt = self.quality_report('Pressure', 'Flow')
+        rpt = SimulationReport.from_arrays(rpt.nodes, rpt.links.assign_coords(id=rpt.links['id'].str.replace('P-', 'J-')))
+        with self.assertRaises(ValueError):
+            SensorLayout({'Quality': ['J-05']}).measure(rpt)
+
+    def test_missing_sensor(self):
+        with self.assertRaises(KeyError):
+            SensorLayout({'Pressure': ['nonsense']}).measure(self.rpt)
+
+    def test_noise_without_sensors(self):
+        with self.assertRaises(ValueError):
+            SensorLayout(self.sensors, noise={'Head': 0.5})
+
+
 if __name__ == '__main__':
     unittest.main()
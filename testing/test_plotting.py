@@ -1,9 +1,22 @@
+import datetime
+import os
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
+
 from matplotlib import pyplot as plt
+from PIL import Image, ImageChops
+
+from bokeh.models import HoverTool
+from matplotlib.backend_bases import MouseEvent
 
+from oopnet.plotter.bokehplot import on_pick, update_plot
+from oopnet.plotter.hittest import HitTester, get_hit_tester
 from oopnet.plotter.pyplot import NetworkPlotter
-from oopnet.utils.getters.property_getters import get_diameter
+from oopnet.plotter.raster import rasterize_points, rasterize_segments, simplify_polylines
+from oopnet.utils.getters.property_getters import get_diameter, get_elevation
 
 from testing.base import ETownModel, CTownModel, MicropolisModel
 
@@ -16,6 +29,52 @@ class ETownModelPlottingTest(unittest.TestCase):
         fig = NetworkPlotter().plot(self.model.network)
         self.assertIsInstance(fig, plt.Figure)
 
+    def test_raster_plot(self):
+        plotter = NetworkPlotter()
+        fig = plotter.plot(self.model.network, nodes=get_elevation(self.model.network), raster=True)
+        ax = fig.axes[0]
+        self.assertEqual('raster', plotter.renderer.mode)
+        self.assertEqual(1, len(ax.images))
+        self.assertEqual(0, len(ax.collections))
+        xlim, ylim = ax.get_xlim(), ax.get_ylim()
+
+        x, y = self.model.network.geometry.node_xy[0]
+        ax.set_xlim(x - 200, x + 200)
+        ax.set_ylim(y - 200, y + 200)
+        self.assertEqual('vector', plotter.renderer.mode)
+        self.assertEqual(0, len(ax.images))
+        self.assertGreater(len(ax.collections), 0)
+
+        ax.set_xlim(*xlim)
+        ax.set_ylim(*ylim)
+        self.assertEqual('raster', plotter.renderer.mode)
+        self.assertEqual(1, len(ax.images))
+
+
+class RasterTest(unittest.TestCase):
+    def test_rasterize_points(self):
+        xy = np.array([[0.5, 0.5], [0.6, 0.6], [3.5, 1.5], [5.0, 5.0]])
+        image = rasterize_points(xy, np.array([1.0, 3.0, 5.0, 7.0]), (0, 4, 0, 2), (2, 4))
+        expected = np.full((2, 4), np.nan)
+        expected[0, 0] = 2.0
+        expected[1, 3] = 5.0
+        np.testing.assert_array_equal(expected, image)
+        counts = rasterize_points(xy, None, (0, 4, 0, 2), (2, 4), how='count')
+        self.assertEqual(2, counts[0, 0])
+
+    def test_rasterize_segments(self):
+        segments = np.array([[[-1.0, 0.5], [5.0, 0.5]], [[0.5, 10.0], [0.5, 20.0]]])
+        image = rasterize_segments(segments, np.array([2.0, 4.0]), (0, 4, 0, 2), (2, 4))
+        np.testing.assert_array_equal([2.0] * 4, image[0])
+        self.assertTrue(np.isnan(image[1]).all())
+
+    def test_simplify_polylines(self):
+        vertices = np.array([[0.0, 0.0], [0.1, 0.1], [0.2, 0.2], [5.0, 5.0], [5.0, 5.0], [9.0, 9.0]])
+        offsets = np.array([0, 4, 6])
+        simplified, new_offsets = simplify_polylines(vertices, offsets, 1.0)
+        np.testing.assert_array_equal([0, 2, 4], new_offsets)
+        np.testing.assert_array_equal([[0.0, 0.0], [5.0, 5.0], [5.0, 5.0], [9.0, 9.0]], simplified)
+
 
 class CTownModelPlottingTest(unittest.TestCase):
     def setUp(self) -> None:
@@ -54,6 +113,49 @@ class CTownModelPlottingTest(unittest.TestCase):
         self.model.network.plot(markersize=2)
 
 
+class CTownModelBokehTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = CTownModel()
+        self.rpt = self.model.network.run()
+
+    def test_sources(self):
+        plot = self.model.network.bokehplot(nodes=self.rpt.pressure, links=self.rpt.flow)
+        nodes = plot.select_one({'name': 'oopnet_nodes'})
+        links = plot.select_one({'name': 'oopnet_links'})
+        self.assertEqual(self.model.n_nodes, len(nodes.data['id']))
+        self.assertEqual(self.model.n_links, len(links.data['xs']))
+        np.testing.assert_allclose(self.rpt.pressure.reindex(nodes.data['id']).values, nodes.data['value'])
+        np.testing.assert_allclose(get_elevation(self.model.network).reindex(nodes.data['id']).values,
+                                   nodes.data['elevation'])
+        self.assertIn('diameter', links.data)
+        self.assertEqual(2, len(plot.select({'type': HoverTool})))
+
+    def test_hit_tester(self):
+        plot = self.model.network.bokehplot(nodes=self.rpt.pressure)
+        hit_tester = get_hit_tester(plot)
+        self.assertIsInstance(hit_tester, HitTester)
+        update_plot(plot, nodes=self.rpt.pressure * 2)
+        hit = hit_tester.node(self.rpt.pressure.index[0])
+        self.assertEqual(self.rpt.pressure.iloc[0] * 2, hit.results)
+        hits = []
+        on_pick(plot, hits.append)
+        self.assertIn('tap', plot._event_callbacks)
+        with self.assertRaises(ValueError):
+            on_pick(self.model.network.plot(), hits.append)
+
+    def test_update_plot(self):
+        plot = self.model.network.bokehplot(nodes=self.rpt.pressure)
+        nodes = plot.select_one({'name': 'oopnet_nodes'})
+        update_plot(plot, nodes=self.rpt.pressure.iloc[:10] * 2, rescale=True)
+        self.assertEqual(self.rpt.pressure.iloc[:10].max() * 2, plot.select_one({'name': 'oopnet_node_colors'}).high)
+        self.assertEqual(10, np.isfinite(nodes.data['value']).sum())
+
+    def test_default_plot(self):
+        plot = self.model.network.bokehplot()
+        links = plot.select_one({'name': 'oopnet_links'})
+        self.assertTrue(np.isnan(links.data['value']).all())
+
+
 class MicropolisModelTownModelAnimationTest(unittest.TestCase):
     def setUp(self) -> None:
         self.model = MicropolisModel()
@@ -64,5 +166,138 @@ class MicropolisModelTownModelAnimationTest(unittest.TestCase):
                                         link_width=self.rpt.flow)
 
 
+class CTownModelAnimationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = CTownModel()
+        self.model.network.times.duration = datetime.timedelta(hours=6)
+        self.rpt = self.model.network.run()
+
+    def test_persistent_artists(self):
+        anim = NetworkPlotter().animate(self.model.network, nodes=self.rpt.pressure, links=self.rpt.flow.abs(),
+                                        link_width=self.rpt.flow.abs())
+        ax = anim._fig.axes[0]
+        n_artists = len(ax.collections)
+        junctions = ax.collections[0]
+        anim._init_draw()
+        anim._draw_next_frame(0, blit=False)
+        first = junctions.get_facecolors().copy()
+        anim._draw_next_frame(6, blit=False)
+        self.assertEqual(n_artists, len(ax.collections))
+        self.assertFalse(np.allclose(first, junctions.get_facecolors()))
+
+    def test_constant_values(self):
+        anim = NetworkPlotter().animate(self.model.network, nodes=self.rpt.pressure.iloc[:, :10],
+                                        links=self.rpt.flow.iloc[0], blit=False)
+        anim._init_draw()
+        anim._draw_next_frame(3, blit=False)
+
+
+
+
+class CTownModelRenderAnimationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = CTownModel()
+        self.model.network.times.duration = datetime.timedelta(hours=6)
+        self.rpt = self.model.network.run()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def render(self, filename: str, workers: int) -> str:
+        path = os.path.join(self.tmpdir.name, filename)
+        return self.model.network.render_animation(path, nodes=self.rpt.pressure, node_label='Pressure',
+                                                   links=self.rpt.flow.abs(), linkwidth=self.rpt.flow.abs(),
+                                                   workers=workers)
+
+    def test_gif(self):
+        parallel = Image.open(self.render('parallel.gif', workers=2))
+        sequential = Image.open(self.render('sequential.gif', workers=1))
+        self.assertEqual(len(self.rpt.pressure), parallel.n_frames)
+        self.assertEqual(sequential.n_frames, parallel.n_frames)
+        first = parallel.convert('RGB')
+        for frame in range(parallel.n_frames):
+            parallel.seek(frame)
+            sequential.seek(frame)
+            self.assertIsNone(ImageChops.difference(parallel.convert('RGB'), sequential.convert('RGB')).getbbox())
+        self.assertIsNotNone(ImageChops.difference(first, parallel.convert('RGB')).getbbox())
+
+    @unittest.skipIf(shutil.which('ffmpeg'), 'ffmpeg is installed')
+    def test_video_requires_ffmpeg(self):
+        with self.assertRaises(RuntimeError):
+            self.render('animation.mp4', workers=1)
+
+    @unittest.skipUnless(shutil.which('ffmpeg'), 'ffmpeg is not installed')
+    def test_video(self):
+        path = self.render('animation.mp4', workers=2)
+        self.assertGreater(os.path.getsize(path), 0)
+
+class CTownModelHitTestTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = CTownModel()
+        self.model.network.times.duration = datetime.timedelta(hours=6)
+        self.rpt = self.model.network.run()
+        self.geometry = self.model.network.geometry
+
+    def test_pick(self):
+        hit_tester = HitTester(self.model.network, nodes=self.rpt.pressure, links=self.rpt.flow)
+        x, y = self.geometry.node_xy[0]
+        hit = hit_tester.pick(x, y, tolerance=1.0)
+        self.assertEqual(('node', self.geometry.node_ids[0], 0.0), (hit.kind, hit.id, hit.distance))
+        self.assertEqual('Junction', hit.properties['type'])
+        self.assertEqual(7, len(hit.results))
+        self.assertIn(self.geometry.node_ids[0], hit.describe())
+
+        pipes = self.geometry.link_slices['pipes']
+        position = pipes.start + int(np.argmax(self.geometry.lengths[pipes]))
+        hit = hit_tester.pick(*self.geometry.midpoints[position], tolerance=1e-6)
+        self.assertEqual(('link', self.geometry.link_ids[position]), (hit.kind, hit.id))
+        self.assertIn('diameter', hit.describe())
+        self.assertIsNone(hit_tester.pick(*(self.geometry.node_xy.max(axis=0) + 1e6), tolerance=1.0))
+
+    def test_plot(self):
+        fig = self.model.network.plot(nodes=self.rpt.pressure.iloc[0], hit_testing=True)
+        hit_tester = get_hit_tester(fig)
+        self.assertIsInstance(hit_tester, HitTester)
+        self.assertIsNone(get_hit_tester(self.model.network.plot()))
+
+        ax = fig.axes[0]
+        fig.canvas.draw()
+        x, y = ax.transData.transform(self.geometry.node_xy[0])
+        fig.canvas.callbacks.process('button_press_event', MouseEvent('button_press_event', fig.canvas, x, y))
+        annotation = [text for text in ax.texts if text.get_visible()]
+        self.assertEqual(1, len(annotation))
+        self.assertIn(self.geometry.node_ids[0], annotation[0].get_text())
+
+
+class CTownModelLivePlotTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = CTownModel()
+        self.model.network.times.duration = datetime.timedelta(hours=6)
+
+    def test_follow(self):
+        live = self.model.network.live_plot()
+        ax = live.ax
+        n_artists = len(ax.collections)
+        last = live.follow(self.model.network.run_stepwise(), nodes='Pressure', links='Flow')
+        self.assertEqual(7, live.steps)
+        self.assertEqual(n_artists, len(ax.collections))
+        self.assertEqual(str(last.time), live.title.get_text())
+        self.assertEqual(3, len(live.figure.axes))
+        norm = live._scalar_maps['node'].norm
+        self.assertLessEqual(norm.vmin, last.nodes['Pressure'].min())
+        self.assertGreaterEqual(norm.vmax, last.nodes['Pressure'].max())
+
+    def test_update(self):
+        rpt = self.model.network.run()
+        live = self.model.network.live_plot(nodes_vlim=(0.0, 100.0), colorbar=False)
+        junctions = live.ax.collections[0]
+        live.update(nodes=rpt.pressure.iloc[0])
+        first = junctions.get_facecolors().copy()
+        live.update(nodes=rpt.pressure.iloc[0] + 50.0)
+        self.assertFalse(np.allclose(first, junctions.get_facecolors()))
+        self.assertEqual((0.0, 100.0), live._scalar_maps['node'].get_clim())
+        self.assertEqual(1, len(live.figure.axes))
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 
 from oopnet.utils.getters import *
@@ -51,6 +52,29 @@ class SimplePropertyGetterTest(unittest.TestCase):
         self.assertIsInstance(coords, pd.DataFrame)
         self.assertEqual(self.model.n_links, len(coords))
 
+    def test_get_link_polyline_lengths(self):
+        lengths = get_link_polyline_lengths(self.model.network)
+        self.assertIsInstance(lengths, pd.Series)
+        self.assertEqual(self.model.n_links, len(lengths))
+        for link in get_links(self.model.network):
+            points = link.coordinates_2d
+            expected = np.linalg.norm(np.diff(points, axis=0), axis=1).sum()
+            self.assertAlmostEqual(expected, lengths[link.id])
+
+    def test_get_link_midpoints(self):
+        midpoints = get_link_midpoints(self.model.network)
+        self.assertIsInstance(midpoints, pd.DataFrame)
+        self.assertEqual(self.model.n_links, len(midpoints))
+        for link in get_links(self.model.network):
+            np.testing.assert_allclose(link.center, midpoints.loc[link.id].values)
+        starts = get_link_midpoints(self.model.network, fraction=0.0)
+        coords = get_startendcoordinates(self.model.network)
+        np.testing.assert_allclose(
+            starts.values, coords[["start x-coordinate", "start y-coordinate"]].values
+        )
+        with self.assertRaises(ValueError):
+            get_link_midpoints(self.model.network, fraction=1.5)
+
     def test_get_link_comment(self):
         comments = get_link_comment(self.model.network)
         self.assertIsInstance(comments, pd.Series)
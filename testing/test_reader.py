@@ -4,6 +4,7 @@ import os
 
 from oopnet.elements.network_components import Junction, Tank, Reservoir, Pipe, Pump, Valve
 from oopnet.elements.system_operation import Curve
+from oopnet.reader.unit_converter.convert import convert, FEET2METER, GPM2LPS, _scale
 from oopnet.utils.getters import *
 from oopnet.utils.getters.element_lists import get_patterns
 from testing.base import set_dir_testing, PoulakisEnhancedPDAModel
@@ -33,6 +34,26 @@ class ContentReaderTest(unittest.TestCase):
         self.assertEqual(PoulakisEnhancedPDAModel.n_valves, len(get_valves(net)))
 
 
+class CustomSectionReaderTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        from oopnet.reader import decorators
+        decorators._section_readers[:] = [x for x in decorators._section_readers if x.sectionname != 'CUSTOM']
+
+    def test_custom_section(self):
+        from oopnet import Network
+        from oopnet.reader.decorators import section_reader, get_section_readers
+
+        @section_reader('CUSTOM', 4)
+        def read_custom(network, block):
+            network.title = block[0]['values'][0]
+
+        self.assertIn('CUSTOM', [x.sectionname for x in get_section_readers()])
+        priorities = [x.priority for x in get_section_readers()]
+        self.assertEqual(sorted(priorities), priorities)
+        net = Network.read(content='[CUSTOM]\ncustom_title\n')
+        self.assertEqual('custom_title', net.title)
+
+
 class PoulakisEnhancedReaderTest(unittest.TestCase):
     def setUp(self) -> None:
         from testing.base import PoulakisEnhancedPDAModel
@@ -246,5 +267,45 @@ class ETownReaderTest(unittest.TestCase):
         self.assertEqual(3, len(l.vertices))
 
 
+class UnitConversionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        from testing.base import RulesModel
+        self.model = RulesModel()
+
+    def test_pump_curve(self):
+        curve = get_curve(self.model.network, '1')
+        self.assertAlmostEqual(100 * GPM2LPS, curve.xvalues[0])
+        self.assertAlmostEqual(100 * FEET2METER, curve.yvalues[0])
+
+    def test_valve_setting(self):
+        valve = get_valve(self.model.network, 'V-1')
+        self.assertAlmostEqual(5 * GPM2LPS, valve.setting)
+
+    def test_rule_condition(self):
+        condition = get_rule(self.model.network, '1').condition[2]
+        self.assertAlmostEqual(10 * FEET2METER, condition.value)
+
+    def test_reverse_conversion(self):
+        network = self.model.network
+        convert(network, 'GPM')
+        self.assertEqual('GPM', network.options.units)
+        self.assertAlmostEqual(100, get_junction(network, 'J-1').demand)
+        self.assertAlmostEqual(300, get_pipe(network, '2').diameter)
+        self.assertAlmostEqual(5, get_valve(network, 'V-1').setting)
+        self.assertAlmostEqual(100, get_curve(network, '1').yvalues[0])
+        self.assertAlmostEqual(10, get_rule(network, '1').condition[2].value)
+
+    def test_registry_version(self):
+        network = self.model.network
+        registry = network._links['pipes']
+        pipes = get_pipes(network)
+        diameters = [pipe.diameter for pipe in pipes]
+        version, geometry_version = registry.version, registry.geometry_version
+        _scale(pipes, 'diameter', 2.0)
+        self.assertListEqual([2.0 * d for d in diameters], [pipe.diameter for pipe in pipes])
+        self.assertEqual(version + 1, registry.version)
+        self.assertEqual(geometry_version, registry.geometry_version)
+
+
 if __name__ == '__main__':
     unittest.main()
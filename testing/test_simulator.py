@@ -1,10 +1,20 @@
+import datetime
+import importlib.util
 import os
+import tempfile
+import threading
 import unittest
 
 import numpy as np
 import pandas as pd
 
+from oopnet.elements.component_registry import ComponentNotExistingError
 from oopnet.report import *
+from oopnet.report.report import SimulationReport, _copy_on_write
+from oopnet.report.collection import ReportCollection
+from oopnet.simulator.reportfile_reader import iter_report_steps, time_axis
+from oopnet.simulator.result_buffer import ResultBuffer
+from oopnet.simulator.simulation_errors import EPANETSimulationError
 
 from testing.base import CTownModel, MicropolisModel, PoulakisEnhancedPDAModel, RulesModel, SimpleModel, \
     activate_all_report_parameters, set_dir_testing, PatternCurveModel, PoulakisReducedModel
@@ -141,5 +151,455 @@ class PatternCurveModelSimulatorTest(SimulatorTest):
         self.model.network.run()
 
 
+class ReportAccessorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = PoulakisEnhancedPDAModel()
+        self.rpt = self.model.network.run()
+
+    def test_cached(self):
+        self.assertEqual(_copy_on_write(), np.shares_memory(self.rpt.pressure.to_numpy(), self.rpt.pressure.to_numpy()))
+        self.assertEqual(_copy_on_write(), np.shares_memory(self.rpt.headloss.to_numpy(), self.rpt.headloss.to_numpy()))
+
+    def test_modified(self):
+        expected = self.rpt.pressure.copy()
+        pressure = self.rpt.pressure
+        pressure.iloc[0] = -1.0
+        pressure[pressure > 0.0] = 0.0
+        pressure.name = 'modified'
+        self.assertEqual(-1.0, pressure.iloc[0])
+        pd.testing.assert_series_equal(expected, self.rpt.pressure)
+
+    def test_sorted(self):
+        self.assertTrue(self.rpt.pressure.index.is_monotonic_increasing)
+        self.assertTrue(self.rpt.flow.index.is_monotonic_increasing)
+
+    def test_to_dataset(self):
+        ds = self.rpt.to_dataset()
+        self.assertEqual(('node',), ds['Pressure'].dims)
+        self.assertEqual(('link',), ds['Flow'].dims)
+        self.assertTrue(all(ds['Pressure'].to_pandas() == self.rpt.pressure))
+
+
+class ReportStatisticsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = MicropolisModel()
+        self.rpt = self.model.network.run()
+
+    def test_node_statistics(self):
+        stats = self.rpt.node_statistics(['Pressure'], percentiles=[50], below={'Pressure': 30.0})
+        stats = stats.set_index(['statistic', 'id'])['value']
+        pressure = self.rpt.pressure
+        self.assertTrue(np.allclose(pressure.min(), stats['min'][pressure.columns]))
+        self.assertTrue(np.allclose(pressure.max(), stats['max'][pressure.columns]))
+        self.assertTrue(np.allclose(pressure.median(), stats['p50'][pressure.columns]))
+        self.assertTrue(np.allclose((pressure < 30.0).sum(), stats['time_below_Pressure_30'][pressure.columns]))
+
+    def test_equal_thresholds(self):
+        stats = self.rpt.node_statistics(['Pressure'], below={'Pressure': 20.0, 'Head': 20.0})
+        stats = stats.set_index(['statistic', 'id'])['value']
+        for var, results in (('Pressure', self.rpt.pressure), ('Head', self.rpt.head)):
+            below = stats[f'time_below_{var}_20'][results.columns]
+            self.assertTrue(np.allclose((results < 20.0).sum(), below))
+
+    def test_link_statistics(self):
+        stats = self.rpt.link_statistics(['Velocity'], reversals=['Flow'])
+        reversals = stats[stats['statistic'] == 'reversals'].set_index('id')['value']
+        signs = np.sign(self.rpt.flow)
+        expected = ((signs * signs.shift()) < 0).sum()
+        self.assertTrue(np.allclose(expected, reversals[expected.index]))
+
+    def test_chunked(self):
+        stats = self.rpt.node_statistics(percentiles=[5])
+        chunked = self.rpt.node_statistics(percentiles=[5], chunksize=100)
+        key = ['statistic', 'id', 'variable']
+        pd.testing.assert_frame_equal(stats.set_index(key).sort_index(), chunked.set_index(key).sort_index())
+
+
+class ReportStorageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = PoulakisEnhancedPDAModel()
+        self.rpt = self.model.network.run()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def save_load(self, format: str, name: str):
+        path = os.path.join(self.tmpdir.name, name)
+        self.rpt.save(path, format=format)
+        loaded = SimulationReport.load(path)
+        pd.testing.assert_series_equal(self.rpt.pressure, loaded.pressure, check_index_type=False)
+        pd.testing.assert_series_equal(self.rpt.flow, loaded.flow, check_index_type=False)
+
+        selected = SimulationReport.load(path, variables=['Pressure'], nodes=['J-02', 'J-03'])
+        self.assertEqual(['J-02', 'J-03'], list(selected.pressure.index))
+        self.assertIsNone(selected.links)
+
+    def test_netcdf(self):
+        self.save_load('netcdf', 'report.nc')
+
+    @unittest.skipUnless(importlib.util.find_spec('zarr'), 'zarr is not installed')
+    def test_zarr(self):
+        self.save_load('zarr', 'report.zarr')
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_parquet(self):
+        self.save_load('parquet', 'report')
+
+    @unittest.skipIf(importlib.util.find_spec('pyarrow'), 'pyarrow is installed')
+    def test_missing_dependency(self):
+        with self.assertRaises(ImportError):
+            self.rpt.save(os.path.join(self.tmpdir.name, 'report'), format='parquet')
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            self.rpt.save(os.path.join(self.tmpdir.name, 'report'), format='csv')
+
+
+class ReportStorageTimeWindowTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = MicropolisModel()
+        self.model.network.times.duration = pd.Timedelta(hours=12)
+        self.rpt = self.model.network.run(relative_time=True)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def load_window(self, format: str, name: str):
+        self.assertIsInstance(self.rpt.pressure.index, pd.TimedeltaIndex)
+        path = os.path.join(self.tmpdir.name, name)
+        self.rpt.save(path, format=format, chunks={'time': 5})
+        start, end = datetime.timedelta(hours=2), datetime.timedelta(hours=6)
+        loaded = SimulationReport.load(path, variables=['Pressure'], start=start, end=end)
+        expected = self.rpt.pressure.loc[start:end]
+        self.assertEqual(list(expected.index), list(loaded.pressure.index))
+        self.assertTrue(np.allclose(expected.values, loaded.pressure[expected.columns].values))
+
+    def test_netcdf(self):
+        self.load_window('netcdf', 'report.nc')
+
+    @unittest.skipUnless(importlib.util.find_spec('zarr'), 'zarr is not installed')
+    def test_zarr(self):
+        self.load_window('zarr', 'report.zarr')
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_parquet(self):
+        self.load_window('parquet', 'report')
+        loaded = SimulationReport.load(os.path.join(self.tmpdir.name, 'report'))
+        pd.testing.assert_frame_equal(self.rpt.flow, loaded.flow, check_index_type=False, check_names=False)
+
+
+class ReportCollectionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = PoulakisEnhancedPDAModel()
+        self.reports = []
+        for index in range(5):
+            self.model.network.options.demandmultiplier = 1.0 + index / 10
+            self.reports.append(self.model.network.run())
+        self.pressures = pd.DataFrame([rpt.pressure for rpt in self.reports])
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def check_collection(self, collection: ReportCollection):
+        self.assertEqual(5, len(collection))
+        self.assertEqual(('scenario', 'id', 'vars'), collection.nodes.dims)
+        self.assertTrue(np.allclose(self.pressures.mean(), collection.mean('Pressure')[self.pressures.columns]))
+        self.assertTrue(np.allclose(self.pressures.std(), collection.std('Pressure')[self.pressures.columns]))
+        self.assertTrue(np.allclose(self.pressures.quantile(0.9),
+                                    collection.quantile('Pressure', 0.9)[self.pressures.columns]))
+
+    def test_preallocated(self):
+        self.check_collection(ReportCollection.from_reports(self.reports))
+
+    def test_growing(self):
+        collection = ReportCollection(chunksize=2)
+        for rpt in self.reports:
+            collection.append(rpt)
+        self.check_collection(collection)
+
+    def test_geometric_growth(self):
+        template = self.reports[0].nodes
+        buffer = ResultBuffer(template, 2, 2)
+        capacities = []
+        for index in range(20):
+            buffer.set(index, template)
+            capacities.append(len(buffer.data))
+        self.assertEqual([2, 2, 4, 4, 8, 8, 8, 8, 16], capacities[:9])
+        self.assertEqual(32, capacities[-1])
+        buffer.trim(20)
+        self.assertEqual(20, len(buffer.data))
+        np.testing.assert_array_equal(template.values, buffer.data[-1])
+
+    def test_out_of_core(self):
+        collection = ReportCollection(chunksize=2, directory=self.tmpdir.name)
+        for rpt in self.reports:
+            collection.append(rpt)
+        self.check_collection(collection)
+        self.assertTrue(os.path.samefile(self.tmpdir.name, os.path.dirname(collection.nodes.data.filename)))
+
+    def test_mismatch(self):
+        collection = ReportCollection.from_reports(self.reports)
+        with self.assertRaises(ValueError):
+            collection.append(RulesModel().network.run())
+
+
+class ResultSelectionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = MicropolisModel()
+        self.model.network.times.duration = pd.Timedelta(hours=12)
+
+    def test_selection(self):
+        rpt = self.model.network.run(variables=['Pressure'], nodes=['HY1', 'HY11'],
+                                     start=datetime.timedelta(hours=2), end=datetime.timedelta(hours=6))
+        self.assertIsNone(rpt.links)
+        self.assertEqual(['Pressure'], list(rpt.nodes['vars'].values))
+        self.assertEqual(['HY1', 'HY11'], list(rpt.pressure.columns))
+        self.assertEqual(5, len(rpt.pressure))
+
+        full = self.model.network.run()
+        selected = full.pressure.loc[rpt.pressure.index, ['HY1', 'HY11']]
+        self.assertTrue(np.allclose(selected.values, rpt.pressure.values))
+
+    def test_settings_restored(self):
+        network = self.model.network
+        self.model.network.run(variables=['Flow'], end=pd.Timedelta(hours=1))
+        self.assertEqual('ALL', network.report.nodes)
+        self.assertEqual('YES', network.reportparameter.pressure)
+        self.assertEqual(pd.Timedelta(hours=12), network.times.duration)
+
+    def test_link_variables(self):
+        rpt = self.model.network.run(variables=['Flow'])
+        self.assertIsNone(rpt.nodes)
+        self.assertEqual(['Flow'], list(rpt.links['vars'].values))
+
+    def test_unknown_variable(self):
+        with self.assertRaises(ValueError):
+            self.model.network.run(variables=['Nonsense'])
+
+    def test_settings_restored_after_error(self):
+        network = self.model.network
+        with self.assertRaises(ComponentNotExistingError):
+            network.run(variables=['Pressure'], nodes=['does-not-exist'])
+        with self.assertRaises(ComponentNotExistingError):
+            next(network.run_stepwise(variables=['Pressure'], nodes=['does-not-exist']))
+        self.assertEqual('YES', network.reportparameter.flow)
+        self.assertEqual(2, network.reportprecision.flow)
+        self.assertEqual('ALL', network.report.nodes)
+
+
+class StepwiseSimulationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = MicropolisModel()
+        self.model.network.times.duration = pd.Timedelta(hours=12)
+        self.rpt = self.model.network.run()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_steps(self):
+        steps = list(self.model.network.run_stepwise())
+        self.assertEqual(len(self.rpt.pressure), len(steps))
+        self.assertListEqual(list(self.rpt.pressure.index), [step.time for step in steps])
+        for index in (0, 6, 12):
+            pressure = steps[index].nodes['Pressure'].sort_index()
+            flow = steps[index].links['Flow'].sort_index()
+            self.assertTrue(np.allclose(self.rpt.pressure.iloc[index].values, pressure.values))
+            self.assertTrue(np.allclose(self.rpt.flow.iloc[index].values, flow.values))
+
+    def test_selection(self):
+        steps = self.model.network.run_stepwise(variables=['Pressure'], relative_time=True,
+                                                end=pd.Timedelta(hours=2))
+        step = next(steps)
+        self.assertEqual(pd.Timedelta(0), step.time)
+        self.assertIsNone(step.links)
+        self.assertListEqual(['Pressure'], list(step.nodes.columns))
+        steps.close()
+
+    def test_close_removes_files(self):
+        path = os.path.join(self.tmpdir.name, 'stepwise')
+        steps = self.model.network.run_stepwise(path=path)
+        next(steps)
+        steps.close()
+        self.assertListEqual([], os.listdir(path))
+
+    def test_follow_report_file(self):
+        path = os.path.join(self.tmpdir.name, 'stepwise')
+        list(self.model.network.run_stepwise(path=path, delete=False))
+        source = next(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.rpt'))
+        target = os.path.join(self.tmpdir.name, 'growing.rpt')
+        with open(source) as fid:
+            content = fid.read()
+        finished = threading.Event()
+
+        def write():
+            with open(target, 'w') as fid:
+                for start in range(0, len(content), 50000):
+                    fid.write(content[start:start + 50000])
+                    fid.flush()
+            finished.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        steps = list(iter_report_steps(target, self.model.network.reportprecision,
+                                       running=lambda: not finished.is_set(), poll_interval=0.01))
+        writer.join()
+        expected = list(iter_report_steps(source, self.model.network.reportprecision))
+        self.assertEqual(len(expected), len(steps))
+        pd.testing.assert_frame_equal(expected[-1].links, steps[-1].links)
+
+    def test_no_lag(self):
+        path = os.path.join(self.tmpdir.name, 'stepwise')
+        list(self.model.network.run_stepwise(path=path, delete=False))
+        source = next(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.rpt'))
+        target = os.path.join(self.tmpdir.name, 'partial.rpt')
+        with open(source) as fid:
+            content = fid.read()
+        # the report file is still being written when the tables of the second step were written
+        with open(target, 'w') as fid:
+            fid.write(content[:content.index('Node Results at 2:00:00')])
+        polls = []
+
+        def running():
+            polls.append(len(polls) < 2)
+            return polls[-1]
+
+        steps = iter_report_steps(target, self.model.network.reportprecision, running=running,
+                                  poll_interval=0.0, pagesize=0)
+        next(steps)
+        step = next(steps)
+        self.assertTrue(all(polls))
+        self.assertEqual(self.rpt.pressure.index[1], step.time)
+        self.assertIsNotNone(step.links)
+        steps.close()
+
+    def test_missing_report_file(self):
+        filename = os.path.join(self.tmpdir.name, 'missing.rpt')
+        with self.assertRaises(EPANETSimulationError):
+            next(iter_report_steps(filename, self.model.network.reportprecision, running=lambda: False))
+
+
+class OutOfCoreReportTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = MicropolisModel()
+        self.model.network.times.duration = pd.Timedelta(hours=48)
+        self.rpt = self.model.network.run()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_memory_mapped(self):
+        rpt = self.model.network.run(directory=self.tmpdir.name)
+        self.assertIsInstance(rpt.nodes.data, np.memmap)
+        self.assertTrue(os.path.samefile(self.tmpdir.name, os.path.dirname(rpt.nodes.data.filename)))
+        self.assertEqual(len(rpt.nodes.time), np.load(rpt.nodes.data.filename, mmap_mode='r').shape[0])
+        pd.testing.assert_frame_equal(self.rpt.pressure, rpt.pressure)
+        pd.testing.assert_frame_equal(self.rpt.flow, rpt.flow)
+        pd.testing.assert_frame_equal(self.rpt.node_statistics(['Pressure'], chunksize=100),
+                                      rpt.node_statistics(['Pressure'], chunksize=100))
+
+    def test_repeated_runs(self):
+        first = self.model.network.run(directory=self.tmpdir.name)
+        expected = first.nodes.values.copy()
+        self.model.network.options.demandmultiplier = 2.0
+        second = self.model.network.run(directory=self.tmpdir.name)
+        self.assertNotEqual(first.nodes.data.filename, second.nodes.data.filename)
+        self.assertFalse(np.allclose(expected, second.nodes.values, equal_nan=True))
+        np.testing.assert_array_equal(expected, first.nodes.values)
+
+    def test_resample(self):
+        expected = self.rpt.pressure.resample('1D').min()
+        for scheduler in ('synchronous', 'threads', 'processes'):
+            daily = self.rpt.resample('Pressure', '1D', 'min', chunksize=10, scheduler=scheduler, workers=2)
+            self.assertTrue(np.allclose(expected.values, daily.values))
+            self.assertTrue((expected.index == daily.index).all())
+
+        mean = self.rpt.resample('Flow', '6h', 'mean', chunksize=5)
+        self.assertTrue(np.allclose(self.rpt.flow.resample('6h').mean().values, mean.values))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.rpt.resample('Pressure', how='median')
+        with self.assertRaises(ValueError):
+            self.rpt.resample('Pressure', scheduler='cluster')
+        with self.assertRaises(KeyError):
+            self.rpt.resample('Nonsense')
+
+    @unittest.skipIf(importlib.util.find_spec('dask'), 'dask is installed')
+    def test_lazy_load_requires_dask(self):
+        path = os.path.join(self.tmpdir.name, 'report.nc')
+        self.rpt.save(path)
+        with self.assertRaises(ImportError):
+            SimulationReport.load(path, lazy=True)
+
+
+class ReportEnergyAndEventsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = RulesModel()
+        self.model.network.report.energy = 'YES'
+        self.model.network.report.status = 'YES'
+        self.rpt = self.model.network.run()
+
+    def test_energy(self):
+        self.assertEqual(['PU-1'], list(self.rpt.energy.index))
+        self.assertAlmostEqual(60.42, self.rpt.energy.loc['PU-1', 'Utilization'])
+        self.assertAlmostEqual(75.0, self.rpt.energy.loc['PU-1', 'Efficiency'])
+        self.assertIn('total_cost', self.rpt.energy.attrs)
+
+    def test_events(self):
+        events = self.rpt.status_events
+        self.assertEqual(['time', 'type', 'id', 'status', 'message'], list(events.columns))
+        self.assertTrue(events['time'].is_monotonic_increasing)
+        self.assertIn('closed', set(events['status']))
+
+        tanks = self.rpt.tank_events
+        filling = tanks[(tanks['id'] == 'T-1') & (tanks['status'] == 'filling')]
+        self.assertFalse(filling.empty)
+        self.assertAlmostEqual(3.05, filling['level'].iloc[0])
+
+    def test_not_reported(self):
+        rpt = RulesModel().network.run()
+        self.assertTrue(rpt.energy.empty)
+        self.assertTrue(rpt.status_events.empty)
+        self.assertTrue(rpt.tank_events.empty)
+
+
+class TimeAxisTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = RulesModel()
+        self.rpt = self.model.network.run()
+
+    def test_time_axis(self):
+        times = self.model.network.times
+        clocks = ['0:00:00', '1:00:00', '2:00:00']
+        expected = np.array(['2016-01-01T00', '2016-01-01T01', '2016-01-01T02'], dtype='datetime64[ns]')
+        self.assertTrue(np.array_equal(expected, time_axis(clocks, times=times)))
+        self.assertTrue(np.array_equal(expected, time_axis(clocks)))
+        # report times not matching the Network's times are parsed
+        self.assertTrue(np.array_equal(expected[[0, 2]], time_axis(['0:00:00', '2:00:00'], times=times)))
+        relative = time_axis(clocks, times=times, relative=True)
+        self.assertEqual(np.dtype('timedelta64[ns]'), relative.dtype)
+
+    def test_relative_time(self):
+        rpt = self.model.network.run(relative_time=True)
+        self.assertIsInstance(rpt.pressure.index, pd.TimedeltaIndex)
+        self.assertTrue(np.allclose(self.rpt.pressure.values, rpt.pressure.values))
+        start = self.rpt.pressure.index[0]
+        self.assertTrue((self.rpt.pressure.index - start == rpt.pressure.index).all())
+
+    def test_time_window(self):
+        times = self.rpt.pressure.index
+        window = self.rpt.time_window(times[2], times[5])
+        self.assertEqual(list(times[2:6]), list(window.pressure.index))
+        self.assertEqual(list(times[:3]), list(self.rpt.time_window(end=times[2]).flow.index))
+        relative = self.model.network.run(relative_time=True)
+        window = relative.time_window(datetime.timedelta(hours=3))
+        self.assertEqual(datetime.timedelta(hours=3), window.pressure.index[0])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+
+import numpy as np
+
+from oopnet.elements.geometry import clip_segments, point_segment_distance
+from oopnet.elements.network_components import Junction, Pipe
+from oopnet.elements.spatial_index import SpatialIndex
+from oopnet.utils.adders import add_junction, add_pipe
+from oopnet.utils.getters import get_node
+from oopnet.utils.removers import remove_junction, remove_pipe
+
+from testing.base import MicropolisModel
+
+
+class MicropolisSpatialIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.network = MicropolisModel().network
+        self.geometry = self.network.geometry
+        self.index = self.network.spatial_index
+        rng = np.random.default_rng(0)
+        low, high = self.geometry.node_xy.min(axis=0), self.geometry.node_xy.max(axis=0)
+        self.points = rng.uniform(low - 0.1 * (high - low), high + 0.1 * (high - low), (50, 2))
+
+    def node_distances(self, point: np.ndarray) -> np.ndarray:
+        return np.hypot(*(self.geometry.node_xy - point).T)
+
+    def link_distances(self, point: np.ndarray) -> np.ndarray:
+        links, segments = self.geometry.segments()
+        distances = point_segment_distance(
+            np.broadcast_to(point, (len(segments), 2)), segments[:, 0], segments[:, 1]
+        )
+        result = np.full(len(self.geometry.link_ids), np.inf)
+        np.minimum.at(result, links, distances)
+        return result
+
+    def test_cache(self):
+        self.assertIs(self.network.spatial_index, self.index)
+
+    def test_nearest_nodes(self):
+        result = self.index.nearest_nodes(self.points)
+        self.assertEqual(len(result), len(self.points))
+        for point, distance in zip(self.points, result["distance"]):
+            self.assertAlmostEqual(self.node_distances(point).min(), distance)
+
+        tanks = self.geometry.node_slices["tanks"]
+        id, distance = self.index.nearest_node(*self.points[0], kind="tanks")
+        distances = self.node_distances(self.points[0])[tanks]
+        self.assertEqual(self.geometry.node_ids[tanks][np.argmin(distances)], id)
+        self.assertAlmostEqual(distances.min(), distance)
+        with self.assertRaises(ValueError):
+            self.index.nearest_node(0.0, 0.0, kind="pipes")
+
+    def test_nearest_links(self):
+        result = self.index.nearest_links(self.points)
+        for point, (_, row) in zip(self.points, result.iterrows()):
+            distances = self.link_distances(point)
+            self.assertAlmostEqual(distances.min(), row["distance"])
+            self.assertAlmostEqual(np.hypot(row["x"] - point[0], row["y"] - point[1]), row["distance"])
+            position = list(self.geometry.link_ids).index(row["id"])
+            self.assertGreaterEqual(row["position"], 0.0)
+            self.assertLessEqual(row["position"], self.geometry.lengths[position] + 1e-6)
+
+    def test_within(self):
+        x, y = self.geometry.node_xy[0]
+        radius = 200.0
+        nodes = self.index.nodes_within(x, y, radius)
+        expected = self.geometry.node_ids[self.node_distances(np.array([x, y])) <= radius]
+        self.assertSetEqual(set(expected), set(nodes.index))
+        self.assertTrue(nodes.is_monotonic_increasing)
+        self.assertEqual(0.0, nodes.iloc[0])
+
+        links = self.index.links_within(x, y, radius)
+        distances = self.link_distances(np.array([x, y]))
+        self.assertSetEqual(set(self.geometry.link_ids[distances <= radius]), set(links.index))
+        np.testing.assert_allclose(np.sort(distances[distances <= radius]), links.to_numpy())
+
+    def test_bbox(self):
+        x, y = self.geometry.node_xy[0]
+        xmin, ymin, xmax, ymax = x - 300.0, y - 300.0, x + 300.0, y + 300.0
+        xy = self.geometry.node_xy
+        inside = np.all((xy >= (xmin, ymin)) & (xy <= (xmax, ymax)), axis=1)
+        self.assertSetEqual(set(self.geometry.node_ids[inside]), set(self.index.nodes_in_bbox(xmin, ymin, xmax, ymax)))
+
+        links = self.index.links_in_bbox(xmin, ymin, xmax, ymax)
+        positions, segments = self.geometry.segments()
+        intersecting, _ = clip_segments(segments, (xmin, xmax, ymin, ymax))
+        self.assertSetEqual(set(self.geometry.link_ids[positions[intersecting]]), set(links))
+        self.assertGreater(len(links), 0)
+
+    def test_polygon(self):
+        x, y = self.geometry.node_xy[0]
+        polygon = np.array([[x - 500.0, y - 500.0], [x + 500.0, y - 500.0], [x, y + 500.0]])
+        nodes = self.index.nodes_in_polygon(polygon)
+        self.assertIn(self.geometry.node_ids[0], nodes)
+        self.assertTrue(set(nodes) <= set(self.index.nodes_in_bbox(x - 500.0, y - 500.0, x + 500.0, y + 500.0)))
+
+        links = self.index.links_in_polygon(polygon)
+        positions = [list(self.geometry.link_ids).index(link) for link in links]
+        for position in positions:
+            start, end = self.geometry.link_nodes[position]
+            self.assertIn(self.geometry.node_ids[start], nodes)
+            self.assertIn(self.geometry.node_ids[end], nodes)
+
+    def test_incremental_update(self):
+        x, y = self.points[0]
+        junction = Junction(id="snap-J", xcoordinate=x, ycoordinate=y)
+        add_junction(self.network, junction)
+        pipe = Pipe(id="snap-P", startnode=junction, endnode=get_node(self.network, self.geometry.node_ids[0]))
+        add_pipe(self.network, pipe)
+        self.assertIs(self.network.spatial_index, self.index)
+        self.assertEqual(("snap-J", 0.0), self.index.nearest_node(x, y))
+        self.assertEqual(("snap-P", 0.0), self.index.nearest_link(x, y))
+
+        junction.xcoordinate += 10.0
+        self.assertEqual(("snap-J", 10.0), self.network.spatial_index.nearest_node(x, y))
+
+        remove_pipe(self.network, "snap-P")
+        remove_junction(self.network, "snap-J")
+        index = self.network.spatial_index
+        self.assertNotEqual("snap-J", index.nearest_node(x, y)[0])
+        self.assertNotIn("snap-P", index.links_within(x, y, 1e9).index)
+
+        fresh = SpatialIndex(self.network.geometry)
+        self.assertEqual(fresh.nearest_node(x, y), index.nearest_node(x, y))
+        self.assertEqual(fresh.nearest_link(x, y), index.nearest_link(x, y))
+
+    def test_rebuild(self):
+        for i, (x, y) in enumerate(self.points):
+            add_junction(self.network, Junction(id=f"snap-{i}", xcoordinate=x, ycoordinate=y))
+        for node_id in self.geometry.node_ids[: len(self.geometry.node_ids) // 2]:
+            node = get_node(self.network, node_id)
+            node.xcoordinate += 1.0
+        index = self.network.spatial_index
+        self.assertEqual(len(self.network.geometry.node_ids), index._node_built)
+        for i, (x, y) in enumerate(self.points):
+            self.assertEqual((f"snap-{i}", 0.0), index.nearest_node(x, y))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,26 @@
+import io
+import json
 import os
+import tempfile
 import unittest
 
+import numpy as np
+import pandas as pd
+
 from oopnet.elements.network import Network
+from oopnet.elements.network_components import Junction
+from oopnet.elements.network_map_tags import Vertex
+from oopnet.utils.adders import add_junction
+from oopnet.utils.getters import get_valve, get_junction, get_nodes, get_pipe
+from oopnet.utils.removers import remove_junction
+from oopnet.writer.formatting import format_line, format_section
+from oopnet.writer.geojson import write_geojson, write_geojson_tiles
 
 from testing.base import CTownModel, MicropolisModel, PoulakisEnhancedPDAModel, RulesModel, SimpleModel
 
 
 def write_read(network: Network) -> Network:
+    os.makedirs('tmp', exist_ok=True)
     filename = os.path.join('tmp', 'test.inp')
     network.write(filename)
     new_network = Network.read(filename)
@@ -60,5 +74,243 @@ class SimpleModelWriterTest(unittest.TestCase):
         self.assertEqual(self.model.network, new_network)
 
 
+class StreamWriterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = SimpleModel()
+
+    def test_write_stream(self):
+        stream = io.StringIO()
+        self.assertEqual(0, self.model.network.write(stream))
+        self.assertFalse(stream.closed)
+        new_network = Network.read(content=stream.getvalue())
+        self.assertEqual(self.model.network, new_network)
+
+
+class SectionCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = SimpleModel()
+        self.network = self.model.network
+
+    def write(self) -> str:
+        stream = io.StringIO()
+        self.network.write(stream, cache=True)
+        return stream.getvalue()
+
+    def test_disabled_by_default(self):
+        stream = io.StringIO()
+        self.network.write(stream)
+        self.assertEqual({}, self.network._section_cache)
+        get_pipe(self.network, 'P-1').vertices.append(Vertex(xcoordinate=12.5, ycoordinate=7.5))
+        stream = io.StringIO()
+        self.network.write(stream)
+        self.assertIn('P-1 12.5 7.5', stream.getvalue())
+
+    def test_unchanged_network(self):
+        first = self.write()
+        self.assertIn('VALVES', self.network._section_cache)
+        self.assertEqual(first, self.write())
+
+    def test_modified_component(self):
+        self.write()
+        get_valve(self.network, 'V-1').setting = 12.5
+        self.assertIn('V-1 J-1 J-3 12.0 PRV 12.5 0.0', self.write())
+
+    def test_renamed_node(self):
+        self.write()
+        get_junction(self.network, 'J-3').id = 'J-X'
+        content = self.write()
+        self.assertIn('V-1 J-1 J-X', content)
+        self.assertNotIn('J-3', content)
+
+    def test_added_and_removed_component(self):
+        self.write()
+        add_junction(self.network, Junction(id='J-4', elevation=3.0))
+        self.assertIn('J-4 3.0', self.write())
+        remove_junction(self.network, 'J-4')
+        self.assertNotIn('J-4', self.write())
+
+    def rendered_sections(self) -> set:
+        cached = dict(self.network._section_cache)
+        self.write()
+        return {name for name, entry in self.network._section_cache.items() if cached.get(name) is not entry}
+
+    def test_rendered_sections(self):
+        self.write()
+        self.assertEqual(set(), self.rendered_sections())
+        get_junction(self.network, 'J-1').demand = 5.0
+        self.assertEqual({'JUNCTIONS', 'DEMANDS'}, self.rendered_sections())
+        get_valve(self.network, 'V-1').setting = 12.5
+        self.assertEqual({'VALVES'}, self.rendered_sections())
+        get_pipe(self.network, 'P-1').length = 50.0
+        self.assertEqual({'PIPES'}, self.rendered_sections())
+        get_junction(self.network, 'J-1').initialquality = 1.0
+        self.assertEqual({'JUNCTIONS', 'QUALITY'}, self.rendered_sections())
+        get_junction(self.network, 'J-1').xcoordinate = 1.0
+        self.assertEqual({'JUNCTIONS', 'COORDINATES'}, self.rendered_sections())
+
+    def test_rendered_sections_renamed_node(self):
+        self.write()
+        get_junction(self.network, 'J-3').id = 'J-X'
+        self.assertEqual(
+            {'JUNCTIONS', 'PIPES', 'PUMPS', 'VALVES', 'EMITTERS', 'COORDINATES', 'QUALITY', 'SOURCES', 'DEMANDS'},
+            self.rendered_sections(),
+        )
+
+
+class ReportNodesWriterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = CTownModel()
+
+    def test_long_node_list(self):
+        network = self.model.network
+        network.report.nodes = get_nodes(network)
+        fid = io.StringIO()
+        network.write(fid)
+        lines = [line for line in fid.getvalue().splitlines() if line.startswith('NODES')]
+        self.assertGreater(len(lines), 1)
+        for line in lines:
+            self.assertLess(len(line), 1024)
+            self.assertLessEqual(len(line.split()), 40)
+        new_network = Network.read(content=fid.getvalue())
+        self.assertEqual([n.id for n in network.report.nodes], [n.id for n in new_network.report.nodes])
+        self.assertEqual('ALL', new_network.report.links)
+
+
+class UnitsWriterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = RulesModel()
+
+    def test_write_us_units(self):
+        fid = io.StringIO()
+        self.model.network.write(fid, units='GPM')
+        self.assertEqual('LPS', self.model.network.options.units)
+        new_network = Network.read(content=fid.getvalue())
+        self.assertEqual('LPS', new_network.options.units)
+        self.assertAlmostEqual(get_valve(self.model.network, 'V-1').setting, get_valve(new_network, 'V-1').setting)
+        self.assertAlmostEqual(get_junction(self.model.network, 'J-1').demand, get_junction(new_network, 'J-1').demand)
+
+
+class CustomSectionWriterTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        from oopnet.writer import decorators
+        decorators._section_writers[:] = [x for x in decorators._section_writers if x.sectionname != 'CUSTOM']
+
+    def test_custom_section(self):
+        from oopnet.writer.decorators import section_writer
+
+        @section_writer('CUSTOM', 5)
+        def write_custom(network, fid):
+            fid.write(format_section('CUSTOM', ['custom content']))
+
+        stream = io.StringIO()
+        SimpleModel().network.write(stream)
+        self.assertTrue(stream.getvalue().endswith('[CUSTOM]\ncustom content\n\n'))
+
+
+class GeoJSONWriterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.network = MicropolisModel().network
+        self.geometry = self.network.geometry
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_features(self):
+        elevations = {node.id: node.elevation for node in get_nodes(self.network)}
+        pressure = pd.Series(1.0, index=self.geometry.node_ids[:10], name='Pressure')
+        buffer = io.StringIO()
+        count = write_geojson(self.network, buffer, nodes=pressure, chunksize=100)
+        features = json.loads(buffer.getvalue())['features']
+        self.assertEqual(len(self.geometry.node_ids) + len(self.geometry.link_ids), count)
+        self.assertEqual(count, len(features))
+
+        node = features[0]
+        self.assertEqual('Point', node['geometry']['type'])
+        self.assertEqual(list(self.geometry.node_xy[0]), node['geometry']['coordinates'])
+        self.assertEqual(elevations[node['properties']['id']], node['properties']['elevation'])
+        self.assertEqual(1.0, node['properties']['Pressure'])
+        self.assertIsNone(features[10]['properties']['Pressure'])
+
+        links = features[len(self.geometry.node_ids):]
+        for link, polyline in zip(links, self.geometry.polylines()):
+            self.assertEqual('LineString', link['geometry']['type'])
+            self.assertEqual(polyline.tolist(), link['geometry']['coordinates'])
+        self.assertIn('Pipe', {link['properties']['type'] for link in links})
+        self.assertIn('Pump', {link['properties']['type'] for link in links})
+
+    def test_simplification(self):
+        path = os.path.join(self.tmpdir.name, 'links.geojson')
+        write_geojson(self.network, path, tolerance=50.0, elements=['links'])
+        with open(path) as fid:
+            features = json.load(fid)['features']
+        self.assertEqual(len(self.geometry.link_ids), len(features))
+        n_points = sum(len(link['geometry']['coordinates']) for link in features)
+        self.assertLess(n_points, len(self.geometry.vertices))
+        for link, polyline in zip(features, self.geometry.polylines()):
+            self.assertEqual(polyline[0].tolist(), link['geometry']['coordinates'][0])
+            self.assertEqual(polyline[-1].tolist(), link['geometry']['coordinates'][-1])
+
+    def test_tiles(self):
+        count = write_geojson_tiles(self.network, self.tmpdir.name, min_zoom=0, max_zoom=3)
+        with open(os.path.join(self.tmpdir.name, 'metadata.json')) as fid:
+            metadata = json.load(fid)
+        self.assertEqual(3, metadata['max_zoom'])
+        with open(os.path.join(self.tmpdir.name, '0', '0', '0.geojson')) as fid:
+            self.assertEqual(len(self.geometry.node_ids) + len(self.geometry.link_ids), len(json.load(fid)['features']))
+
+        tiles = [os.path.join(root, name) for root, _, names in os.walk(os.path.join(self.tmpdir.name, '3'))
+                 for name in names]
+        self.assertGreater(len(tiles), 1)
+        self.assertLessEqual(len(tiles), 64)
+        self.assertEqual(count, len(tiles) + sum(
+            len(names) for root, _, names in os.walk(self.tmpdir.name)
+            if os.path.relpath(root, self.tmpdir.name).split(os.sep)[0] in ('0', '1', '2')
+        ))
+        node_ids = set()
+        for tile in tiles:
+            with open(tile) as fid:
+                node_ids |= {feature['properties']['id'] for feature in json.load(fid)['features']
+                             if feature['geometry']['type'] == 'Point'}
+        self.assertSetEqual(set(self.geometry.node_ids), node_ids)
+
+    def test_invalid_zoom(self):
+        with self.assertRaises(ValueError):
+            write_geojson_tiles(self.network, self.tmpdir.name, min_zoom=3, max_zoom=1)
+
+    def test_extended_period_results(self):
+        ids = self.geometry.node_ids
+        pressure = pd.DataFrame(1.0, index=pd.date_range('2016-01-01', periods=3, freq='h'), columns=ids)
+        with self.assertRaises(ValueError):
+            write_geojson(self.network, io.StringIO(), nodes=pressure)
+        with self.assertRaises(ValueError):
+            write_geojson_tiles(self.network, self.tmpdir.name, nodes=pressure)
+        buffer = io.StringIO()
+        write_geojson(self.network, buffer, nodes=pressure.iloc[1].rename('Pressure'), elements=['nodes'])
+        features = json.loads(buffer.getvalue())['features']
+        self.assertTrue(all(feature['properties']['Pressure'] == 1.0 for feature in features))
+
+    def test_invalid_property_names(self):
+        ids = self.geometry.node_ids
+        with self.assertRaises(ValueError):
+            write_geojson(self.network, io.StringIO(), nodes=pd.Series(1.0, index=ids))
+        for name in ('id', 'type', 'elevation'):
+            with self.assertRaises(ValueError):
+                write_geojson(self.network, io.StringIO(), nodes=pd.Series(1.0, index=ids, name=name))
+
+
+class FormattingTest(unittest.TestCase):
+    def test_format_line(self):
+        self.assertEqual('J-1 10.0', format_line('J-1', 10.0, None, None))
+        with self.assertRaises(ValueError):
+            format_line('J-1', 10.0, None, 'pattern')
+        self.assertEqual('J-1 10.0 ; comment', format_line('J-1', 10.0, comment='comment'))
+
+    def test_format_section(self):
+        section = format_section('JUNCTIONS', ['J-1 10.0', 'J-2 5.0'], 'id elevation')
+        self.assertEqual('[JUNCTIONS]\n;id elevation\nJ-1 10.0\nJ-2 5.0\n\n', section)
+        self.assertEqual('[TAGS]\n\n', format_section('TAGS', []))
+
+
 if __name__ == '__main__':
     unittest.main()